@@ -1,19 +1,26 @@
 import google.generativeai as genai
+import asyncio
+import functools
 import json
 import math
 import os
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, NamedTuple, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 import random
 from langdetect import detect
+import numpy as np
 import re
+from functools import lru_cache
 
 from models import (
     User, FinancialProfile, SavingsGoal, GovernmentScheme,
-    CulturalNudge, FinancialScore, VoiceInteraction
+    CulturalNudge, FinancialScore, VoiceInteraction, ALL_STATES
 )
 from schemas import EligibilityResponse
+from finance_math import emi, fv_sip, monthly_rate, nper, sip_for_goal
+from monte_carlo import project_sip
+from schedules import SCHEDULE_MAX_MONTHS, LoanTerms
 
 # Configure Gemini AI
 gemini_api_key = os.getenv("GEMINI_API_KEY")
@@ -769,7 +776,7 @@ async def check_scheme_eligibility(
     
     # Check state eligibility
     if scheme.applicable_states and user.state:
-        if user.state not in scheme.applicable_states:
+        if user.state not in scheme.applicable_states and ALL_STATES not in scheme.applicable_states:
             eligible = False
             missing_criteria.append(f"Scheme not available in {user.state}")
             confidence -= 0.5
@@ -813,6 +820,16 @@ async def calculate_financial_score(user: User, db: Session) -> Dict[str, Any]:
         SavingsGoal.user_id == user.id
     ).all()
     
+    return score_financial_data(user, profile, goals, db)
+
+def score_financial_data(
+    user: User,
+    profile: Optional[FinancialProfile],
+    goals: List[SavingsGoal],
+    db: Optional[Session] = None
+) -> Dict[str, Any]:
+    """Calculate the financial score from an already loaded profile and goals."""
+    
     # Calculate individual scores
     savings_score = calculate_savings_score(profile, goals)
     spending_score = calculate_spending_score(profile)
@@ -1278,8 +1295,9 @@ async def generate_additional_lessons(user: User, level: str, completed_lessons:
         print(f"Error generating additional lessons: {e}")
         return generate_static_lesson_content(level, is_additional=True)
 
+@lru_cache(maxsize=32)
 def generate_static_lesson_content(level: str, is_additional: bool = False) -> Dict[str, Any]:
-    """Generate static lesson content as fallback."""
+    """Generate static lesson content as fallback. Memoized, so callers must not mutate the result."""
     
     if is_additional:
         # Advanced follow-up lessons
@@ -1677,51 +1695,80 @@ async def run_financial_simulation(
 ) -> Dict[str, Any]:
     """Run comprehensive financial simulations using AI reasoning."""
     
-    # Get base financial data
-    monthly_income = user_profile.get('monthly_income') or (db_profile.monthly_income if db_profile else 50000)
-    monthly_expenses = user_profile.get('monthly_expenses') or (db_profile.monthly_expenses if db_profile else 35000)
-    current_savings = monthly_income - monthly_expenses
-    location = user_profile.get('location') or (db_profile.location if db_profile else user.state or 'India')
-    family_size = user_profile.get('family_size', 1)
-    income_type = user_profile.get('income_type', 'fixed')
-    existing_liabilities = user_profile.get('existing_liabilities', 0)
-    
-    # Simulation handlers
-    simulation_handlers = {
-        'monthly_budget_forecast': handle_monthly_budget_forecast,
-        'loan_affordability': handle_loan_affordability,
-        'savings_goal_tracker': handle_savings_goal_tracker,
-        'expense_reduction_impact': handle_expense_reduction_impact,
-        'life_event_planning': handle_life_event_planning,
-        'loan_impact_estimation': handle_loan_impact_estimation,
-        'income_drop_alert': handle_income_drop_alert,
-        'festive_season_spending': handle_festive_season_spending,
-        'retirement_readiness': handle_retirement_readiness,
-        'weather_event_impact': handle_weather_event_impact,
-        'emi_vs_saving_dilemma': handle_emi_vs_saving_dilemma,
-        'investment_planning': handle_investment_planning,
-        'best_option_selector': handle_best_option_selector
-    }
-    
-    handler = simulation_handlers.get(simulation_type)
+    handler = SIMULATION_HANDLERS.get(simulation_type)
     if not handler:
         return {"error": "Unknown simulation type"}
     
     # Run the specific simulation
     result = await handler(
         user_inputs=user_inputs,
-        monthly_income=monthly_income,
-        monthly_expenses=monthly_expenses,
-        current_savings=current_savings,
-        location=location,
-        family_size=family_size,
-        income_type=income_type,
-        existing_liabilities=existing_liabilities,
-        user=user
+        user=user,
+        **simulation_context(user_profile, db_profile, user)
     )
     
     return result
 
+def simulation_context(user_profile: Dict[str, Any], db_profile: Any, user: User) -> Dict[str, Any]:
+    """Base financial data for a simulation: the request's profile first, then the saved one."""
+    monthly_income = user_profile.get('monthly_income') or (db_profile.monthly_income if db_profile else 50000)
+    monthly_expenses = user_profile.get('monthly_expenses') or (db_profile.monthly_expenses if db_profile else 35000)
+    return {
+        "monthly_income": monthly_income,
+        "monthly_expenses": monthly_expenses,
+        "current_savings": monthly_income - monthly_expenses,
+        "location": user_profile.get('location') or (db_profile.location if db_profile else user.state or 'India'),
+        "family_size": user_profile.get('family_size', 1),
+        "income_type": user_profile.get('income_type', 'fixed'),
+        "existing_liabilities": user_profile.get('existing_liabilities', 0)
+    }
+
+# Profile fields simulations compute with; location and income_type are only labels
+NUMERIC_PROFILE_FIELDS = ('monthly_income', 'monthly_expenses', 'family_size', 'existing_liabilities')
+
+def check_profile_numbers(user_profile: Dict[str, Any]) -> None:
+    """Raise ValueError for a numeric profile field holding anything but a finite number."""
+    for field in NUMERIC_PROFILE_FIELDS:
+        value = user_profile.get(field)
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"user_profile.{field} must be a number, got {value!r}")
+
+def vectorized_simulation(kernel):
+    """
+    Turn a vectorized simulation kernel into a regular simulation handler.
+
+    The kernel takes a list of user inputs and a matching list of simulation
+    contexts, computes with NumPy arrays over the whole list and returns one
+    result per item. The handler runs it on a batch of one in a worker thread;
+    the kernel itself stays available as `handler.batch` for
+    run_financial_simulation_batch.
+    """
+    @functools.wraps(kernel)
+    def batch(inputs, contexts):
+        # Degenerate inputs become inf/NaN and fail when rounded, instead of warning per element
+        with np.errstate(all='ignore'):
+            return kernel(inputs, contexts)
+
+    @functools.wraps(kernel)
+    async def handler(user_inputs, user=None, **context):
+        # Monte Carlo modes take tens of milliseconds; keep them off the event loop
+        return (await asyncio.to_thread(batch, [user_inputs], [context]))[0]
+
+    handler.batch = batch
+    return handler
+
+def batch_values(rows: List[Dict[str, Any]], key: str, default: Any) -> List[Any]:
+    """One field across a batch of inputs or contexts, with the handler's default for missing values."""
+    return [row.get(key, default) for row in rows]
+
+def batch_array(values: List[Any]) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+def wants_monte_carlo(user_inputs: Dict[str, Any]) -> bool:
+    """Inputs with `mode: monte_carlo` also get a stochastic projection (`paths`, `seed` optional)."""
+    return user_inputs.get('mode') == 'monte_carlo'
+
 async def handle_monthly_budget_forecast(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
     """📅 Monthly Budget Forecast - Show how money flows this month."""
     
@@ -1775,55 +1822,77 @@ async def handle_monthly_budget_forecast(user_inputs, monthly_income, monthly_ex
         ]
     }
 
-async def handle_loan_affordability(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
-    """💸 Can I Afford This? - Loan affordability analysis."""
-    
-    loan_amount = user_inputs.get('loan_amount', 100000)
-    loan_tenure = user_inputs.get('loan_tenure', 12)  # months
-    interest_rate = user_inputs.get('interest_rate', 12)  # annual %
-    
+def loan_affordability_metrics(loan_amount, loan_tenure, interest_rate, monthly_income, monthly_expenses, existing_liabilities):
+    """EMI and affordability of a loan; all arguments broadcast against each other."""
     # Calculate EMI
-    monthly_rate = interest_rate / (12 * 100)
-    emi = loan_amount * monthly_rate * (1 + monthly_rate)**loan_tenure / ((1 + monthly_rate)**loan_tenure - 1)
+    emi_amount = emi(loan_amount, monthly_rate(interest_rate), loan_tenure)
     
     # Affordability analysis
     available_income = monthly_income - monthly_expenses - existing_liabilities
-    debt_to_income_ratio = ((emi + existing_liabilities) / monthly_income) * 100
-    
-    # Risk assessment
-    risk_level = "Low"
-    if debt_to_income_ratio > 50:
-        risk_level = "High"
-    elif debt_to_income_ratio > 30:
-        risk_level = "Medium"
-    
-    can_afford = available_income >= emi and debt_to_income_ratio <= 40
-    
+    debt_to_income_ratio = ((emi_amount + existing_liabilities) / monthly_income) * 100
     return {
-        "title": "Loan Affordability Analysis",
-        "loan_details": {
-            "amount": loan_amount,
-            "tenure_months": loan_tenure,
-            "interest_rate": interest_rate,
-            "monthly_emi": round(emi)
-        },
-        "affordability": {
-            "can_afford": can_afford,
-            "available_income": round(available_income),
-            "debt_to_income_ratio": round(debt_to_income_ratio, 1),
-            "risk_level": risk_level
-        },
-        "total_cost": {
-            "total_payment": round(emi * loan_tenure),
-            "total_interest": round((emi * loan_tenure) - loan_amount)
-        },
-        "recommendations": [
-            f"Keep debt-to-income ratio below 40% (currently {debt_to_income_ratio:.1f}%)",
-            "Consider shorter tenure to save on interest" if loan_tenure > 24 else "Current tenure is optimal",
-            "Build emergency fund before taking loan" if current_savings < (monthly_expenses * 3) else "Good emergency fund available"
-        ]
+        "monthly_emi": emi_amount,
+        "available_income": available_income,
+        "debt_to_income_ratio": debt_to_income_ratio,
+        "can_afford": (available_income >= emi_amount) & (debt_to_income_ratio <= 40),
+        "total_payment": emi_amount * loan_tenure,
+        "total_interest": (emi_amount * loan_tenure) - loan_amount
     }
 
+@vectorized_simulation
+def handle_loan_affordability(inputs, contexts):
+    """💸 Can I Afford This? - Loan affordability analysis."""
+    
+    loan_amounts = batch_values(inputs, 'loan_amount', 100000)
+    loan_tenures = batch_values(inputs, 'loan_tenure', 12)  # months
+    interest_rates = batch_values(inputs, 'interest_rate', 12)  # annual %
+    metrics = loan_affordability_metrics(
+        batch_array(loan_amounts), batch_array(loan_tenures), batch_array(interest_rates),
+        batch_array(batch_values(contexts, 'monthly_income', None)),
+        batch_array(batch_values(contexts, 'monthly_expenses', None)),
+        batch_array(batch_values(contexts, 'existing_liabilities', 0))
+    )
+    
+    results = []
+    for loan_amount, loan_tenure, interest_rate, context, emi_amount, available_income, debt_to_income_ratio in zip(
+        loan_amounts, loan_tenures, interest_rates, contexts, metrics["monthly_emi"].tolist(),
+        metrics["available_income"].tolist(), metrics["debt_to_income_ratio"].tolist()
+    ):
+        # Risk assessment
+        risk_level = "Low"
+        if debt_to_income_ratio > 50:
+            risk_level = "High"
+        elif debt_to_income_ratio > 30:
+            risk_level = "Medium"
+        
+        can_afford = available_income >= emi_amount and debt_to_income_ratio <= 40
+        
+        results.append({
+            "title": "Loan Affordability Analysis",
+            "loan_details": {
+                "amount": loan_amount,
+                "tenure_months": loan_tenure,
+                "interest_rate": interest_rate,
+                "monthly_emi": round(emi_amount)
+            },
+            "affordability": {
+                "can_afford": can_afford,
+                "available_income": round(available_income),
+                "debt_to_income_ratio": round(debt_to_income_ratio, 1),
+                "risk_level": risk_level
+            },
+            "total_cost": {
+                "total_payment": round(emi_amount * loan_tenure),
+                "total_interest": round((emi_amount * loan_tenure) - loan_amount)
+            },
+            "recommendations": [
+                f"Keep debt-to-income ratio below 40% (currently {debt_to_income_ratio:.1f}%)",
+                "Consider shorter tenure to save on interest" if loan_tenure > 24 else "Current tenure is optimal",
+                "Build emergency fund before taking loan" if context['current_savings'] < (context['monthly_expenses'] * 3) else "Good emergency fund available"
+            ]
+        })
+    return results
+
 async def handle_savings_goal_tracker(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
     """📈 Savings Goal Tracker - Track progress towards financial goals."""
     
@@ -1990,69 +2059,95 @@ async def handle_life_event_planning(user_inputs, monthly_income, monthly_expens
         ]
     }
 
-async def handle_loan_impact_estimation(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
-    """🏦 Loan Impact Estimator - Estimate impact of taking a loan."""
-    
-    loan_amount = user_inputs.get('loan_amount', 20000)
-    loan_tenure = user_inputs.get('loan_tenure', 12)
-    loan_type = user_inputs.get('loan_type', 'personal')
-    
-    # Interest rates by loan type
-    interest_rates = {
-        'personal': 15,
-        'business': 12,
-        'education': 10,
-        'home': 8.5,
-        'vehicle': 9
-    }
-    
-    interest_rate = interest_rates.get(loan_type, 15)
-    
+# Interest rates by loan type
+LOAN_TYPE_INTEREST_RATES = {
+    'personal': 15,
+    'business': 12,
+    'education': 10,
+    'home': 8.5,
+    'vehicle': 9
+}
+
+def loan_type_interest_rate(loan_type: str) -> float:
+    return LOAN_TYPE_INTEREST_RATES.get(loan_type, 15)
+
+def loan_impact_metrics(loan_amount, loan_tenure, interest_rate, monthly_income, monthly_expenses, current_savings, existing_liabilities):
+    """EMI of a loan and its effect on the monthly budget; all arguments broadcast against each other."""
     # Calculate EMI
-    monthly_rate = interest_rate / (12 * 100)
-    emi = loan_amount * monthly_rate * (1 + monthly_rate)**loan_tenure / ((1 + monthly_rate)**loan_tenure - 1)
+    emi_amount = emi(loan_amount, monthly_rate(interest_rate), loan_tenure)
     
     # Impact analysis
-    new_monthly_expenses = monthly_expenses + emi
+    new_monthly_expenses = monthly_expenses + emi_amount
     new_savings = monthly_income - new_monthly_expenses
-    savings_reduction = current_savings - new_savings
-    
-    # Risk assessment
-    debt_burden = ((emi + existing_liabilities) / monthly_income) * 100
-    
+    total_repayment = emi_amount * loan_tenure
     return {
-        "title": "Loan Impact Estimation",
-        "loan_details": {
-            "amount": loan_amount,
-            "type": loan_type,
-            "tenure_months": loan_tenure,
-            "interest_rate": interest_rate,
-            "monthly_emi": round(emi)
-        },
-        "financial_impact": {
-            "new_monthly_expenses": round(new_monthly_expenses),
-            "new_monthly_savings": round(new_savings),
-            "savings_reduction": round(savings_reduction),
-            "debt_to_income_ratio": round(debt_burden, 1)
-        },
-        "total_cost": {
-            "total_repayment": round(emi * loan_tenure),
-            "total_interest": round((emi * loan_tenure) - loan_amount),
-            "interest_percentage": round(((emi * loan_tenure) - loan_amount) / loan_amount * 100, 1)
-        },
-        "risk_assessment": {
-            "risk_level": "High" if debt_burden > 50 else "Medium" if debt_burden > 30 else "Low",
-            "emergency_fund_impact": "Significant" if new_savings < 5000 else "Moderate",
-            "repayment_capacity": "Good" if new_savings > 0 else "Tight"
-        },
-        "recommendations": [
-            "Consider shorter tenure to reduce total interest" if loan_tenure > 24 else "Tenure is reasonable",
-            "Maintain emergency fund of 6 months expenses",
-            "Avoid taking additional loans during this period",
-            "Consider prepayment when possible to save interest"
-        ]
+        "monthly_emi": emi_amount,
+        "new_monthly_expenses": new_monthly_expenses,
+        "new_monthly_savings": new_savings,
+        "savings_reduction": current_savings - new_savings,
+        # Risk assessment
+        "debt_to_income_ratio": ((emi_amount + existing_liabilities) / monthly_income) * 100,
+        "total_repayment": total_repayment,
+        "total_interest": total_repayment - loan_amount
     }
 
+@vectorized_simulation
+def handle_loan_impact_estimation(inputs, contexts):
+    """🏦 Loan Impact Estimator - Estimate impact of taking a loan."""
+    
+    loan_amounts = batch_values(inputs, 'loan_amount', 20000)
+    loan_tenures = batch_values(inputs, 'loan_tenure', 12)
+    loan_types = batch_values(inputs, 'loan_type', 'personal')
+    
+    loan_rates = [loan_type_interest_rate(loan_type) for loan_type in loan_types]
+    metrics = loan_impact_metrics(
+        batch_array(loan_amounts), batch_array(loan_tenures), batch_array(loan_rates),
+        batch_array(batch_values(contexts, 'monthly_income', None)),
+        batch_array(batch_values(contexts, 'monthly_expenses', None)),
+        batch_array(batch_values(contexts, 'current_savings', None)),
+        batch_array(batch_values(contexts, 'existing_liabilities', 0))
+    )
+    
+    results = []
+    for loan_amount, loan_tenure, loan_type, interest_rate, emi_amount, new_monthly_expenses, new_savings, savings_reduction, debt_burden in zip(
+        loan_amounts, loan_tenures, loan_types, loan_rates, metrics["monthly_emi"].tolist(),
+        metrics["new_monthly_expenses"].tolist(), metrics["new_monthly_savings"].tolist(),
+        metrics["savings_reduction"].tolist(), metrics["debt_to_income_ratio"].tolist()
+    ):
+        results.append({
+            "title": "Loan Impact Estimation",
+            "loan_details": {
+                "amount": loan_amount,
+                "type": loan_type,
+                "tenure_months": loan_tenure,
+                "interest_rate": interest_rate,
+                "monthly_emi": round(emi_amount)
+            },
+            "financial_impact": {
+                "new_monthly_expenses": round(new_monthly_expenses),
+                "new_monthly_savings": round(new_savings),
+                "savings_reduction": round(savings_reduction),
+                "debt_to_income_ratio": round(debt_burden, 1)
+            },
+            "total_cost": {
+                "total_repayment": round(emi_amount * loan_tenure),
+                "total_interest": round((emi_amount * loan_tenure) - loan_amount),
+                "interest_percentage": round(((emi_amount * loan_tenure) - loan_amount) / loan_amount * 100, 1)
+            },
+            "risk_assessment": {
+                "risk_level": "High" if debt_burden > 50 else "Medium" if debt_burden > 30 else "Low",
+                "emergency_fund_impact": "Significant" if new_savings < 5000 else "Moderate",
+                "repayment_capacity": "Good" if new_savings > 0 else "Tight"
+            },
+            "recommendations": [
+                "Consider shorter tenure to reduce total interest" if loan_tenure > 24 else "Tenure is reasonable",
+                "Maintain emergency fund of 6 months expenses",
+                "Avoid taking additional loans during this period",
+                "Consider prepayment when possible to save interest"
+            ]
+        })
+    return results
+
 async def handle_income_drop_alert(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
     """🛑 Income Drop Alert - Analyze impact of income reduction."""
     
@@ -2163,58 +2258,85 @@ async def handle_festive_season_spending(user_inputs, monthly_income, monthly_ex
         ]
     }
 
-async def handle_retirement_readiness(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
+@vectorized_simulation
+def handle_retirement_readiness(inputs, contexts):
     """👴 Retirement Readiness - Plan for retirement."""
     
-    current_age = user_inputs.get('current_age', 30)
-    retirement_age = user_inputs.get('retirement_age', 60)
-    desired_monthly_income = user_inputs.get('desired_monthly_income', monthly_expenses)
+    current_ages = batch_values(inputs, 'current_age', 30)
+    retirement_ages = batch_values(inputs, 'retirement_age', 60)
+    desired_monthly_incomes = [
+        user_inputs.get('desired_monthly_income', context['monthly_expenses'])
+        for user_inputs, context in zip(inputs, contexts)
+    ]
+    current_retirement_savings = batch_values(inputs, 'current_retirement_savings', 0)
+    monthly_income = batch_array(batch_values(contexts, 'monthly_income', None))
+    current_savings = batch_array(batch_values(contexts, 'current_savings', None))
     
-    years_to_retirement = retirement_age - current_age
+    years_to_retirement = batch_array(retirement_ages) - batch_array(current_ages)
     months_to_retirement = years_to_retirement * 12
     
     # Calculate retirement corpus needed (25x annual expenses rule)
-    annual_retirement_income = desired_monthly_income * 12
+    annual_retirement_income = batch_array(desired_monthly_incomes) * 12
     retirement_corpus_needed = annual_retirement_income * 25
     
     # Calculate monthly SIP needed (assuming 12% annual return)
-    monthly_return_rate = 0.12 / 12
-    if months_to_retirement > 0:
-        monthly_sip_needed = retirement_corpus_needed * monthly_return_rate / ((1 + monthly_return_rate)**months_to_retirement - 1)
-    else:
-        monthly_sip_needed = retirement_corpus_needed
+    monthly_sip_needed = np.where(
+        months_to_retirement > 0,
+        sip_for_goal(retirement_corpus_needed, monthly_rate(12), np.maximum(months_to_retirement, 1), due=False),
+        retirement_corpus_needed
+    )
     
     # Current retirement readiness
-    current_retirement_savings = user_inputs.get('current_retirement_savings', 0)
-    readiness_percentage = (current_retirement_savings / retirement_corpus_needed) * 100 if retirement_corpus_needed > 0 else 0
-    
-    return {
-        "title": "Retirement Readiness Analysis",
-        "retirement_plan": {
-            "current_age": current_age,
-            "retirement_age": retirement_age,
-            "years_to_retirement": years_to_retirement,
-            "desired_monthly_income": desired_monthly_income
-        },
-        "corpus_calculation": {
-            "retirement_corpus_needed": round(retirement_corpus_needed),
-            "current_retirement_savings": current_retirement_savings,
-            "gap_amount": round(retirement_corpus_needed - current_retirement_savings),
-            "readiness_percentage": round(readiness_percentage, 1)
-        },
-        "investment_plan": {
-            "monthly_sip_needed": round(monthly_sip_needed),
-            "affordable_with_current_savings": monthly_sip_needed <= current_savings,
-            "percentage_of_income": round((monthly_sip_needed / monthly_income) * 100, 1)
-        },
-        "recommendations": [
-            f"Start SIP of ₹{monthly_sip_needed:,.0f} monthly for retirement",
-            "Invest in equity mutual funds for long-term growth",
-            "Consider EPF, PPF, and NPS for tax benefits",
-            "Review and increase SIP amount annually",
-            "Don't rely solely on traditional savings accounts"
-        ]
-    }
+    has_corpus = retirement_corpus_needed > 0
+    readiness_percentage = np.where(
+        has_corpus, (batch_array(current_retirement_savings) / np.where(has_corpus, retirement_corpus_needed, 1)) * 100, 0
+    )
+    affordable = monthly_sip_needed <= current_savings
+    percentage_of_income = (monthly_sip_needed / monthly_income) * 100
+    
+    results = []
+    for user_inputs, current_age, retirement_age, desired_monthly_income, current_retirement_saving, corpus_needed, sip_needed, readiness, is_affordable, income_share in zip(
+        inputs, current_ages, retirement_ages, desired_monthly_incomes, current_retirement_savings,
+        retirement_corpus_needed.tolist(), monthly_sip_needed.tolist(), readiness_percentage.tolist(),
+        affordable.tolist(), percentage_of_income.tolist()
+    ):
+        result = {
+            "title": "Retirement Readiness Analysis",
+            "retirement_plan": {
+                "current_age": current_age,
+                "retirement_age": retirement_age,
+                "years_to_retirement": retirement_age - current_age,
+                "desired_monthly_income": desired_monthly_income
+            },
+            "corpus_calculation": {
+                "retirement_corpus_needed": round(corpus_needed),
+                "current_retirement_savings": current_retirement_saving,
+                "gap_amount": round(corpus_needed - current_retirement_saving),
+                "readiness_percentage": round(readiness, 1)
+            },
+            "investment_plan": {
+                "monthly_sip_needed": round(sip_needed),
+                "affordable_with_current_savings": is_affordable,
+                "percentage_of_income": round(income_share, 1)
+            },
+            "recommendations": [
+                f"Start SIP of ₹{sip_needed:,.0f} monthly for retirement",
+                "Invest in equity mutual funds for long-term growth",
+                "Consider EPF, PPF, and NPS for tax benefits",
+                "Review and increase SIP amount annually",
+                "Don't rely solely on traditional savings accounts"
+            ]
+        }
+        if wants_monte_carlo(user_inputs):
+            # The planned SIP (or the user's own) on top of today's savings, against the corpus needed
+            portfolio = INVESTMENT_PORTFOLIOS.get(user_inputs.get('risk_tolerance'), RETIREMENT_PORTFOLIO)
+            result["monte_carlo"] = project_sip(
+                portfolio, user_inputs.get('monthly_sip', sip_needed), round((retirement_age - current_age) * 12),
+                goal_amount=corpus_needed, initial_value=current_retirement_saving, contribution_at_start=False,
+                paths=user_inputs.get('paths'), seed=user_inputs.get('seed')
+            )
+        results.append(result)
+    return results
 
 async def handle_weather_event_impact(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
     """🌾 Weather/Event Impact - For farmers and daily wage earners."""
@@ -2282,146 +2404,209 @@ async def handle_weather_event_impact(user_inputs, monthly_income, monthly_expen
         ]
     }
 
-async def handle_emi_vs_saving_dilemma(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
-    """🧾 EMI vs Saving Dilemma - Should I take EMI or save to buy?"""
-    
-    item_cost = user_inputs.get('item_cost', 50000)
-    item_type = user_inputs.get('item_type', 'electronics')
-    emi_tenure = user_inputs.get('emi_tenure', 12)
-    emi_interest_rate = user_inputs.get('interest_rate', 15)
-    
+# Depreciation factor for different items
+ITEM_DEPRECIATION_RATES = {
+    'electronics': 0.15,  # 15% annual depreciation
+    'vehicle': 0.10,      # 10% annual depreciation
+    'furniture': 0.05,    # 5% annual depreciation
+    'appliances': 0.08    # 8% annual depreciation
+}
+
+def item_depreciation_rate(item_type: str) -> float:
+    return ITEM_DEPRECIATION_RATES.get(item_type, 0.10)
+
+def emi_vs_saving_metrics(item_cost, emi_tenure, interest_rate, depreciation_rate, monthly_income, current_savings):
+    """Cost of buying on EMI against saving up first; all arguments broadcast against each other."""
     # EMI Option Analysis
-    monthly_rate = emi_interest_rate / (12 * 100)
-    emi_amount = item_cost * monthly_rate * (1 + monthly_rate)**emi_tenure / ((1 + monthly_rate)**emi_tenure - 1)
+    emi_amount = emi(item_cost, monthly_rate(interest_rate), emi_tenure)
     total_emi_cost = emi_amount * emi_tenure
-    total_interest = total_emi_cost - item_cost
     
     # Saving Option Analysis
-    months_to_save = item_cost / current_savings if current_savings > 0 else float('inf')
+    can_save = current_savings > 0
+    months_to_save = np.where(can_save, nper(0, np.where(can_save, current_savings, 1), 0, item_cost), np.inf)
     
     # Investment opportunity cost
-    if current_savings > 0:
-        investment_returns = current_savings * months_to_save * 0.01  # 12% annual return
-    else:
-        investment_returns = 0
-    
-    # Depreciation factor for different items
-    depreciation_rates = {
-        'electronics': 0.15,  # 15% annual depreciation
-        'vehicle': 0.10,      # 10% annual depreciation
-        'furniture': 0.05,    # 5% annual depreciation
-        'appliances': 0.08    # 8% annual depreciation
-    }
-    
-    depreciation_rate = depreciation_rates.get(item_type, 0.10)
-    item_value_after_saving = item_cost * (1 - depreciation_rate * (months_to_save / 12))
-    
+    investment_returns = np.where(can_save, current_savings * months_to_save * 0.01, 0)  # 12% annual return
+    saving_effective_cost = item_cost - investment_returns
     return {
-        "title": "EMI vs Saving Analysis",
-        "item_details": {
-            "type": item_type,
-            "cost": item_cost,
-            "emi_tenure": emi_tenure,
-            "interest_rate": emi_interest_rate
-        },
-        "emi_option": {
-            "monthly_emi": round(emi_amount),
-            "total_cost": round(total_emi_cost),
-            "total_interest": round(total_interest),
-            "immediate_ownership": True,
-            "impact_on_monthly_budget": round((emi_amount / monthly_income) * 100, 1)
-        },
-        "saving_option": {
-            "months_to_save": round(months_to_save, 1) if months_to_save != float('inf') else "Cannot save with current rate",
-            "opportunity_cost": round(investment_returns),
-            "item_value_when_purchased": round(item_value_after_saving),
-            "total_effective_cost": round(item_cost - investment_returns),
-            "delayed_ownership": True
-        },
-        "comparison": {
-            "emi_total_cost": round(total_emi_cost),
-            "saving_effective_cost": round(item_cost - investment_returns),
-            "savings_advantage": round(total_emi_cost - (item_cost - investment_returns)),
-            "recommended_option": "Save" if (total_emi_cost > item_cost - investment_returns) else "EMI"
-        },
-        "recommendations": [
-            "Save if you can wait and invest the money" if total_emi_cost > item_cost - investment_returns else "EMI might be better for immediate need",
-            "Consider 0% EMI offers if available",
-            "Factor in urgency of need",
-            "Check for seasonal discounts while saving"
-        ]
+        "monthly_emi": emi_amount,
+        "total_emi_cost": total_emi_cost,
+        "total_interest": total_emi_cost - item_cost,
+        "impact_on_monthly_budget": (emi_amount / monthly_income) * 100,
+        "months_to_save": months_to_save,
+        "opportunity_cost": investment_returns,
+        "item_value_when_purchased": item_cost * (1 - depreciation_rate * (months_to_save / 12)),
+        "saving_effective_cost": saving_effective_cost,
+        "savings_advantage": total_emi_cost - saving_effective_cost
     }
 
-async def handle_investment_planning(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
-    """💡 Investment Planning - Plan investment strategy."""
-    
-    investment_amount = user_inputs.get('monthly_investment', 2000)
-    investment_duration = user_inputs.get('duration_years', 5)
-    risk_tolerance = user_inputs.get('risk_tolerance', 'moderate')
-    investment_goal = user_inputs.get('goal', 'wealth_creation')
-    
-    # Investment options based on risk tolerance
-    investment_options = {
-        'conservative': {
-            'fd': {'allocation': 40, 'return': 6.5},
-            'ppf': {'allocation': 30, 'return': 7.1},
-            'debt_funds': {'allocation': 30, 'return': 7.5}
-        },
-        'moderate': {
-            'equity_funds': {'allocation': 50, 'return': 12},
-            'debt_funds': {'allocation': 30, 'return': 7.5},
-            'fd': {'allocation': 20, 'return': 6.5}
-        },
-        'aggressive': {
-            'equity_funds': {'allocation': 70, 'return': 15},
-            'small_cap_funds': {'allocation': 20, 'return': 18},
-            'debt_funds': {'allocation': 10, 'return': 7.5}
-        }
-    }
+@vectorized_simulation
+def handle_emi_vs_saving_dilemma(inputs, contexts):
+    """🧾 EMI vs Saving Dilemma - Should I take EMI or save to buy?"""
     
-    portfolio = investment_options.get(risk_tolerance, investment_options['moderate'])
+    item_costs = batch_values(inputs, 'item_cost', 50000)
+    item_types = batch_values(inputs, 'item_type', 'electronics')
+    emi_tenures = batch_values(inputs, 'emi_tenure', 12)
+    emi_interest_rates = batch_values(inputs, 'interest_rate', 15)
+    monthly_income = batch_array(batch_values(contexts, 'monthly_income', None))
+    metrics = emi_vs_saving_metrics(
+        batch_array(item_costs), batch_array(emi_tenures), batch_array(emi_interest_rates),
+        batch_array([item_depreciation_rate(item_type) for item_type in item_types]),
+        monthly_income, batch_array(batch_values(contexts, 'current_savings', None))
+    )
     
+    results = []
+    for item_cost, item_type, emi_tenure, emi_interest_rate, emi_amount, total_emi_cost, total_interest, monthly_income, months_to_save, investment_returns, item_value_after_saving in zip(
+        item_costs, item_types, emi_tenures, emi_interest_rates, metrics["monthly_emi"].tolist(),
+        metrics["total_emi_cost"].tolist(), metrics["total_interest"].tolist(), monthly_income.tolist(),
+        metrics["months_to_save"].tolist(), metrics["opportunity_cost"].tolist(),
+        metrics["item_value_when_purchased"].tolist()
+    ):
+        results.append({
+            "title": "EMI vs Saving Analysis",
+            "item_details": {
+                "type": item_type,
+                "cost": item_cost,
+                "emi_tenure": emi_tenure,
+                "interest_rate": emi_interest_rate
+            },
+            "emi_option": {
+                "monthly_emi": round(emi_amount),
+                "total_cost": round(total_emi_cost),
+                "total_interest": round(total_interest),
+                "immediate_ownership": True,
+                "impact_on_monthly_budget": round((emi_amount / monthly_income) * 100, 1)
+            },
+            "saving_option": {
+                "months_to_save": round(months_to_save, 1) if months_to_save != float('inf') else "Cannot save with current rate",
+                "opportunity_cost": round(investment_returns),
+                "item_value_when_purchased": round(item_value_after_saving),
+                "total_effective_cost": round(item_cost - investment_returns),
+                "delayed_ownership": True
+            },
+            "comparison": {
+                "emi_total_cost": round(total_emi_cost),
+                "saving_effective_cost": round(item_cost - investment_returns),
+                "savings_advantage": round(total_emi_cost - (item_cost - investment_returns)),
+                "recommended_option": "Save" if (total_emi_cost > item_cost - investment_returns) else "EMI"
+            },
+            "recommendations": [
+                "Save if you can wait and invest the money" if total_emi_cost > item_cost - investment_returns else "EMI might be better for immediate need",
+                "Consider 0% EMI offers if available",
+                "Factor in urgency of need",
+                "Check for seasonal discounts while saving"
+            ]
+        })
+    return results
+
+# Investment options based on risk tolerance; monte_carlo.py adds each asset class's volatility
+INVESTMENT_PORTFOLIOS = {
+    'conservative': {
+        'fd': {'allocation': 40, 'return': 6.5},
+        'ppf': {'allocation': 30, 'return': 7.1},
+        'debt_funds': {'allocation': 30, 'return': 7.5}
+    },
+    'moderate': {
+        'equity_funds': {'allocation': 50, 'return': 12},
+        'debt_funds': {'allocation': 30, 'return': 7.5},
+        'fd': {'allocation': 20, 'return': 6.5}
+    },
+    'aggressive': {
+        'equity_funds': {'allocation': 70, 'return': 15},
+        'small_cap_funds': {'allocation': 20, 'return': 18},
+        'debt_funds': {'allocation': 10, 'return': 7.5}
+    }
+}
+
+# What the deterministic retirement plan assumes: everything in equity funds at 12%
+RETIREMENT_PORTFOLIO = {'equity_funds': {'allocation': 100, 'return': 12}}
+
+def risk_tolerance_portfolio(risk_tolerance: str) -> Dict[str, Dict[str, float]]:
+    return INVESTMENT_PORTFOLIOS.get(risk_tolerance, INVESTMENT_PORTFOLIOS['moderate'])
+
+def portfolio_return(portfolio: Dict[str, Dict[str, float]]) -> float:
+    """Allocation-weighted expected annual return (%) of a portfolio."""
+    return sum(option['allocation'] * option['return'] for option in portfolio.values()) / 100
+
+def investment_planning_metrics(monthly_investment, duration_years, expected_return, monthly_income, current_savings):
+    """Projection of a monthly SIP; all arguments broadcast against each other."""
     # Calculate returns
-    total_investment = investment_amount * 12 * investment_duration
-    weighted_return = sum(option['allocation'] * option['return'] for option in portfolio.values()) / 100
+    total_investment = monthly_investment * 12 * duration_years
     
     # Future value calculation (SIP)
-    monthly_return = weighted_return / (12 * 100)
-    months = investment_duration * 12
-    future_value = investment_amount * (((1 + monthly_return)**months - 1) / monthly_return) * (1 + monthly_return)
+    future_value = fv_sip(monthly_investment, monthly_rate(expected_return), duration_years * 12)
     
     total_returns = future_value - total_investment
-    
     return {
-        "title": "Investment Planning Strategy",
-        "investment_details": {
-            "monthly_amount": investment_amount,
-            "duration_years": investment_duration,
-            "risk_tolerance": risk_tolerance,
-            "goal": investment_goal
-        },
-        "portfolio_allocation": portfolio,
-        "projection": {
-            "total_investment": round(total_investment),
-            "expected_return_rate": round(weighted_return, 1),
-            "future_value": round(future_value),
-            "total_returns": round(total_returns),
-            "return_percentage": round((total_returns / total_investment) * 100, 1)
-        },
-        "sip_analysis": {
-            "monthly_sip": investment_amount,
-            "affordable": investment_amount <= current_savings,
-            "percentage_of_income": round((investment_amount / monthly_income) * 100, 1)
-        },
-        "recommendations": [
-            f"Start SIP of ₹{investment_amount:,} based on your {risk_tolerance} risk profile",
-            "Diversify across asset classes as shown in allocation",
-            "Review and rebalance portfolio annually",
-            "Increase SIP amount by 10% every year",
-            "Stay invested for the full duration for best results"
-        ]
+        "total_investment": total_investment,
+        "future_value": future_value,
+        "total_returns": total_returns,
+        "return_percentage": (total_returns / total_investment) * 100,
+        "affordable": monthly_investment <= current_savings,
+        "percentage_of_income": (monthly_investment / monthly_income) * 100
     }
 
+@vectorized_simulation
+def handle_investment_planning(inputs, contexts):
+    """💡 Investment Planning - Plan investment strategy."""
+    
+    investment_amounts = batch_values(inputs, 'monthly_investment', 2000)
+    investment_durations = batch_values(inputs, 'duration_years', 5)
+    risk_tolerances = batch_values(inputs, 'risk_tolerance', 'moderate')
+    investment_goals = batch_values(inputs, 'goal', 'wealth_creation')
+    
+    portfolios = [risk_tolerance_portfolio(risk_tolerance) for risk_tolerance in risk_tolerances]
+    weighted_returns = [portfolio_return(portfolio) for portfolio in portfolios]
+    metrics = investment_planning_metrics(
+        batch_array(investment_amounts), batch_array(investment_durations), batch_array(weighted_returns),
+        batch_array(batch_values(contexts, 'monthly_income', None)),
+        batch_array(batch_values(contexts, 'current_savings', None))
+    )
+    
+    results = []
+    for user_inputs, investment_amount, investment_duration, risk_tolerance, investment_goal, portfolio, weighted_return, context, total_investment, future_value, total_returns in zip(
+        inputs, investment_amounts, investment_durations, risk_tolerances, investment_goals, portfolios, weighted_returns,
+        contexts, metrics["total_investment"].tolist(), metrics["future_value"].tolist(), metrics["total_returns"].tolist()
+    ):
+        result = {
+            "title": "Investment Planning Strategy",
+            "investment_details": {
+                "monthly_amount": investment_amount,
+                "duration_years": investment_duration,
+                "risk_tolerance": risk_tolerance,
+                "goal": investment_goal
+            },
+            "portfolio_allocation": portfolio,
+            "projection": {
+                "total_investment": round(total_investment),
+                "expected_return_rate": round(weighted_return, 1),
+                "future_value": round(future_value),
+                "total_returns": round(total_returns),
+                "return_percentage": round((total_returns / total_investment) * 100, 1)
+            },
+            "sip_analysis": {
+                "monthly_sip": investment_amount,
+                "affordable": investment_amount <= context['current_savings'],
+                "percentage_of_income": round((investment_amount / context['monthly_income']) * 100, 1)
+            },
+            "recommendations": [
+                f"Start SIP of ₹{investment_amount:,} based on your {risk_tolerance} risk profile",
+                "Diversify across asset classes as shown in allocation",
+                "Review and rebalance portfolio annually",
+                "Increase SIP amount by 10% every year",
+                "Stay invested for the full duration for best results"
+            ]
+        }
+        if wants_monte_carlo(user_inputs):
+            # Without a target amount, the goal is the deterministic projection itself
+            result["monte_carlo"] = project_sip(
+                portfolio, investment_amount, round(investment_duration * 12),
+                goal_amount=user_inputs.get('target_amount') or future_value,
+                paths=user_inputs.get('paths'), seed=user_inputs.get('seed')
+            )
+        results.append(result)
+    return results
+
 async def handle_best_option_selector(user_inputs, monthly_income, monthly_expenses, current_savings, location, family_size, income_type, existing_liabilities, user):
     """📊 Best Option Selector - Compare different financial options."""
     
@@ -2457,7 +2642,7 @@ async def handle_best_option_selector(user_inputs, monthly_income, monthly_expen
     # Investment opportunity of savings
     if savings_difference > 0:
         monthly_savings = savings_difference / (12 * comparison_period)
-        investment_value = monthly_savings * (((1 + 0.01)**36 - 1) / 0.01) * 1.01  # 12% annual return
+        investment_value = float(fv_sip(monthly_savings, monthly_rate(12), 12 * comparison_period))  # 12% annual return
     else:
         investment_value = 0
     
@@ -2501,4 +2686,307 @@ async def handle_best_option_selector(user_inputs, monthly_income, monthly_expen
             "Factor in your current financial goals and priorities",
             "Evaluate based on your income stability and emergency fund status"
         ]
-    }
\ No newline at end of file
+    }
+
+# Simulation handlers by type; handlers with a `batch` kernel are evaluated together in batches
+SIMULATION_HANDLERS = {
+    'monthly_budget_forecast': handle_monthly_budget_forecast,
+    'loan_affordability': handle_loan_affordability,
+    'savings_goal_tracker': handle_savings_goal_tracker,
+    'expense_reduction_impact': handle_expense_reduction_impact,
+    'life_event_planning': handle_life_event_planning,
+    'loan_impact_estimation': handle_loan_impact_estimation,
+    'income_drop_alert': handle_income_drop_alert,
+    'festive_season_spending': handle_festive_season_spending,
+    'retirement_readiness': handle_retirement_readiness,
+    'weather_event_impact': handle_weather_event_impact,
+    'emi_vs_saving_dilemma': handle_emi_vs_saving_dilemma,
+    'investment_planning': handle_investment_planning,
+    'best_option_selector': handle_best_option_selector
+}
+
+class SweepParameter(NamedTuple):
+    """An input a sweep can vary: the handler's default and how a value becomes a number."""
+    default: Any
+    numeric: Callable[[Any], float] = float
+
+class SimulationSweep(NamedTuple):
+    """A vectorized simulation evaluated over a grid of its inputs."""
+    title: str
+    metrics: Callable[..., Dict[str, np.ndarray]]
+    # Positional arguments of `metrics`: the sweepable inputs, then fields of the simulation context
+    parameters: Dict[str, SweepParameter]
+    context: Tuple[str, ...]
+    # Decimal places of each reported metric; None for flags
+    rounding: Dict[str, Optional[int]]
+
+# Simulations that can be swept over a grid of inputs with POST /simulations/sweep
+SIMULATION_SWEEPS = {
+    'loan_affordability': SimulationSweep(
+        title="Loan Affordability Sweep",
+        metrics=loan_affordability_metrics,
+        parameters={
+            'loan_amount': SweepParameter(100000),
+            'loan_tenure': SweepParameter(12),
+            'interest_rate': SweepParameter(12)
+        },
+        context=('monthly_income', 'monthly_expenses', 'existing_liabilities'),
+        rounding={'monthly_emi': 0, 'debt_to_income_ratio': 1, 'can_afford': None, 'total_payment': 0, 'total_interest': 0}
+    ),
+    'loan_impact_estimation': SimulationSweep(
+        title="Loan Impact Sweep",
+        metrics=loan_impact_metrics,
+        parameters={
+            'loan_amount': SweepParameter(20000),
+            'loan_tenure': SweepParameter(12),
+            'loan_type': SweepParameter('personal', loan_type_interest_rate)
+        },
+        context=('monthly_income', 'monthly_expenses', 'current_savings', 'existing_liabilities'),
+        rounding={'monthly_emi': 0, 'new_monthly_savings': 0, 'debt_to_income_ratio': 1, 'total_interest': 0}
+    ),
+    'emi_vs_saving_dilemma': SimulationSweep(
+        title="EMI vs Saving Sweep",
+        metrics=emi_vs_saving_metrics,
+        parameters={
+            'item_cost': SweepParameter(50000),
+            'emi_tenure': SweepParameter(12),
+            'interest_rate': SweepParameter(15),
+            'item_type': SweepParameter('electronics', item_depreciation_rate)
+        },
+        context=('monthly_income', 'current_savings'),
+        rounding={
+            'monthly_emi': 0, 'total_interest': 0, 'impact_on_monthly_budget': 1, 'months_to_save': 1,
+            'item_value_when_purchased': 0, 'saving_effective_cost': 0, 'savings_advantage': 0
+        }
+    ),
+    'investment_planning': SimulationSweep(
+        title="Investment Planning Sweep",
+        metrics=investment_planning_metrics,
+        parameters={
+            'monthly_investment': SweepParameter(2000),
+            'duration_years': SweepParameter(5),
+            'risk_tolerance': SweepParameter('moderate', lambda risk_tolerance: portfolio_return(risk_tolerance_portfolio(risk_tolerance)))
+        },
+        context=('monthly_income', 'current_savings'),
+        rounding={
+            'total_investment': 0, 'future_value': 0, 'total_returns': 0, 'return_percentage': 1,
+            'affordable': None, 'percentage_of_income': 1
+        }
+    )
+}
+
+def sweep_argument(name: str, parameter: SweepParameter, value: Any) -> float:
+    try:
+        return parameter.numeric(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}")
+
+def grid_cells(values: np.ndarray, decimals: Optional[int]) -> List[Any]:
+    """Nested lists of rounded values; cells that are not finite become None (null)."""
+    if decimals is None:
+        return values.tolist()
+    finite = np.isfinite(values)
+    rounded = np.round(np.where(finite, values, 0), decimals)
+    cells = (rounded.astype(np.int64) if decimals == 0 else rounded).astype(object)
+    cells[~finite] = None
+    return cells.tolist()
+
+def evaluate_sweep(
+    sweep: SimulationSweep,
+    user_inputs: Dict[str, Any],
+    axes: Dict[str, List[Any]],
+    context: Dict[str, Any],
+    metrics: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Evaluate a simulation over the outer product of `axes` (input name -> values).
+
+    Each swept input becomes an array along its own dimension, so one call of
+    the metrics function broadcasts to the whole grid. Inputs that are not
+    swept come from `user_inputs` or the handler's default. Each metric is
+    returned as nested lists indexed in the order of `axes`.
+    """
+    unknown = [name for name in axes if name not in sweep.parameters]
+    if unknown:
+        raise ValueError(f"Cannot sweep {', '.join(unknown)}; sweepable inputs are {', '.join(sweep.parameters)}")
+    reported = list(sweep.rounding) if metrics is None else metrics
+    if not isinstance(reported, list) or not all(isinstance(metric, str) and metric in sweep.rounding for metric in reported):
+        raise ValueError(f"metrics must be a list of: {', '.join(sweep.rounding)}")
+    
+    dimensions = list(axes)
+    shape = tuple(len(axes[name]) for name in dimensions)
+    arguments = []
+    for name, parameter in sweep.parameters.items():
+        if name in axes:
+            values = np.array([sweep_argument(name, parameter, value) for value in axes[name]], dtype=float)
+            arguments.append(values.reshape([-1 if axis == name else 1 for axis in dimensions]))
+        else:
+            arguments.append(sweep_argument(name, parameter, user_inputs.get(name, parameter.default)))
+    arguments.extend(context[field] for field in sweep.context)
+    
+    # Degenerate cells (a zero tenure) become inf/NaN and are reported as null
+    with np.errstate(all='ignore'):
+        grid = sweep.metrics(*arguments)
+    return {
+        "title": sweep.title,
+        "axes": axes,
+        "fixed": {
+            name: user_inputs.get(name, parameter.default)
+            for name, parameter in sweep.parameters.items() if name not in axes
+        },
+        "shape": list(shape),
+        "metrics": {
+            metric: grid_cells(np.broadcast_to(grid[metric], shape), sweep.rounding[metric]) for metric in reported
+        }
+    }
+
+async def run_financial_simulation_sweep(
+    simulation_type: str,
+    user_inputs: Dict[str, Any],
+    axes: Dict[str, List[Any]],
+    user_profile: Dict[str, Any],
+    db_profile: Any,
+    user: User,
+    metrics: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Evaluate a simulation over a grid of inputs; raises ValueError for inputs that cannot be swept."""
+    sweep = SIMULATION_SWEEPS.get(simulation_type)
+    if not sweep:
+        raise ValueError(f"Simulation type cannot be swept; choose one of: {', '.join(SIMULATION_SWEEPS)}")
+    check_profile_numbers(user_profile)
+    context = simulation_context(user_profile, db_profile, user)
+    return await asyncio.to_thread(evaluate_sweep, sweep, user_inputs, axes, context, metrics)
+
+# Loan simulations that can be exported as schedules: their principal, tenure and rate inputs
+LOAN_SCHEDULE_INPUTS = {
+    'loan_affordability': ('loan_amount', 'loan_tenure', 'interest_rate'),
+    'loan_impact_estimation': ('loan_amount', 'loan_tenure', 'loan_type'),
+    'emi_vs_saving_dilemma': ('item_cost', 'emi_tenure', 'interest_rate')
+}
+
+def loan_schedule_terms(
+    items: List[Dict[str, Any]],
+    user_profile: Dict[str, Any],
+    db_profile: Any,
+    user: User
+) -> LoanTerms:
+    """
+    Loan terms of simulation items, for schedule exports.
+
+    Items are read like batch items: inputs default as in their handler, and
+    an item's own `user_profile` overrides the request's. Raises ValueError
+    naming the first item that is not a loan simulation or cannot be scheduled.
+    """
+    rows = []
+    for index, item in enumerate(items):
+        simulation_type = item.get('simulation_type')
+        names = LOAN_SCHEDULE_INPUTS.get(simulation_type)
+        if not names:
+            raise ValueError(f"Item {index}: schedules are available for {', '.join(LOAN_SCHEDULE_INPUTS)}")
+        parameters = SIMULATION_SWEEPS[simulation_type].parameters
+        user_inputs = item.get('inputs') or {}
+        try:
+            principal, tenure, annual_rate = (
+                sweep_argument(name, parameters[name], user_inputs.get(name, parameters[name].default)) for name in names
+            )
+        except ValueError as e:
+            raise ValueError(f"Item {index}: {e}")
+        for name, value in ((names[0], principal), (names[2], annual_rate)):
+            if not math.isfinite(value):
+                raise ValueError(f"Item {index}: {name} must be a finite number, got {value!r}")
+        if principal <= 0:
+            raise ValueError(f"Item {index}: {names[0]} must be positive")
+        if not (tenure.is_integer() and 1 <= tenure <= SCHEDULE_MAX_MONTHS):
+            raise ValueError(f"Item {index}: {names[1]} must be a whole number of months from 1 to {SCHEDULE_MAX_MONTHS}")
+        if annual_rate < 0:
+            raise ValueError(f"Item {index}: {names[2]} must not be negative")
+
+        item_profile = {**user_profile, **(item.get('user_profile') or {})}
+        try:
+            check_profile_numbers(item_profile)
+        except ValueError as e:
+            raise ValueError(f"Item {index}: {e}")
+        context = simulation_context(item_profile, db_profile, user)
+        surplus = context['monthly_income'] - context['monthly_expenses'] - context['existing_liabilities']
+        rows.append((principal, annual_rate, tenure, surplus))
+
+    principal, annual_rate, tenure, surplus = np.array(rows, dtype=float).reshape(-1, 4).T
+    return LoanTerms(principal=principal, annual_rate=annual_rate, tenure=tenure.astype(np.int64), surplus=surplus)
+
+def run_batch_kernel(kernel, inputs: List[Dict[str, Any]], contexts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Run a vectorized kernel over a group, giving rows it cannot compute an error result.
+
+    One bad row fails the whole call, so a failing group is split in half and
+    each half retried. A few bad rows cost a few extra passes over shrinking
+    halves, not a rerun of every item on its own. A single row that still fails
+    gets the error it would get from /simulations/run.
+    """
+    try:
+        return kernel(inputs, contexts)
+    except Exception as e:
+        if len(inputs) == 1:
+            return [{"error": f"Error running simulation: {str(e)}"}]
+    middle = len(inputs) // 2
+    return (
+        run_batch_kernel(kernel, inputs[:middle], contexts[:middle])
+        + run_batch_kernel(kernel, inputs[middle:], contexts[middle:])
+    )
+
+async def run_financial_simulation_batch(
+    items: List[Dict[str, Any]],
+    user_profile: Dict[str, Any],
+    db_profile: Any,
+    user: User
+) -> List[Dict[str, Any]]:
+    """
+    Run many simulations in one pass, returning one result per item in order.
+
+    Items are grouped by simulation type. Each group with a vectorized kernel
+    is computed in a single NumPy pass on a worker thread; other types run
+    through their handler item by item. An item may carry its own
+    `user_profile`, which overrides the batch-wide one for that item only.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    groups: Dict[Any, List[int]] = {}
+    for index, item in enumerate(items):
+        try:
+            groups.setdefault(item.get('simulation_type'), []).append(index)
+        except TypeError:
+            # An unhashable type, such as a list, names no handler
+            results[index] = {"error": "Unknown simulation type"}
+    
+    for simulation_type, group in groups.items():
+        handler = SIMULATION_HANDLERS.get(simulation_type)
+        if not handler:
+            for index in group:
+                results[index] = {"error": "Unknown simulation type"}
+            continue
+        
+        # A profile the context cannot be built from (a non-numeric income, say) fails its own item only
+        indexes, inputs, contexts = [], [], []
+        for index in group:
+            try:
+                context = simulation_context({**user_profile, **(items[index].get('user_profile') or {})}, db_profile, user)
+            except Exception as e:
+                results[index] = {"error": f"Error running simulation: {str(e)}"}
+                continue
+            indexes.append(index)
+            inputs.append(items[index].get('inputs') or {})
+            contexts.append(context)
+        if not indexes:
+            continue
+        kernel = getattr(handler, 'batch', None)
+        if kernel:
+            group_results = await asyncio.to_thread(run_batch_kernel, kernel, inputs, contexts)
+            for index, result in zip(indexes, group_results):
+                results[index] = result
+            continue
+        
+        for index, user_inputs, context in zip(indexes, inputs, contexts):
+            try:
+                results[index] = await handler(user_inputs=user_inputs, user=user, **context)
+            except Exception as e:
+                results[index] = {"error": f"Error running simulation: {str(e)}"}
+    
+    return results
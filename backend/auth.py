@@ -1,26 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
+import hashlib
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
-from database import get_db
+from cache import ResponseCache, entity_tag, response_cache, single_flight
+from database import AsyncSessionLocal, get_async_read_db
 from models import User
 from schemas import TokenData
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Empty by default, which keeps the /admin endpoints closed until someone configures them
+ADMIN_EMAILS = {
+    email.strip().lower() for email in os.getenv("ADMIN_EMAILS", "").split(",") if email.strip()
+}
+
+# Authenticated users are cached per (email, token expiry) for at most this many seconds; 0 disables
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", "300"))
+PRINCIPALS = "principals"
+# Same entity as main.USER, so invalidate_user_cache(user_id, USER) also drops the cached principal
+USER_ENTITY = "user"
+
+# Verified access tokens are cached in memory until their `exp`, so repeat requests skip jwt.decode
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))  # 0 disables
+VERIFIED_TOKENS = "verified_tokens"
+# Kept out of response_cache on purpose: that one may be a shared SQLite file or a snapshot on disk
+token_cache = ResponseCache(
+    max_entries=max(TOKEN_CACHE_SIZE, 1), max_bytes=max(TOKEN_CACHE_SIZE, 1) * 1024,
+    default_ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+# Password hashing. Changing BCRYPT_ROUNDS rehashes each password at its owner's next login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt releases the GIL, so a few threads hash in parallel while the event loop keeps serving requests
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
 
 # Security scheme
 security = HTTPBearer()
@@ -33,15 +66,74 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
+async def hash_password(password: str) -> str:
+    """Generate a password hash on the bcrypt pool instead of the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(password_executor, pwd_context.hash, password)
+
+async def check_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the bcrypt pool. Also returns a new hash when the
+    stored one no longer matches the configured scheme or cost, else None.
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        password_executor, pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def store_rehashed_password(user_id: int, old_hash: str, new_hash: str) -> None:
+    """Save a rehashed password unless it was changed meanwhile; login only has a read session."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+    except Exception as e:
+        # The old hash still verifies; the next login tries again
+        logger.warning(f"Could not store rehashed password for user {user_id}: {str(e)}")
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Load a user by email."""
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """Authenticate user with email and password."""
-    user = db.query(User).filter(User.email == email).first()
+    user = await get_user_by_email(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await check_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash is not None:
+        await store_rehashed_password(user.id, user.hashed_password, new_hash)
     return user
 
+class UserSnapshot:
+    """
+    Read-only copy of a User's columns, shared by all requests made with one
+    token. It is not attached to any session; load the user with
+    `db.get(User, current_user.id)` in a write session to modify it.
+    """
+
+    # Kept out so cached principals (and cache snapshots on disk) never hold password hashes
+    EXCLUDED = frozenset({"hashed_password"})
+
+    def __init__(self, user: User):
+        self.__dict__.update({
+            attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs if attr.key not in self.EXCLUDED
+        })
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"UserSnapshot is read-only; cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"UserSnapshot is read-only; cannot delete {name}")
+
+    def __repr__(self) -> str:
+        return f"<UserSnapshot id={self.id} email={self.email}>"
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -55,22 +147,77 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 def verify_token(token: str) -> Optional[TokenData]:
-    """Verify JWT token and extract user data."""
+    """
+    Verify JWT token and extract user data. Valid tokens are remembered until
+    they expire, keyed by their SHA-256 so the cache never holds a usable token.
+    """
+    if TOKEN_CACHE_SIZE > 0:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        token_data = token_cache.get(VERIFIED_TOKENS, key)
+        if token_data is not None and (token_data.expires_at is None or time.time() < token_data.expires_at):
+            token_cache.stats.record(VERIFIED_TOKENS, "hits")
+            return token_data
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
         if email is None:
             return None
-        token_data = TokenData(email=email)
-        return token_data
+        token_data = TokenData(email=email, expires_at=payload.get("exp"))
     except JWTError:
         return None
+    if TOKEN_CACHE_SIZE > 0:
+        ttl = None if token_data.expires_at is None else token_data.expires_at - time.time()
+        if ttl is None or ttl > 0:
+            token_cache.set(VERIFIED_TOKENS, key, token_data, ttl=ttl)
+    return token_data
+
+async def load_principal(db: AsyncSession, token_data: TokenData) -> Optional[UserSnapshot]:
+    """
+    The user a verified token belongs to, from the principal cache when possible.
 
-def get_current_user(
+    Entries are tagged with the user, so invalidate_user_cache(user_id, USER)
+    drops them. The tag needs the user id, which is only known after the
+    query, so a profile write racing with a miss can leave the older copy
+    cached; PRINCIPAL_CACHE_TTL bounds how long.
+    """
+    if PRINCIPAL_CACHE_TTL <= 0:
+        user = await get_user_by_email(db, token_data.email)
+        return UserSnapshot(user) if user else None
+    
+    key = (token_data.email, token_data.expires_at)
+    principal = response_cache.get(PRINCIPALS, key)
+    if principal is not None:
+        response_cache.stats.record(PRINCIPALS, "hits")
+        return principal
+    
+    async def compute() -> Optional[UserSnapshot]:
+        user = await get_user_by_email(db, token_data.email)
+        if user is None:
+            return None
+        principal = UserSnapshot(user)
+        ttl = PRINCIPAL_CACHE_TTL
+        if token_data.expires_at is not None:
+            # Never outlive the token itself
+            ttl = min(ttl, token_data.expires_at - time.time())
+        if ttl > 0:
+            response_cache.set(PRINCIPALS, key, principal, ttl=ttl, tags=(entity_tag(USER_ENTITY, user.id),))
+        return principal
+    
+    # Concurrent first requests with one token share a single lookup
+    started = time.perf_counter()
+    try:
+        return await single_flight.run(PRINCIPALS, key, compute)
+    finally:
+        response_cache.stats.record_miss(PRINCIPALS, time.perf_counter() - started)
+
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ) -> User:
-    """Get current authenticated user."""
+    """
+    Get current authenticated user as a read-only UserSnapshot, cached per token.
+    Load the user again in a write session before modifying it.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -85,7 +232,7 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
+    user = await load_principal(db, token_data)
     if user is None:
         raise credentials_exception
     
@@ -106,6 +253,16 @@ def require_verified_user(current_user: User = Depends(get_current_active_user))
         )
     return current_user
 
+def require_admin_user(current_user: User = Depends(get_current_active_user)) -> User:
+    """Require a verified user whose stored email is one of the configured ADMIN_EMAILS."""
+    # Compared as stored: registration lowercases emails, so a case variant cannot claim an admin address
+    if not current_user.is_verified or current_user.email not in ADMIN_EMAILS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required"
+        )
+    return current_user
+
 def create_refresh_token(data: dict) -> str:
     """Create refresh token with longer expiry."""
     to_encode = data.copy()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: request throughput under mixed load, sync vs async sessions.
+
+A few clients repeatedly call a slow reporting query while many others
+list savings goals. "before" runs both through the synchronous `get_db`
+session, so every slow query blocks the event loop and stalls the fast
+requests queued behind it. "after" runs them through `get_async_db`, where
+the query waits on the driver's own thread and the loop keeps serving.
+The response cache is bypassed and authentication is stubbed out so the
+numbers isolate the database path.
+"""
+
+import asyncio
+import statistics
+import time
+
+from common import register_user, setup_database
+
+setup_database()
+
+import httpx
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+import main
+from auth import get_current_user
+from database import SessionLocal, get_async_db, get_db
+from models import SavingsGoal, User
+from schemas import SavingsGoalResponse
+
+DURATION = 3.0  # seconds per run
+SLOW_CLIENTS = 2
+FAST_CLIENTS = 16
+GOALS = 20
+# A CPU-bound query of roughly 50 ms, standing in for a slow report or a lock wait
+SLOW_SQL = text(
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 400000) "
+    "SELECT COUNT(*) FROM n"
+)
+
+def seed_goals(user_id: int):
+    db = SessionLocal()
+    try:
+        for i in range(GOALS):
+            db.add(SavingsGoal(user_id=user_id, title=f"Goal {i}", target_amount=10000 + i, category="festival"))
+        db.commit()
+    finally:
+        db.close()
+
+def register_routes():
+    async def sync_goals(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        goals = db.query(SavingsGoal).filter(
+            SavingsGoal.user_id == current_user.id
+        ).order_by(SavingsGoal.created_at.desc()).limit(20).all()
+        return [SavingsGoalResponse.from_orm(goal) for goal in goals]
+
+    async def async_goals(current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(
+            select(SavingsGoal).where(
+                SavingsGoal.user_id == current_user.id
+            ).order_by(SavingsGoal.created_at.desc()).limit(20)
+        )
+        return [SavingsGoalResponse.from_orm(goal) for goal in result.scalars().all()]
+
+    async def sync_report(db: Session = Depends(get_db)):
+        return {"rows": db.execute(SLOW_SQL).scalar()}
+
+    async def async_report(db: AsyncSession = Depends(get_async_db)):
+        return {"rows": (await db.execute(SLOW_SQL)).scalar()}
+
+    main.app.get("/bench/sync/goals")(sync_goals)
+    main.app.get("/bench/async/goals")(async_goals)
+    main.app.get("/bench/sync/report")(sync_report)
+    main.app.get("/bench/async/report")(async_report)
+
+async def run_mixed_load(mode: str) -> dict:
+    latencies = {"fast": [], "slow": []}
+    deadline = time.perf_counter() + DURATION
+
+    async def client_loop(client, path: str, kind: str):
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies[kind].append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await asyncio.gather(
+            *(client_loop(client, f"/bench/{mode}/report", "slow") for _ in range(SLOW_CLIENTS)),
+            *(client_loop(client, f"/bench/{mode}/goals", "fast") for _ in range(FAST_CLIENTS))
+        )
+    fast = sorted(latencies["fast"])
+    return {
+        "fast_rps": len(fast) / DURATION,
+        "slow_rps": len(latencies["slow"]) / DURATION,
+        "p50_ms": statistics.median(fast) * 1000,
+        "p95_ms": fast[int(len(fast) * 0.95) - 1] * 1000
+    }
+
+def main_benchmark():
+    client = TestClient(main.app)
+    headers = register_user(client)
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    seed_goals(user_id)
+    register_routes()
+
+    db = SessionLocal()
+    user = db.query(User).filter(User.id == user_id).first()
+    db.close()
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+    print(f"📊 Mixed load for {DURATION:.0f}s: {SLOW_CLIENTS} clients on a slow query, "
+          f"{FAST_CLIENTS} clients listing goals")
+    results = {mode: asyncio.run(run_mixed_load(mode)) for mode in ("sync", "async")}
+    for label, mode in (("before (get_db)", "sync"), ("after (get_async_db)", "async")):
+        r = results[mode]
+        print(f"   {label:<22} goals: {r['fast_rps']:7.1f} req/s  p50 {r['p50_ms']:7.1f} ms  "
+              f"p95 {r['p95_ms']:7.1f} ms   slow query: {r['slow_rps']:5.1f} req/s")
+    print(f"   Goals throughput: {results['async']['fast_rps'] / results['sync']['fast_rps']:.1f}x")
+
+if __name__ == "__main__":
+    main_benchmark()
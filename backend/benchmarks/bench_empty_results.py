@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark: GET /savings/goals for users who have no goals yet.
+
+Before empty-result caching an empty list counted as a cache miss, so every
+request queried savings_goals. The "before" run reproduces that by dropping
+the namespace before each request.
+"""
+
+from common import count_queries, register_user, setup_database, timer
+
+setup_database()
+
+from fastapi.testclient import TestClient
+
+import main
+from cache import response_cache
+from database import async_engine
+
+REQUESTS = 500
+
+def run(client, headers, drop_cache: bool):
+    with count_queries(async_engine, "savings_goals") as queries, timer() as elapsed:
+        for _ in range(REQUESTS):
+            if drop_cache:
+                response_cache.clear("savings_goals")
+            response = client.get("/savings/goals", headers=headers)
+            assert response.json() == []
+    return queries["count"], elapsed["seconds"]
+
+def main_benchmark():
+    client = TestClient(main.app)
+    headers = register_user(client)
+
+    print(f"📊 GET /savings/goals x{REQUESTS} for a user with no goals")
+    for label, drop_cache in (("before (empty = miss)", True), ("after (empty cached)", False)):
+        queries, seconds = run(client, headers, drop_cache)
+        print(f"   {label:<24} savings_goals queries: {queries:>4}   "
+              f"mean latency: {seconds / REQUESTS * 1000:.3f} ms")
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark: latency of other endpoints during a storm of concurrent logins.
+
+A probe client calls /health and /users/me back to back while 50 users log
+in at once, each password checked with bcrypt at BCRYPT_ROUNDS. "before"
+verifies passwords inline on the event loop, as login used to, so every
+check stalls all other requests for its full duration. "after" runs the
+checks on the bcrypt thread pool and the event loop stays free. "idle" is
+the probe with no logins, for reference.
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+
+from common import register_user, setup_database
+
+setup_database()
+
+import httpx
+from fastapi.testclient import TestClient
+
+import auth
+import main
+from database import SessionLocal
+from models import User
+
+# Every storm login trips the slow-request warning; the probe numbers are what matter here
+logging.getLogger("main").setLevel(logging.ERROR)
+
+LOGINS = 50
+PASSWORD = "benchmark-password"
+PROBE_INTERVAL = 0.01
+IDLE_PROBES = 100
+
+async def inline_check_password(plain_password, hashed_password):
+    return auth.pwd_context.verify_and_update(plain_password, hashed_password)
+
+def seed_users():
+    # One hash for everyone; registering 50 users through bcrypt would only slow the setup
+    hashed_password = auth.get_password_hash(PASSWORD)
+    with SessionLocal() as db:
+        db.add_all(
+            User(email=f"storm{i}@fintwin.com", full_name="Storm", hashed_password=hashed_password)
+            for i in range(LOGINS)
+        )
+        db.commit()
+
+async def run_storm(probe_headers, logins: int) -> dict:
+    latencies = []
+    storm_done = asyncio.Event()
+
+    async def probe(client):
+        paths = ("/health", "/users/me")
+        while not storm_done.is_set() or len(latencies) < IDLE_PROBES and not logins:
+            start = time.perf_counter()
+            response = await client.get(paths[len(latencies) % 2], headers=probe_headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(PROBE_INTERVAL)
+
+    async def login(client, index: int):
+        response = await client.post("/auth/login", json={"email": f"storm{index}@fintwin.com", "password": PASSWORD})
+        response.raise_for_status()
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Open the pool's first connection alone; concurrent first connects can deadlock in SQLAlchemy
+        (await client.get("/users/me", headers=probe_headers)).raise_for_status()
+        started = time.perf_counter()
+        probe_task = asyncio.create_task(probe(client))
+        await asyncio.gather(*(login(client, index) for index in range(logins)))
+        elapsed = time.perf_counter() - started
+        storm_done.set()
+        await probe_task
+    latencies.sort()
+    return {
+        "seconds": elapsed,
+        "probes": len(latencies),
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000,
+        "max_ms": latencies[-1] * 1000
+    }
+
+def main_benchmark():
+    with TestClient(main.app) as client:
+        probe_headers = register_user(client, email="probe@fintwin.com")
+    seed_users()
+
+    print(f"📊 /health and /users/me latency during {LOGINS} concurrent logins "
+          f"(bcrypt rounds {auth.BCRYPT_ROUNDS}, {auth.PASSWORD_HASH_WORKERS} hash workers)")
+    check_password = auth.check_password
+    for label, logins, check in (
+        ("idle (no logins)", 0, check_password),
+        ("before (inline bcrypt)", LOGINS, inline_check_password),
+        ("after (bcrypt pool)", LOGINS, check_password)
+    ):
+        auth.check_password = check
+        r = asyncio.run(run_storm(probe_headers, logins))
+        storm = f"storm {r['seconds']:5.2f}s" if logins else " " * 12
+        print(f"   {label:<24} {storm}  {r['probes']:4d} probes  p50 {r['p50_ms']:7.2f} ms  "
+              f"p99 {r['p99_ms']:8.2f} ms  max {r['max_ms']:8.2f} ms")
+    auth.check_password = check_password
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Monte Carlo projection of a 30-year SIP.
+
+Runs `project_sip` for the moderate investment portfolio with 10,000
+paths of 360 months: drawing the returns, accumulating every path,
+and summarizing percentiles, goal probability and yearly bands. The
+"python loop" row simulates one path at a time with scalar math, month by
+month, the way the deterministic formula would be ported without NumPy;
+it is timed on a sample of paths and extrapolated.
+"""
+
+import math
+import random
+import statistics
+import time
+
+from common import setup_database
+
+setup_database()
+
+from ai_services import INVESTMENT_PORTFOLIOS
+from monte_carlo import monthly_log_return, portfolio_moments, project_sip
+
+PATHS = 10_000
+MONTHS = 360
+CONTRIBUTION = 5000
+GOAL = 15_000_000
+REPEATS = 20
+LOOP_SAMPLE = 200
+
+def path_by_path(annual_return: float, annual_volatility: float) -> list:
+    mu, sigma = monthly_log_return(annual_return, annual_volatility)
+    rng = random.Random(0)
+    finals = []
+    for _ in range(LOOP_SAMPLE):
+        corpus = 0.0
+        for _ in range(MONTHS):
+            corpus = (corpus + CONTRIBUTION) * math.exp(rng.gauss(mu, sigma))
+        finals.append(corpus)
+    return finals
+
+def main_benchmark():
+    portfolio = INVESTMENT_PORTFOLIOS['moderate']
+    annual_return, annual_volatility = portfolio_moments(portfolio)
+    print(f"📊 Monte Carlo SIP: {PATHS:,} paths x {MONTHS} months, median of {REPEATS} runs")
+
+    project_sip(portfolio, CONTRIBUTION, MONTHS, GOAL, paths=PATHS, seed=0)
+    samples = []
+    for seed in range(REPEATS):
+        start = time.perf_counter()
+        summary = project_sip(portfolio, CONTRIBUTION, MONTHS, GOAL, paths=PATHS, seed=seed)
+        samples.append(time.perf_counter() - start)
+    vectorized_ms = statistics.median(samples) * 1000
+
+    start = time.perf_counter()
+    path_by_path(annual_return, annual_volatility)
+    loop_ms = (time.perf_counter() - start) * 1000 * PATHS / LOOP_SAMPLE
+
+    percentiles = summary["corpus_percentiles"]
+    print(f"   portfolio return {annual_return:.2%}, volatility {annual_volatility:.2%}")
+    print(f"   corpus p10 {percentiles['p10']:,}  p50 {percentiles['p50']:,}  p90 {percentiles['p90']:,}  "
+          f"P(corpus >= {GOAL:,}) {summary['probability_of_reaching_goal']}%")
+    print(f"   python loop per path:    {loop_ms:8.1f} ms")
+    print(f"   vectorized project_sip:  {vectorized_ms:8.1f} ms   (p95 {sorted(samples)[int(REPEATS * 0.95) - 1] * 1000:.1f} ms)")
+
+if __name__ == "__main__":
+    main_benchmark()
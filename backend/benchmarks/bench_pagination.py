@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Benchmark: keyset vs OFFSET pagination on 1M-row tables.
+
+One user owns 1,000,000 savings goals, ten per second of created_at so
+the id tie-break is exercised, and one state holds 1,000,000 community
+circles. For pages deep into each list, "offset" runs the query
+the old endpoints would have needed (`ORDER BY ... LIMIT n OFFSET k`),
+which walks and discards every earlier row. "keyset" runs the endpoint's
+query for the same page, starting from the cursor of the previous page, so
+SQLite seeks straight to it through the sort index. Timings are the median
+of several runs of the same page.
+"""
+
+import sqlite3
+import statistics
+import time
+
+from common import setup_database
+
+DB_PATH = setup_database()
+
+from sqlalchemy import select
+
+from database import Base, SessionLocal, engine
+from main import CIRCLES_PAGE_SIZE, GOALS_PAGE_SIZE
+from models import CommunityCircle, SavingsGoal
+from pagination import encode_cursor, highest_id_first, newest_first
+
+ROWS = 1_000_000
+PAGES = (1, 10, 100, 1_000, 10_000, 33_333)
+REPEATS = 5
+STATE = "Kerala"
+
+def seed_database():
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+    # Bulk load through the driver without a journal; the ORM path would take minutes for 2M rows
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("INSERT INTO users (email, full_name, hashed_password) VALUES ('pager@fintwin.com', 'Pager', 'x')")
+        conn.executemany(
+            "INSERT INTO savings_goals (user_id, title, target_amount, current_amount, category, created_at) "
+            "VALUES (1, ?, 1000.0, 0.0, 'festival', datetime('2026-01-01', ? || ' seconds'))",
+            ((f"Goal {i}", i // 10) for i in range(ROWS))
+        )
+        conn.executemany(
+            "INSERT INTO community_circles (name, state, language, category, member_count, is_active) "
+            "VALUES (?, ?, 'ml', 'women', 0, 1)",
+            ((f"Circle {i}", STATE) for i in range(ROWS))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def median_ms(run) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        rows = run()
+        samples.append(time.perf_counter() - start)
+        assert rows
+    return statistics.median(samples) * 1000
+
+def bench_goals(db, page: int):
+    base = select(SavingsGoal).where(SavingsGoal.user_id == 1)
+    skipped = (page - 1) * GOALS_PAGE_SIZE
+    # Cursor of the previous page: the last row before this page
+    cursor = None
+    if skipped:
+        last = db.execute(
+            base.order_by(SavingsGoal.created_at.desc(), SavingsGoal.id.desc()).offset(skipped - 1).limit(1)
+        ).scalars().one()
+        cursor = encode_cursor(last.created_at, last.id)
+    offset_query = base.order_by(SavingsGoal.created_at.desc(), SavingsGoal.id.desc()).offset(skipped).limit(GOALS_PAGE_SIZE)
+    keyset_query = newest_first(base, SavingsGoal, cursor, GOALS_PAGE_SIZE)
+    return (
+        median_ms(lambda: db.execute(offset_query).scalars().all()),
+        median_ms(lambda: db.execute(keyset_query).scalars().all())
+    )
+
+def bench_circles(db, page: int):
+    base = select(CommunityCircle).where(CommunityCircle.state == STATE)
+    skipped = (page - 1) * CIRCLES_PAGE_SIZE
+    cursor = encode_cursor(ROWS - skipped + 1) if skipped else None
+    offset_query = base.order_by(CommunityCircle.id.desc()).offset(skipped).limit(CIRCLES_PAGE_SIZE)
+    keyset_query = highest_id_first(base, CommunityCircle, cursor, CIRCLES_PAGE_SIZE)
+    return (
+        median_ms(lambda: db.execute(offset_query).scalars().all()),
+        median_ms(lambda: db.execute(keyset_query).scalars().all())
+    )
+
+def main_benchmark():
+    started = time.perf_counter()
+    seed_database()
+    print(f"📊 Pagination on {ROWS:,} goals (one user) and {ROWS:,} circles (one state), "
+          f"seeded in {time.perf_counter() - started:.0f}s; median of {REPEATS} runs")
+    db = SessionLocal()
+    try:
+        for label, bench, page_size in (
+            ("savings goals", bench_goals, GOALS_PAGE_SIZE),
+            ("community circles", bench_circles, CIRCLES_PAGE_SIZE)
+        ):
+            print(f"   {label} ({page_size} per page)")
+            for page in PAGES:
+                if (page - 1) * page_size >= ROWS:
+                    continue
+                offset_ms, keyset_ms = bench(db, page)
+                print(f"      page {page:>6,}   offset: {offset_ms:8.2f} ms   keyset: {keyset_ms:6.2f} ms")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main_benchmark()
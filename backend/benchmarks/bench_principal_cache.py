@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: authenticated no-op requests with and without the principal cache.
+
+A route that only depends on `get_current_user` is called by concurrent
+clients, each with its own user and token. "before" sets
+PRINCIPAL_CACHE_TTL to 0, so every request decodes the token and then
+loads the user by email. "after" uses the cache, so repeat requests with
+the same token skip the query.
+"""
+
+import asyncio
+import statistics
+import time
+
+from common import count_queries, register_user, setup_database
+
+setup_database()
+
+import httpx
+from fastapi import Depends
+from fastapi.testclient import TestClient
+
+import auth
+import main
+from auth import get_current_user
+from database import async_read_engine
+from models import User
+
+USERS = 50
+CLIENTS = 8
+REQUESTS_PER_CLIENT = 400
+
+def register_route():
+    async def whoami(current_user: User = Depends(get_current_user)):
+        return {"id": current_user.id}
+
+    main.app.get("/bench/whoami")(whoami)
+
+async def run_load(tokens) -> dict:
+    latencies = []
+
+    async def client_loop(client, index: int):
+        for i in range(REQUESTS_PER_CLIENT):
+            headers = tokens[(index * REQUESTS_PER_CLIENT + i) % len(tokens)]
+            start = time.perf_counter()
+            response = await client.get("/bench/whoami", headers=headers)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Open the pool's first connection alone; concurrent first connects can deadlock in SQLAlchemy
+        (await client.get("/bench/whoami", headers=tokens[0])).raise_for_status()
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, index) for index in range(CLIENTS)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000
+    }
+
+def main_benchmark():
+    register_route()
+    with TestClient(main.app) as client:
+        tokens = [register_user(client, email=f"principal{i}@fintwin.com") for i in range(USERS)]
+
+    requests = CLIENTS * REQUESTS_PER_CLIENT
+    print(f"📊 {requests} authenticated no-op requests from {CLIENTS} clients over {USERS} users")
+    results = {}
+    for label, ttl in (("before (no cache)", 0), ("after (principal cache)", 300)):
+        auth.PRINCIPAL_CACHE_TTL = ttl
+        main.response_cache.clear()
+        with count_queries(async_read_engine, table="users") as queries:
+            results[label] = asyncio.run(run_load(tokens))
+        r = results[label]
+        print(f"   {label:<24} {r['rps']:7.0f} req/s  p50 {r['p50_ms']:6.2f} ms  p95 {r['p95_ms']:6.2f} ms  "
+              f"user queries: {queries['count']}")
+    before, after = results["before (no cache)"], results["after (principal cache)"]
+    print(f"   Throughput: {after['rps'] / before['rps']:.1f}x")
+
+if __name__ == "__main__":
+    main_benchmark()
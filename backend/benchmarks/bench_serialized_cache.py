@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cache hits on /schemes and /community/circles.
+
+"before" serves the same cached query through a route that stores the
+Pydantic response objects, so FastAPI re-validates and re-encodes them and
+GZipMiddleware recompresses the body on every hit. "after" is the real
+endpoint, which stores the final JSON and gzip bytes and sends them as is.
+Authentication is stubbed out so the numbers isolate the cache-hit path.
+"""
+
+import asyncio
+from typing import List
+
+from common import register_user, setup_database, timer
+
+setup_database()
+
+import httpx
+from fastapi.testclient import TestClient
+
+import main
+from auth import get_current_user
+from cache import cached
+from database import SessionLocal
+from models import CommunityCircle, GovernmentScheme, User
+from schemas import CommunityCircleResponse, GovernmentSchemeResponse
+
+REQUESTS = 2000
+STATE = "Kerala"
+
+def seed_catalog(admin_id: int):
+    db = SessionLocal()
+    try:
+        for i in range(50):
+            db.add(GovernmentScheme(
+                name=f"State Savings Scheme {i}",
+                description="Monthly deposit scheme with government co-contribution for low income households. " * 3,
+                scheme_type="savings",
+                eligibility_criteria={"age_min": 18, "income_max": 300000, "documents_required": ["Aadhaar", "PAN"]},
+                benefits=["Guaranteed interest", "Tax deduction under 80C", "Partial withdrawal after 5 years"],
+                application_process="Apply at the nearest post office or bank branch with KYC documents",
+                required_documents=["Aadhaar", "PAN", "Bank passbook"],
+                applicable_states=[STATE, "Tamil Nadu"],
+                official_website="https://www.india.gov.in/"
+            ))
+        for i in range(30):
+            db.add(CommunityCircle(
+                name=f"Kudumbashree Savings Circle {i}",
+                description="Women-led neighbourhood group pooling weekly savings and sharing budgeting tips. " * 2,
+                state=STATE,
+                language="ml",
+                category="women",
+                created_by=admin_id
+            ))
+        db.commit()
+    finally:
+        db.close()
+
+def register_before_routes():
+    """Old-style cached routes: same queries, Pydantic objects kept in the cache."""
+    main.app.get("/bench/schemes", response_model=List[GovernmentSchemeResponse])(
+        cached("bench_schemes", ttl=900, key=main.state_cache_key)(main.get_government_schemes.__wrapped__)
+    )
+    main.app.get("/bench/community/circles", response_model=List[CommunityCircleResponse])(
+        cached("bench_circles", ttl=600, key=main.state_cache_key)(main.get_community_circles.__wrapped__)
+    )
+
+async def measure(path: str, headers: dict) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path, params={"state": STATE}, headers=headers)  # fill the cache
+        with timer() as elapsed:
+            for _ in range(REQUESTS):
+                response = await client.get(path, params={"state": STATE}, headers=headers)
+        assert response.status_code == 200
+    return elapsed["seconds"] / REQUESTS * 1_000_000
+
+def main_benchmark():
+    client = TestClient(main.app)
+    headers = register_user(client, state=STATE)
+    headers["Accept-Encoding"] = "gzip"
+    user_id = client.get("/users/me", headers=headers).json()["id"]
+    seed_catalog(admin_id=user_id)
+    register_before_routes()
+
+    db = SessionLocal()
+    user = db.query(User).filter(User.id == user_id).first()
+    db.close()
+    main.app.dependency_overrides[get_current_user] = lambda: user
+
+    print(f"📊 Cache-hit latency over {REQUESTS} requests (Accept-Encoding: gzip)")
+    for name, before_path, after_path in (
+        ("/schemes", "/bench/schemes", "/schemes"),
+        ("/community/circles", "/bench/community/circles", "/community/circles"),
+    ):
+        before = asyncio.run(measure(before_path, headers))
+        after = asyncio.run(measure(after_path, headers))
+        print(f"   {name:<20} before: {before:8.1f} µs   after: {after:8.1f} µs   "
+              f"({before / after:.1f}x faster)")
+
+if __name__ == "__main__":
+    main_benchmark()
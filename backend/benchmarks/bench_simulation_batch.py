@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: 10,000 loan-affordability scenarios through POST /simulations/batch.
+
+Each scenario varies the loan amount, tenure, rate and the applicant's
+income. "one request each" calls /simulations/run per scenario (timed on a
+sample and extrapolated), paying auth, the profile query and a round trip
+every time. "batch endpoint" sends all of them in one request, end to end
+including JSON parsing, gzip and the test client's transport; "server
+side" is the part of that spent in the endpoint (simulations plus response
+encoding), also measured with one and with 100 items that cannot be computed
+(a zero tenure). "one kernel call each" runs the
+handler's computation per scenario in-process, and "vectorized kernel" runs it
+once over all of them.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+
+from common import register_user, setup_database
+
+setup_database()
+
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+import main
+from ai_services import handle_loan_affordability, run_financial_simulation_batch, simulation_context
+
+SCENARIOS = 10_000
+SINGLE_SAMPLE = 200
+REPEATS = 5
+
+class Applicant:
+    state = "Kerala"
+
+def build_items(rng: random.Random):
+    return [
+        {
+            "simulation_type": "loan_affordability",
+            "inputs": {
+                "loan_amount": rng.randrange(50_000, 5_000_000, 1000),
+                "loan_tenure": rng.choice([12, 24, 36, 60, 120, 240]),
+                "interest_rate": rng.choice([7.5, 8.5, 9.99, 12, 15, 18])
+            },
+            "user_profile": {"monthly_income": rng.randrange(15_000, 300_000, 500), "monthly_expenses": 12_000}
+        }
+        for _ in range(SCENARIOS)
+    ]
+
+def median_ms(run) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def main_benchmark():
+    items = build_items(random.Random(42))
+    inputs = [item["inputs"] for item in items]
+    contexts = [simulation_context(item["user_profile"], None, Applicant()) for item in items]
+
+    with TestClient(main.app) as client:
+        headers = register_user(client)
+
+        def run_singles():
+            for item in items[:SINGLE_SAMPLE]:
+                client.post("/simulations/run", json=item, headers=headers).raise_for_status()
+
+        def run_batch():
+            response = client.post("/simulations/batch", json={"items": items}, headers=headers)
+            response.raise_for_status()
+            assert response.json()["count"] == SCENARIOS
+
+        run_batch()  # warm up
+        singles_ms = median_ms(run_singles) * SCENARIOS / SINGLE_SAMPLE
+        batch_ms = median_ms(run_batch)
+
+    def run_scalar():
+        for user_inputs, context in zip(inputs, contexts):
+            handle_loan_affordability.batch([user_inputs], [context])
+
+    def run_server_side(items=items):
+        results = asyncio.run(run_financial_simulation_batch(items, {}, None, Applicant()))
+        JSONResponse(content={"success": True, "count": len(results), "results": [
+            {"simulation_type": item["simulation_type"], "result": result} for item, result in zip(items, results)
+        ]})
+
+    def with_bad_items(count):
+        bad = [dict(item) for item in items]
+        for index in range(0, SCENARIOS, SCENARIOS // count):
+            bad[index] = {**bad[index], "inputs": {**bad[index]["inputs"], "loan_tenure": 0}}
+        return bad
+
+    server_ms = median_ms(run_server_side)
+    one_bad_ms = median_ms(lambda: run_server_side(with_bad_items(1)))
+    many_bad_ms = median_ms(lambda: run_server_side(with_bad_items(100)))
+    kernel_ms = median_ms(lambda: handle_loan_affordability.batch(inputs, contexts))
+    scalar_ms = median_ms(run_scalar)
+
+    print(f"📊 {SCENARIOS:,} loan-affordability scenarios; median of {REPEATS} runs")
+    print(f"   one request each        {singles_ms:9.1f} ms  (extrapolated from {SINGLE_SAMPLE} requests)")
+    print(f"   one kernel call each    {scalar_ms:9.1f} ms")
+    print(f"   batch endpoint          {batch_ms:9.1f} ms  ({singles_ms / batch_ms:.0f}x faster than one request each)")
+    print(f"   batch, server side      {server_ms:9.1f} ms")
+    print(f"     with 1 bad item       {one_bad_ms:9.1f} ms")
+    print(f"     with 100 bad items    {many_bad_ms:9.1f} ms")
+    print(f"   vectorized kernel       {kernel_ms:9.1f} ms")
+
+if __name__ == "__main__":
+    main_benchmark()
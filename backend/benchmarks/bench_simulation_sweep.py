@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a 100 x 100 loan-affordability grid (tenure x interest rate).
+
+"one request per tick" calls /simulations/run for every cell, the way the
+slider UI did (timed on a sample and extrapolated). "batch endpoint"
+sends all 10,000 cells as one /simulations/batch request, getting a full
+result object per cell. "sweep endpoint" asks /simulations/sweep for the
+same grid and gets back one nested list per metric, computed as a single
+broadcast over the two axes. Response sizes are the JSON bodies before gzip.
+"""
+
+import itertools
+import statistics
+import time
+
+from common import register_user, setup_database
+
+setup_database()
+
+from fastapi.testclient import TestClient
+
+import main
+
+TENURES = list(range(6, 606, 6))
+RATES = [round(6 + 0.12 * i, 2) for i in range(100)]
+INPUTS = {"loan_amount": 1_500_000}
+PROFILE = {"monthly_income": 90_000, "monthly_expenses": 45_000}
+SINGLE_SAMPLE = 200
+REPEATS = 5
+
+def median_ms(run) -> float:
+    samples = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def main_benchmark():
+    cells = len(TENURES) * len(RATES)
+    items = [
+        {"simulation_type": "loan_affordability", "inputs": {**INPUTS, "loan_tenure": tenure, "interest_rate": rate}}
+        for tenure, rate in itertools.product(TENURES, RATES)
+    ]
+    sweep_body = {
+        "simulation_type": "loan_affordability", "inputs": INPUTS, "user_profile": PROFILE,
+        "axes": {"loan_tenure": TENURES, "interest_rate": RATES}
+    }
+    # Identity encoding so the sizes below are the raw JSON bodies
+    with TestClient(main.app, headers={"Accept-Encoding": "identity"}) as client:
+        headers = register_user(client)
+        sizes = {}
+
+        def run_singles():
+            for item in items[:SINGLE_SAMPLE]:
+                client.post("/simulations/run", json={**item, "user_profile": PROFILE}, headers=headers).raise_for_status()
+
+        def run_batch():
+            response = client.post("/simulations/batch", json={"items": items, "user_profile": PROFILE}, headers=headers)
+            response.raise_for_status()
+            sizes["batch"] = len(response.content)
+
+        def run_sweep():
+            response = client.post("/simulations/sweep", json=sweep_body, headers=headers)
+            response.raise_for_status()
+            sizes["sweep"] = len(response.content)
+
+        run_batch()
+        run_sweep()  # warm up
+        singles_ms = median_ms(run_singles) * cells / SINGLE_SAMPLE
+        batch_ms = median_ms(run_batch)
+        sweep_ms = median_ms(run_sweep)
+
+    print(f"📊 {len(TENURES)} tenures x {len(RATES)} rates = {cells:,} loan-affordability cells; median of {REPEATS} runs")
+    print(f"   one request per tick {singles_ms:9.1f} ms  (extrapolated from {SINGLE_SAMPLE} requests)")
+    print(f"   batch endpoint       {batch_ms:9.1f} ms  {sizes['batch'] / 1024:8.0f} KiB")
+    print(f"   sweep endpoint       {sweep_ms:9.1f} ms  {sizes['sweep'] / 1024:8.0f} KiB  "
+          f"({batch_ms / sweep_ms:.0f}x faster than the batch)")
+
+if __name__ == "__main__":
+    main_benchmark()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: read throughput of the SQLite development and production profiles.
+
+Each run lists the 20 newest savings goals of a random user from 1, 8 and
+32 concurrent clients while two writers each insert a goal every 10 ms: the
+async writer engine and a sync engine on a worker thread, as the endpoints
+still on get_db write. The development profile opens a connection per
+session on a rollback-journal database, so readers queue behind every
+commit. The production profile (SQLITE_PROFILE=production) keeps WAL mode,
+tuned pragmas, a pool of query-only reader connections and one async writer
+connection; the two writers take turns on SQLite's write lock. Each profile
+runs on its own copy of the same seeded database.
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import time
+
+from common import setup_database
+
+DB_PATH = setup_database()
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, apply_sqlite_pragmas, create_async_engines, engine
+from models import SavingsGoal, User
+
+USERS = 1000
+GOALS_PER_USER = 20
+CLIENTS = (1, 8, 32)
+DURATION = 3.0  # seconds per run
+WRITE_INTERVAL = 0.01
+
+def seed_database():
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": f"user{i}@fintwin.com", "full_name": f"User {i}", "hashed_password": "x"}
+            for i in range(USERS)
+        ])
+        conn.execute(insert(SavingsGoal), [
+            {"user_id": user_id, "title": f"Goal {g}", "target_amount": 1000.0 * (g + 1), "category": "festival"}
+            for user_id in range(1, USERS + 1) for g in range(GOALS_PER_USER)
+        ])
+    engine.dispose()
+
+async def run_profile(profile: str, path: str, clients: int) -> float:
+    writer, reader = create_async_engines(f"sqlite+aiosqlite:///{path}", sqlite_profile=profile)
+    write_sessions = async_sessionmaker(writer, expire_on_commit=False)
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 20})
+    if profile == "production":
+        apply_sqlite_pragmas(sync_engine)
+    sync_sessions = sessionmaker(sync_engine, expire_on_commit=False)
+    read_sessions = async_sessionmaker(reader, expire_on_commit=False)
+    reads = 0
+    deadline = time.perf_counter() + DURATION
+
+    async def read_loop():
+        nonlocal reads
+        while time.perf_counter() < deadline:
+            async with read_sessions() as db:
+                result = await db.execute(
+                    select(SavingsGoal).where(
+                        SavingsGoal.user_id == random.randint(1, USERS)
+                    ).order_by(SavingsGoal.created_at.desc()).limit(20)
+                )
+                assert len(result.scalars().all()) == GOALS_PER_USER
+            reads += 1
+
+    async def write_loop():
+        while time.perf_counter() < deadline:
+            async with write_sessions() as db:
+                db.add(SavingsGoal(user_id=USERS + 1, title="Bench write", target_amount=1.0))
+                await db.commit()
+            await asyncio.sleep(WRITE_INTERVAL)
+
+    def sync_write_loop():
+        while time.perf_counter() < deadline:
+            with sync_sessions() as db:
+                db.add(SavingsGoal(user_id=USERS + 1, title="Bench sync write", target_amount=1.0))
+                db.commit()
+            time.sleep(WRITE_INTERVAL)
+
+    await asyncio.gather(write_loop(), asyncio.to_thread(sync_write_loop), *(read_loop() for _ in range(clients)))
+    sync_engine.dispose()
+    await writer.dispose()
+    if reader is not writer:
+        await reader.dispose()
+    return reads / DURATION
+
+def main_benchmark():
+    seed_database()
+    print(f"📊 SQLite read throughput, {USERS * GOALS_PER_USER} goals, two writers every "
+          f"{WRITE_INTERVAL * 1000:.0f} ms, {DURATION:.0f}s per run")
+    for clients in CLIENTS:
+        results = {}
+        for profile in ("development", "production"):
+            path = f"{DB_PATH}.{profile}.{clients}"
+            shutil.copyfile(DB_PATH, path)
+            results[profile] = asyncio.run(run_profile(profile, path, clients))
+        print(f"   {clients:>2} clients   development: {results['development']:7.0f} reads/s   "
+              f"production: {results['production']:7.0f} reads/s   "
+              f"({results['production'] / results['development']:.1f}x)")
+
+if __name__ == "__main__":
+    main_benchmark()
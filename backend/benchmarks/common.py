@@ -0,0 +1,63 @@
+"""
+Shared setup for the API benchmarks: a throwaway SQLite database, an
+in-process test client and SQL statement counting.
+
+Call setup_database() before importing `main`, since the engine is created
+from DATABASE_URL at import time.
+"""
+
+import logging
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# The test client logs every request at INFO, which drowns the results
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+def setup_database() -> str:
+    """Point DATABASE_URL at a fresh temporary SQLite file and return its path."""
+    path = os.path.join(tempfile.mkdtemp(prefix="fintwin_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+def register_user(client, email: str = "bench@fintwin.com", **fields) -> dict:
+    """Register a user through the API and return its Authorization headers."""
+    payload = {"email": email, "full_name": "Bench User", "password": "benchmark-password"}
+    payload.update(fields)
+    response = client.post("/auth/register", json=payload)
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@contextmanager
+def count_queries(engine, table: str = None):
+    """Count SQL statements run on `engine` (sync or async), optionally only those mentioning `table`."""
+    from sqlalchemy import event
+
+    engine = getattr(engine, "sync_engine", engine)
+    counter = {"count": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if table is None or table in statement:
+            counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+@contextmanager
+def timer():
+    """Measure wall-clock seconds; read `elapsed["seconds"]` after the block."""
+    elapsed = {"seconds": 0.0}
+    start = time.perf_counter()
+    try:
+        yield elapsed
+    finally:
+        elapsed["seconds"] = time.perf_counter() - start
@@ -0,0 +1,1027 @@
+import asyncio
+import functools
+import gzip
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from fastapi import BackgroundTasks, Request, Response
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB
+CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", "300"))  # 5 minutes
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")  # memory, sqlite
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", "./fintwin_cache.db")
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "")  # empty disables warm-restart snapshots
+SINGLE_FLIGHT_TIMEOUT = float(os.getenv("CACHE_SINGLE_FLIGHT_TIMEOUT", "30"))  # seconds
+GZIP_MINIMUM_SIZE = 1000  # same threshold as the GZipMiddleware in main.py
+
+_MISSING = object()
+
+class CacheEntry(NamedTuple):
+    value: Any
+    expires_at: float  # hard expiry, the entry is gone after this
+    size: int
+    tags: Tuple[str, ...] = ()
+    stale_at: float = float("inf")  # soft expiry, served stale and refreshed after this
+
+class TTLOverride(NamedTuple):
+    value: Any
+    ttl: float
+
+def with_ttl(value: Any, ttl: float) -> TTLOverride:
+    """Wrap an endpoint return value so @cached stores it with a custom TTL."""
+    return TTLOverride(value, ttl)
+
+class HeadersOverride(NamedTuple):
+    value: Any
+    headers: Dict[str, str]
+
+def with_headers(value: Any, headers: Dict[str, str]) -> HeadersOverride:
+    """Wrap an endpoint return value so a serialized @cached entry is sent with extra headers."""
+    return HeadersOverride(value, headers)
+
+class SerializedPayload(NamedTuple):
+    """An endpoint result stored as its final JSON body, pre-compressed when large enough."""
+    body: bytes
+    gzip_body: Optional[bytes]
+    etag: str
+    headers: Tuple[Tuple[str, str], ...] = ()
+
+def serialize_payload(value: Any, headers: Optional[Dict[str, str]] = None) -> SerializedPayload:
+    """
+    Encode a result exactly as FastAPI's JSONResponse would. The ETag is derived
+    from the body and headers, so it is identical across workers and restarts
+    for the same content; it is weak because the body may be sent gzip-encoded.
+    """
+    body = json.dumps(
+        jsonable_encoder(value), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+    header_items = tuple(sorted((headers or {}).items()))
+    digest = hashlib.sha1(body)
+    if header_items:
+        digest.update(repr(header_items).encode("utf-8"))
+    gzip_body = gzip.compress(body, compresslevel=9, mtime=0) if len(body) >= GZIP_MINIMUM_SIZE else None
+    return SerializedPayload(body, gzip_body, f'W/"{digest.hexdigest()[:20]}"', header_items)
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+def is_empty_result(value: Any) -> bool:
+    """True for results that mean "nothing found": None or an empty list/dict."""
+    return value is None or (isinstance(value, (list, tuple, dict)) and not value)
+
+def entity_tag(entity: str, user_id: Any) -> str:
+    """Tag for cache entries that depend on one user's rows of an entity, e.g. `goals:42`."""
+    return f"{entity}:{user_id}"
+
+def estimate_size(value: Any, _seen: Optional[set] = None) -> int:
+    """Approximate the memory footprint of a cached value in bytes."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _seen) + estimate_size(v, _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _seen)
+    elif hasattr(value, "__dict__"):
+        # Pydantic models and other plain objects
+        size += estimate_size(vars(value), _seen)
+    return size
+
+class CacheStats:
+    """
+    Per-namespace counters of one worker's cache traffic, used to size TTLs and
+    memory budgets. Counts are per process even when the store is shared.
+    """
+
+    COUNTERS = ("hits", "stale_hits", "misses", "miss_seconds", "max_miss_seconds", "evictions", "invalidations")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._namespaces: Dict[str, Dict[str, float]] = {}
+        self.since = time.time()
+
+    def record(self, namespace: str, event: str, count: int = 1) -> None:
+        with self._lock:
+            counters = self._namespaces.setdefault(namespace, dict.fromkeys(self.COUNTERS, 0))
+            counters[event] += count
+
+    def record_miss(self, namespace: str, seconds: float) -> None:
+        """Count a miss and the time the caller spent waiting for the value."""
+        with self._lock:
+            counters = self._namespaces.setdefault(namespace, dict.fromkeys(self.COUNTERS, 0))
+            counters["misses"] += 1
+            counters["miss_seconds"] += seconds
+            counters["max_miss_seconds"] = max(counters["max_miss_seconds"], seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._namespaces.clear()
+            self.since = time.time()
+
+    def report(self, usage: Dict[str, Tuple[int, int]]) -> Dict[str, Dict[str, Any]]:
+        """Merge the counters with `usage`, a `{namespace: (entries, bytes)}` map from the store."""
+        with self._lock:
+            namespaces = {namespace: dict(counters) for namespace, counters in self._namespaces.items()}
+        report = {}
+        for namespace in sorted(set(namespaces) | set(usage)):
+            counters = namespaces.get(namespace, dict.fromkeys(self.COUNTERS, 0))
+            entries, size = usage.get(namespace, (0, 0))
+            hits = counters["hits"] + counters["stale_hits"]
+            lookups = hits + counters["misses"]
+            report[namespace] = {
+                "hits": counters["hits"],
+                "stale_hits": counters["stale_hits"],
+                "misses": counters["misses"],
+                "hit_ratio": round(hits / lookups, 4) if lookups else None,
+                "avg_miss_ms": round(counters["miss_seconds"] * 1000 / counters["misses"], 3) if counters["misses"] else None,
+                "max_miss_ms": round(counters["max_miss_seconds"] * 1000, 3),
+                "evictions": counters["evictions"],
+                "invalidations": counters["invalidations"],
+                "entries": entries,
+                "approx_bytes": size
+            }
+        return report
+
+class CacheBackend:
+    """
+    Interface shared by the cache stores.
+
+    Namespace TTL bookkeeping and traffic stats live here; subclasses implement storage.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._namespace_ttls: Dict[str, float] = {}
+        self.stats = CacheStats()
+
+    def register_namespace(self, namespace: str, ttl: float) -> None:
+        """Set the default TTL (seconds) for a namespace."""
+        self._namespace_ttls[namespace] = ttl
+
+    def ttl_for(self, namespace: str) -> float:
+        return self._namespace_ttls.get(namespace, self.default_ttl)
+
+    def tag_versions(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """Version stamps for `tags`, taken before computing a value to store under them."""
+        return None
+
+    def lookup(self, namespace: str, key: Hashable) -> Tuple[Any, bool]:
+        """Return `(value, is_stale)`; value is `_MISSING` when absent or past its hard expiry."""
+        raise NotImplementedError
+
+    def get(self, namespace: str, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` when absent, expired or stale."""
+        value, is_stale = self.lookup(namespace, key)
+        if value is _MISSING or is_stale:
+            return default
+        return value
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        versions: Optional[Dict[str, int]] = None,
+        stale_ttl: float = 0
+    ) -> None:
+        """
+        Store a value that is fresh for `ttl` seconds and may then be served
+        stale, while it is refreshed, for another `stale_ttl` seconds.
+        """
+        raise NotImplementedError
+
+    def delete(self, namespace: str, key: Hashable) -> bool:
+        raise NotImplementedError
+
+    def invalidate_tags(self, *tags: str) -> int:
+        raise NotImplementedError
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    @property
+    def size_bytes(self) -> int:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def namespace_usage(self) -> Dict[str, Tuple[int, int]]:
+        """Live `(entries, approximate bytes)` per namespace."""
+        raise NotImplementedError
+
+    def report(self) -> Dict[str, Any]:
+        """Totals, limits and per-namespace stats for the admin endpoint."""
+        return {
+            "backend": type(self).__name__,
+            "stats_since": datetime.fromtimestamp(self.stats.since, timezone.utc).isoformat(),
+            "entries": len(self),
+            "max_entries": self.max_entries,
+            "approx_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "namespaces": self.stats.report(self.namespace_usage())
+        }
+
+    def save_snapshot(self, path: str) -> int:
+        """Write live entries to `path` for a warm restart. Returns the number written."""
+        return 0
+
+    def load_snapshot(self, path: str) -> int:
+        """Restore entries written by `save_snapshot`. Returns the number restored."""
+        return 0
+
+    def __contains__(self, item: Tuple[str, Hashable]) -> bool:
+        return self.get(*item, default=_MISSING) is not _MISSING
+
+class ResponseCache(CacheBackend):
+    """
+    Bounded in-process cache with per-namespace TTLs.
+
+    Entries live in a single LRU ordering shared by all namespaces, so the
+    total entry count and approximate byte size never exceed the configured
+    limits no matter how many distinct keys are written.
+
+    Each invalidation stamps its tags with a new generation. A value computed
+    from versions taken before that is dropped by `set`, so a read racing a
+    write cannot store its stale result after the write's invalidation. Only
+    the `max_entries` most recently invalidated tags keep their own stamp;
+    older ones read as the newest stamp forgotten, which can only turn a
+    racing `set` into a miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        default_ttl: float = CACHE_DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        super().__init__(max_entries, max_bytes, default_ttl)
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[str, Hashable], CacheEntry]" = OrderedDict()
+        self._tag_index: Dict[str, Set[Tuple[str, Hashable]]] = {}
+        self._generation = 0
+        self._tag_generations: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten_generation = 0
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            return {tag: self._tag_generations.get(tag, self._forgotten_generation) for tag in tags}
+
+    def lookup(self, namespace: str, key: Hashable) -> Tuple[Any, bool]:
+        cache_key = (namespace, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                return _MISSING, False
+            now = self._clock()
+            if entry.expires_at <= now:
+                self._remove(cache_key)
+                return _MISSING, False
+            self._entries.move_to_end(cache_key)
+            return entry.value, entry.stale_at <= now
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        versions: Optional[Dict[str, int]] = None,
+        stale_ttl: float = 0
+    ) -> None:
+        """Store a value, evicting least recently used entries to stay within limits."""
+        if ttl is None:
+            ttl = self.ttl_for(namespace)
+        size = estimate_size(value)
+        cache_key = (namespace, key)
+        tags = tuple(tags)
+        with self._lock:
+            if versions is not None and self.tag_versions(versions) != versions:
+                logger.debug(f"Value for {namespace}:{key} was computed before an invalidation, not cached")
+                return
+            if cache_key in self._entries:
+                self._remove(cache_key)
+            if size > self.max_bytes:
+                logger.warning(f"Value for {namespace}:{key} exceeds cache budget ({size} bytes), not cached")
+                return
+            stale_at = self._clock() + ttl
+            self._entries[cache_key] = CacheEntry(value, stale_at + stale_ttl, size, tags, stale_at)
+            self._bytes += size
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(cache_key)
+            self._evict()
+
+    def delete(self, namespace: str, key: Hashable) -> bool:
+        with self._lock:
+            return self._remove((namespace, key))
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """Drop every entry carrying any of the given tags. Returns the number removed."""
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                self._tag_generations[tag] = self._generation
+                self._tag_generations.move_to_end(tag)
+            while len(self._tag_generations) > self.max_entries:
+                _, self._forgotten_generation = self._tag_generations.popitem(last=False)
+            for tag in tags:
+                for cache_key in list(self._tag_index.get(tag, ())):
+                    if self._remove(cache_key):
+                        self.stats.record(cache_key[0], "invalidations")
+                        removed += 1
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for tags {tags}")
+        return removed
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry, or only the entries of one namespace."""
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._tag_index.clear()
+                self._bytes = 0
+                return
+            for cache_key in [k for k in self._entries if k[0] == namespace]:
+                self._remove(cache_key)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def namespace_usage(self) -> Dict[str, Tuple[int, int]]:
+        usage: Dict[str, Tuple[int, int]] = {}
+        with self._lock:
+            for (namespace, _), entry in self._entries.items():
+                entries, size = usage.get(namespace, (0, 0))
+                usage[namespace] = (entries + 1, size + entry.size)
+        return usage
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        Pickle live entries with their remaining lifetimes, least recently used
+        first so a restore keeps the LRU order. Values that cannot be pickled
+        are skipped. The file is replaced atomically.
+        """
+        with self._lock:
+            now = self._clock()
+            entries = [
+                (cache_key, entry) for cache_key, entry in self._entries.items() if entry.expires_at > now
+            ]
+        records = []
+        for (namespace, key), entry in entries:
+            try:
+                records.append(pickle.dumps((
+                    namespace, key, entry.value, entry.tags,
+                    entry.stale_at - now, entry.expires_at - now
+                )))
+            except Exception as e:
+                logger.debug(f"Skipping unpicklable cache entry {namespace}: {key}: {str(e)}")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            pickle.dump({"saved_at": time.time(), "records": records}, f)
+        os.replace(temp_path, path)
+        return len(records)
+
+    def load_snapshot(self, path: str) -> int:
+        """
+        Restore a snapshot, charging the time since it was saved against each
+        entry's lifetime. Only load snapshots written by this application.
+        """
+        if not os.path.exists(path):
+            return 0
+        with open(path, "rb") as f:
+            snapshot = pickle.load(f)
+        elapsed = max(0.0, time.time() - snapshot["saved_at"])
+        restored = 0
+        for record in snapshot["records"]:
+            namespace, key, value, tags, fresh_for, expires_in = pickle.loads(record)
+            expires_in -= elapsed
+            if expires_in <= 0:
+                continue
+            fresh_for = min(max(0.0, fresh_for - elapsed), expires_in)
+            self.set(namespace, key, value, ttl=fresh_for, tags=tags, stale_ttl=expires_in - fresh_for)
+            restored += 1
+        return restored
+
+    def _remove(self, cache_key: Tuple[str, Hashable]) -> bool:
+        entry = self._entries.pop(cache_key, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        self._untag(cache_key, entry.tags)
+        return True
+
+    def _untag(self, cache_key: Tuple[str, Hashable], tags: Tuple[str, ...]) -> None:
+        for tag in tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(cache_key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _evict(self) -> None:
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            cache_key, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._untag(cache_key, entry.tags)
+            self.stats.record(cache_key[0], "evictions")
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache shared by every worker process on the host, stored in a local SQLite file.
+
+    Each tag has a version stamp in the `tag_versions` table. An entry records
+    the versions of its tags as they were before its value was computed, and a
+    read only returns it while those versions are still current, so an
+    invalidation committed by one worker is seen by all others on their next
+    read, including for values that were being computed during the write.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_SQLITE_PATH,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_bytes: int = CACHE_MAX_BYTES,
+        default_ttl: float = CACHE_DEFAULT_TTL,
+        clock: Callable[[], float] = time.time
+    ):
+        super().__init__(max_entries, max_bytes, default_ttl)
+        self.path = path
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                stale_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                tag_versions TEXT NOT NULL,
+                PRIMARY KEY (namespace, key)
+            );
+            CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed_at ON cache_entries (accessed_at);
+            CREATE TABLE IF NOT EXISTS cache_entry_tags (
+                tag TEXT NOT NULL,
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, namespace, key)
+            );
+            CREATE TABLE IF NOT EXISTS cache_tag_versions (
+                tag TEXT PRIMARY KEY,
+                version INTEGER NOT NULL
+            );
+        """)
+
+    @staticmethod
+    def _encode_key(key: Hashable) -> str:
+        return repr(key)
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        tags = list(tags)
+        if not tags:
+            return {}
+        placeholders = ",".join("?" * len(tags))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT tag, version FROM cache_tag_versions WHERE tag IN ({placeholders})", tags
+            ).fetchall()
+        versions = dict.fromkeys(tags, 0)
+        versions.update(rows)
+        return versions
+
+    def lookup(self, namespace: str, key: Hashable) -> Tuple[Any, bool]:
+        encoded_key = self._encode_key(key)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, stale_at, accessed_at, tag_versions FROM cache_entries "
+                "WHERE namespace = ? AND key = ?",
+                (namespace, encoded_key)
+            ).fetchone()
+            if row is None:
+                return _MISSING, False
+            value, expires_at, stale_at, accessed_at, stamped = row
+            stamped = json.loads(stamped)
+            if expires_at <= now or (stamped and self.tag_versions(stamped) != stamped):
+                self._delete_keys([(namespace, encoded_key)])
+                return _MISSING, False
+            # Refresh the LRU timestamp at most once a second to keep reads mostly read-only
+            if now - accessed_at > 1.0:
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, namespace, encoded_key)
+                )
+        return pickle.loads(value), stale_at <= now
+
+    def set(
+        self,
+        namespace: str,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        versions: Optional[Dict[str, int]] = None,
+        stale_ttl: float = 0
+    ) -> None:
+        if ttl is None:
+            ttl = self.ttl_for(namespace)
+        tags = tuple(tags)
+        if versions is None:
+            versions = self.tag_versions(tags)
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            logger.warning(f"Value for {namespace}:{key} exceeds cache budget ({len(payload)} bytes), not cached")
+            return
+        encoded_key = self._encode_key(key)
+        now = self._clock()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._delete_keys([(namespace, encoded_key)])
+            self._conn.execute(
+                "INSERT INTO cache_entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    namespace, encoded_key, payload, len(payload),
+                    now + ttl + stale_ttl, now + ttl, now, json.dumps(versions)
+                )
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO cache_entry_tags VALUES (?, ?, ?)",
+                [(tag, namespace, encoded_key) for tag in tags]
+            )
+            self._evict(now)
+
+    def delete(self, namespace: str, key: Hashable) -> bool:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            return self._delete_keys([(namespace, self._encode_key(key))]) > 0
+
+    def invalidate_tags(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        placeholders = ",".join("?" * len(tags))
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT INTO cache_tag_versions VALUES (?, 1) "
+                "ON CONFLICT(tag) DO UPDATE SET version = version + 1",
+                [(tag,) for tag in tags]
+            )
+            keys = self._conn.execute(
+                f"SELECT DISTINCT namespace, key FROM cache_entry_tags WHERE tag IN ({placeholders})", tags
+            ).fetchall()
+            removed = self._delete_keys(keys)
+        for namespace, _ in keys:
+            self.stats.record(namespace, "invalidations")
+        if removed:
+            logger.debug(f"Invalidated {removed} cache entries for tags {tags}")
+        return removed
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if namespace is None:
+                self._conn.execute("DELETE FROM cache_entries")
+                self._conn.execute("DELETE FROM cache_entry_tags")
+            else:
+                self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+                self._conn.execute("DELETE FROM cache_entry_tags WHERE namespace = ?", (namespace,))
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._totals()[1]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._totals()[0]
+
+    def namespace_usage(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT namespace, COUNT(*), SUM(size) FROM cache_entries GROUP BY namespace"
+            ).fetchall()
+        return {namespace: (entries, size) for namespace, entries, size in rows}
+
+    def _delete_keys(self, keys: List[Tuple[str, str]]) -> int:
+        removed = 0
+        for namespace, encoded_key in keys:
+            removed += self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, encoded_key)
+            ).rowcount
+            self._conn.execute(
+                "DELETE FROM cache_entry_tags WHERE namespace = ? AND key = ?", (namespace, encoded_key)
+            )
+        return removed
+
+    def _totals(self) -> Tuple[int, int]:
+        return self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries").fetchone()
+
+    def _evict(self, now: float) -> None:
+        count, total = self._totals()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        count, total = self._totals()
+        victims = []
+        for namespace, encoded_key, size in self._conn.execute(
+            "SELECT namespace, key, size FROM cache_entries ORDER BY accessed_at"
+        ):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((namespace, encoded_key))
+            count -= 1
+            total -= size
+        self._delete_keys(victims)
+        for namespace, _ in victims:
+            self.stats.record(namespace, "evictions")
+        self._conn.execute(
+            "DELETE FROM cache_entry_tags WHERE NOT EXISTS (SELECT 1 FROM cache_entries e "
+            "WHERE e.namespace = cache_entry_tags.namespace AND e.key = cache_entry_tags.key)"
+        )
+
+def create_cache_backend(backend: str = CACHE_BACKEND) -> CacheBackend:
+    """Build the cache store selected by CACHE_BACKEND."""
+    if backend == "sqlite":
+        return SQLiteCacheBackend()
+    if backend != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND '{backend}', using in-process cache")
+    return ResponseCache()
+
+class RecentWrites:
+    """
+    Users who wrote within the last `ttl` seconds, for read-your-writes routing.
+
+    Unlike cache entries these are never evicted to make room: a marker only
+    goes away when it expires, so a user's reads cannot fall back to a lagging
+    replica early because the response cache is under pressure.
+    """
+
+    def __init__(self, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._expires_at: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: Hashable) -> None:
+        now = self._clock()
+        with self._lock:
+            # Drop expired markers as new ones come in, so the store holds at most `ttl` seconds of writers
+            for expired in [user for user, expires_at in self._expires_at.items() if expires_at <= now]:
+                del self._expires_at[expired]
+            self._expires_at[user_id] = now + self.ttl
+
+    def __contains__(self, user_id: Hashable) -> bool:
+        with self._lock:
+            return self._expires_at.get(user_id, 0) > self._clock()
+
+class SQLiteRecentWrites(RecentWrites):
+    """RecentWrites shared by every worker, in its own table of the SQLite cache file."""
+
+    def __init__(self, ttl: float, path: str = CACHE_SQLITE_PATH, clock: Callable[[], float] = time.time):
+        super().__init__(ttl, clock)
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS recent_writes (user_id TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+        )
+
+    def mark(self, user_id: Hashable) -> None:
+        now = self._clock()
+        with self._lock:
+            self._conn.execute("DELETE FROM recent_writes WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recent_writes (user_id, expires_at) VALUES (?, ?)",
+                (repr(user_id), now + self.ttl)
+            )
+
+    def __contains__(self, user_id: Hashable) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM recent_writes WHERE user_id = ? AND expires_at > ?", (repr(user_id), self._clock())
+            ).fetchone()
+        return row is not None
+
+def create_recent_writes(ttl: float, backend: str = CACHE_BACKEND) -> RecentWrites:
+    """Recent-writer store next to the cache selected by CACHE_BACKEND, so workers sharing one share both."""
+    if backend == "sqlite":
+        return SQLiteRecentWrites(ttl)
+    return RecentWrites(ttl)
+
+class SingleFlight:
+    """
+    Coalesces concurrent computations of the same key within one worker.
+
+    The first caller for a key runs the computation; callers arriving while it
+    is in flight wait for and share its result or exception. A waiter that is
+    still waiting after `timeout` seconds stops waiting and computes on its own.
+    """
+
+    def __init__(self, timeout: float = SINGLE_FLIGHT_TIMEOUT):
+        self.timeout = timeout
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    async def run(self, namespace: str, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        flight_key = (namespace, key)
+        future = self._inflight.get(flight_key)
+        if future is not None:
+            self._count(namespace, "suppressed")
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+            except asyncio.TimeoutError:
+                self._count(namespace, "timeouts")
+                logger.warning(f"Timed out after {self.timeout}s waiting for {namespace}: {key}, computing directly")
+            except asyncio.CancelledError:
+                # Only recover when the leader was cancelled, not this waiter
+                if not future.cancelled():
+                    raise
+            return await compute()
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved so a failure with no waiters is not reported as unhandled
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[flight_key] = future
+        self._count(namespace, "leaders")
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._count(namespace, "errors")
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[flight_key]
+
+    def in_flight(self, namespace: str, key: Hashable) -> bool:
+        return (namespace, key) in self._inflight
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-namespace counts of computations run (leaders) and suppressed duplicates."""
+        return {namespace: dict(counts) for namespace, counts in self._stats.items()}
+
+    def _count(self, namespace: str, event: str) -> None:
+        counts = self._stats.setdefault(namespace, {"leaders": 0, "suppressed": 0, "timeouts": 0, "errors": 0})
+        counts[event] += 1
+
+# Strong references to refresh tasks started outside a request's BackgroundTasks,
+# so they are not garbage collected before they finish
+_refresh_tasks: Set[asyncio.Task] = set()
+
+def schedule_refresh(refresh: Callable[[], Awaitable[Any]], background_tasks: Optional[BackgroundTasks] = None) -> None:
+    """Run `refresh` after the current response, or as a detached task when no BackgroundTasks is available."""
+    if background_tasks is not None:
+        background_tasks.add_task(refresh)
+        return
+    task = asyncio.get_running_loop().create_task(refresh())
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+
+def serialized_response(
+    payload: SerializedPayload,
+    request: Optional[Request],
+    cache_control: Optional[str],
+    vary: Optional[str]
+) -> Response:
+    """Answer 304 when the client's ETag matches, otherwise send the stored (gzip) body as is."""
+    headers = {**dict(payload.headers), "ETag": payload.etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    vary_values = [vary] if vary else []
+    if payload.gzip_body is not None:
+        vary_values.append("Accept-Encoding")
+    if vary_values:
+        headers["Vary"] = ", ".join(vary_values)
+
+    if request is None:
+        return Response(payload.body, media_type="application/json", headers=headers)
+    if etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    if payload.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+        # GZipMiddleware passes responses that already carry Content-Encoding through untouched
+        headers["Content-Encoding"] = "gzip"
+        return Response(payload.gzip_body, media_type="application/json", headers=headers)
+    return Response(payload.body, media_type="application/json", headers=headers)
+
+class CacheWarmup:
+    """
+    Runs cache-filling jobs once at startup and tracks progress for the
+    readiness endpoint. A failing job is logged and counted but does not stop
+    the others; its entry is simply computed on the first request instead.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.finished_at is not None
+
+    async def run(self, jobs: Iterable[Tuple[str, Callable[[], Awaitable[Any]]]]) -> None:
+        jobs = list(jobs)
+        self.total, self.completed, self.failed = len(jobs), 0, 0
+        self.started_at, self.finished_at = time.time(), None
+        for name, job in jobs:
+            try:
+                await job()
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"Cache warm-up job {name} failed: {str(e)}")
+            self.completed += 1
+        self.finished_at = time.time()
+        logger.info(
+            f"Cache warm-up finished: {self.completed - self.failed}/{self.total} jobs "
+            f"in {self.finished_at - self.started_at:.2f}s"
+        )
+
+    def status(self) -> Dict[str, Any]:
+        if self.ready:
+            state = "ready"
+        elif self.started_at is not None:
+            state = "warming"
+        else:
+            state = "pending"
+        end = self.finished_at or time.time()
+        return {
+            "status": state,
+            "completed": self.completed,
+            "failed": self.failed,
+            "total": self.total,
+            "elapsed_seconds": round(end - self.started_at, 3) if self.started_at else 0.0
+        }
+
+# Global instances
+response_cache = create_cache_backend()
+single_flight = SingleFlight()
+cache_warmup = CacheWarmup()
+
+def cached(
+    namespace: str,
+    ttl: Optional[float] = None,
+    key: Optional[Callable[..., Hashable]] = None,
+    tags: Optional[Callable[..., Iterable[str]]] = None,
+    stale_ttl: float = 0,
+    empty_ttl: Optional[float] = None,
+    serialize: bool = False,
+    cache_control: Optional[str] = None,
+    vary: Optional[str] = None,
+    cache: Optional[CacheBackend] = None,
+    flight: Optional[SingleFlight] = None
+):
+    """
+    Cache the result of an async endpoint.
+
+    `key` receives the endpoint's keyword arguments and returns the part of the
+    cache key that varies per call (e.g. the user id or a state filter). `tags`
+    receives the same arguments and returns the tags the entry depends on, so
+    writes can drop it with `invalidate_tags`. An endpoint may return
+    `with_ttl(value, seconds)` to override the TTL for that one result, e.g. to
+    keep fallback responses short-lived. With `serialize`, it may also return
+    `with_headers(value, headers)` to store response headers, such as a
+    pagination cursor, alongside the body.
+
+    Concurrent misses for the same key are coalesced through `single_flight`,
+    so an expensive computation runs once per key and worker.
+
+    With `stale_ttl`, an entry older than `ttl` is still returned immediately
+    for another `stale_ttl` seconds while a refresh runs in the background. The
+    refresh is added to the endpoint's `BackgroundTasks` parameter when it has
+    one, so it runs with the request's dependencies still open.
+
+    Empty results (None, [] or {}) are cached like any other value, so a user
+    with no goals or a state with no schemes does not hit the database on every
+    request; `empty_ttl` gives them a separate, usually shorter, lifetime.
+
+    With `serialize`, the entry holds the final JSON bytes plus a gzip copy
+    and hits are sent as a raw `Response`, skipping response_model validation,
+    JSON encoding and compression. The endpoint should declare a
+    `request: Request` parameter so the gzip body and ETag can be matched
+    against the request headers; a matching If-None-Match gets an empty 304.
+    `cache_control` (which implies `serialize`) and `vary` add those headers.
+    """
+    store = cache if cache is not None else response_cache
+    flight = flight if flight is not None else single_flight
+    serialize = serialize or cache_control is not None
+    if ttl is not None:
+        store.register_namespace(namespace, ttl)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs) if key else "all"
+
+            async def compute():
+                entry_tags = tuple(tags(*args, **kwargs)) if tags else ()
+                versions = store.tag_versions(entry_tags)
+                result = await func(*args, **kwargs)
+                entry_ttl, entry_stale_ttl = None, stale_ttl
+                if isinstance(result, TTLOverride):
+                    # Overridden (fallback) results are never served stale
+                    result, entry_ttl, entry_stale_ttl = result.value, result.ttl, 0
+                headers = None
+                if isinstance(result, HeadersOverride):
+                    if not serialize:
+                        raise TypeError(f"{namespace}: with_headers requires a serialized @cached endpoint")
+                    result, headers = result.value, result.headers
+                if entry_ttl is None and empty_ttl is not None and is_empty_result(result):
+                    entry_ttl, entry_stale_ttl = empty_ttl, 0
+                if serialize:
+                    result = serialize_payload(result, headers)
+                store.set(
+                    namespace, cache_key, result, ttl=entry_ttl, tags=entry_tags,
+                    versions=versions, stale_ttl=entry_stale_ttl
+                )
+                logger.debug(f"Generated and cached {namespace}: {cache_key}")
+                return result
+
+            async def refresh():
+                # Another request may have refreshed the entry since this one was scheduled
+                current, still_stale = store.lookup(namespace, cache_key)
+                if current is not _MISSING and not still_stale:
+                    return
+                try:
+                    await flight.run(namespace, cache_key, compute)
+                except Exception as e:
+                    logger.warning(f"Background refresh failed for {namespace}: {cache_key}: {str(e)}")
+
+            value, is_stale = store.lookup(namespace, cache_key)
+            if value is not _MISSING:
+                logger.debug(f"Cache hit for {namespace}: {cache_key}{' (stale)' if is_stale else ''}")
+                store.stats.record(namespace, "stale_hits" if is_stale else "hits")
+                if is_stale and not flight.in_flight(namespace, cache_key):
+                    background_tasks = next(
+                        (arg for arg in kwargs.values() if isinstance(arg, BackgroundTasks)), None
+                    )
+                    schedule_refresh(refresh, background_tasks)
+            else:
+                started = time.perf_counter()
+                try:
+                    value = await flight.run(namespace, cache_key, compute)
+                finally:
+                    store.stats.record_miss(namespace, time.perf_counter() - started)
+
+            if not serialize:
+                return value
+            request = next((arg for arg in kwargs.values() if isinstance(arg, Request)), None)
+            return serialized_response(value, request, cache_control, vary)
+        return wrapper
+    return decorator
@@ -0,0 +1,11 @@
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="module")
+def client():
+    """One app lifetime per test module. Imported lazily so modules can point DATABASE_URL at a temp database first."""
+    import main
+
+    with TestClient(main.app) as client:
+        yield client
@@ -1,7 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 import os
 from dotenv import load_dotenv
 import asyncio
@@ -12,8 +13,46 @@ load_dotenv()
 # Database configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fintwin_plus.db")
 
+# SQLite profile: "development" shares one connection for everything; "production"
+# enables WAL and tuned pragmas, with one async writer connection and a pool of readers
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "development")
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "4"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))  # 256 MB
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))  # 64 MB per connection
+
+def apply_sqlite_pragmas(engine, read_only: bool = False) -> None:
+    """Tune every new connection of a (sync or async) SQLite engine for concurrent use."""
+    @event.listens_for(getattr(engine, "sync_engine", engine), "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        # WAL lets readers run while the writer commits; the mode is persisted in the file
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
 # Optimized SQLAlchemy engine for SQLite
-if "sqlite" in DATABASE_URL:
+if "sqlite" in DATABASE_URL and SQLITE_PROFILE == "production":
+    # Endpoints still on get_db, some of which query on the event loop and hold their session
+    # across awaits; a one-connection pool would block the loop in checkout. Their writes
+    # queue behind the async writer's on SQLite's lock, waiting up to `timeout` seconds.
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={
+            "check_same_thread": False,
+            "timeout": 20,
+            "isolation_level": None
+        },
+        pool_size=5,
+        max_overflow=10,
+        echo=False
+    )
+    apply_sqlite_pragmas(engine)
+elif "sqlite" in DATABASE_URL:
     engine = create_engine(
         DATABASE_URL,
         connect_args={
@@ -43,6 +82,93 @@ SessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Async engine on the same database (aiosqlite for SQLite, asyncpg for PostgreSQL),
+# so hot endpoints can query without blocking the event loop
+def to_async_url(url: str) -> str:
+    """Map a sync database URL to the matching async driver."""
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    for prefix in ("postgresql://", "postgres://", "postgresql+psycopg2://"):
+        if url.startswith(prefix):
+            return url.replace(prefix, "postgresql+asyncpg://", 1)
+    return url
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+def create_async_engines(url: str, sqlite_profile: str = SQLITE_PROFILE):
+    """
+    Return `(writer, reader)` async engines. They are the same engine except for
+    the SQLite production profile, where the writer holds a single connection
+    and the reader is a pool of query-only connections.
+    """
+    if "sqlite" not in url:
+        engine = create_async_engine(
+            url,
+            pool_size=20,
+            max_overflow=30,
+            pool_pre_ping=True,
+            pool_recycle=3600,
+            echo=False
+        )
+        return engine, engine
+    if sqlite_profile != "production":
+        engine = create_async_engine(url, connect_args={"timeout": 20}, echo=False)
+        return engine, engine
+
+    writer = create_async_engine(
+        url,
+        connect_args={"timeout": 20},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        echo=False
+    )
+    apply_sqlite_pragmas(writer)
+    reader = create_async_engine(
+        url,
+        connect_args={"timeout": 20},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+        echo=False
+    )
+    apply_sqlite_pragmas(reader, read_only=True)
+    return writer, reader
+
+async_engine, async_read_engine = create_async_engines(ASYNC_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Sessions for endpoints that only read; objects loaded here must not be modified
+AsyncReadSessionLocal = async_sessionmaker(
+    async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Optional read replica. Replicas lag the primary, so a user's reads go to the
+# primary for READ_YOUR_WRITES_SECONDS after that user's own write.
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", "")
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+if READ_DATABASE_URL:
+    _, replica_engine = create_async_engines(to_async_url(READ_DATABASE_URL))
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+else:
+    replica_engine = None
+    AsyncReplicaSessionLocal = None
+
 # Create Base class
 Base = declarative_base()
 
@@ -60,10 +186,12 @@ def get_db():
     finally:
         db.close()
 
-# Async database session for heavy operations
+# Async database session; queries must be awaited (await db.execute(select(...)))
 async def get_async_db():
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
\ No newline at end of file
+
+# Read-only async session for GET endpoints
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
\ No newline at end of file
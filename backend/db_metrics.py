@@ -0,0 +1,138 @@
+"""
+Per-request SQL instrumentation.
+
+SQLAlchemy cursor events count and time every statement issued while a
+request is being served. Each request gets its own QueryTracker through a
+context variable, so concurrent requests never share counts. Sync sessions
+in the threadpool and async sessions in the event loop both see it. At the
+end of the request the tracker feeds the `db_metrics` registry, and any
+statement repeated within that one request is logged as an N+1 suspect.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+
+# An identical statement issued this many times in one request is logged as an N+1 suspect
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "3"))
+# Suspect statements kept per route in the registry
+MAX_SUSPECTS_PER_ROUTE = 5
+
+class QueryTracker:
+    """Statements, count and database time of one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> List[Tuple[str, int]]:
+        """Statements issued at least `threshold` times, most repeated first."""
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+_current_tracker: contextvars.ContextVar[Optional[QueryTracker]] = contextvars.ContextVar(
+    "fintwin_query_tracker", default=None
+)
+
+def start_tracking() -> Tuple[QueryTracker, contextvars.Token]:
+    """Track the statements of the current request; pass the token to `stop_tracking`."""
+    tracker = QueryTracker()
+    return tracker, _current_tracker.set(tracker)
+
+def stop_tracking(token: contextvars.Token) -> None:
+    _current_tracker.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_tracker.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    tracker = _current_tracker.get()
+    if tracker is not None and conn.info.get("query_start_time"):
+        tracker.record(statement, time.perf_counter() - conn.info["query_start_time"].pop())
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and _current_tracker.get() is not None and conn.info.get("query_start_time"):
+        conn.info["query_start_time"].pop()
+
+def instrument_engine(engine) -> None:
+    """Attach the query counters to a sync or async engine (idempotent)."""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+        event.listen(target, "handle_error", _handle_error)
+
+class DBMetrics:
+    """Per-route query counts, database time and N+1 suspects for one worker."""
+
+    COUNTERS = ("requests", "queries", "max_queries", "db_seconds", "max_db_seconds", "n_plus_one")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[str, Dict[str, Any]] = {}
+        self._suspects: Dict[str, Dict[str, int]] = {}
+        self.since = time.time()
+
+    def record(self, route: str, tracker: QueryTracker) -> None:
+        repeated = tracker.repeated()
+        with self._lock:
+            counters = self._routes.setdefault(route, dict.fromkeys(self.COUNTERS, 0))
+            counters["requests"] += 1
+            counters["queries"] += tracker.queries
+            counters["max_queries"] = max(counters["max_queries"], tracker.queries)
+            counters["db_seconds"] += tracker.seconds
+            counters["max_db_seconds"] = max(counters["max_db_seconds"], tracker.seconds)
+            if repeated:
+                counters["n_plus_one"] += 1
+                suspects = self._suspects.setdefault(route, {})
+                for statement, count in repeated:
+                    if statement in suspects or len(suspects) < MAX_SUSPECTS_PER_ROUTE:
+                        suspects[statement] = max(suspects.get(statement, 0), count)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+            self._suspects.clear()
+            self.since = time.time()
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {route: dict(counters) for route, counters in self._routes.items()}
+            suspects = {route: dict(statements) for route, statements in self._suspects.items()}
+        report = {}
+        for route in sorted(routes):
+            counters = routes[route]
+            report[route] = {
+                "requests": counters["requests"],
+                "queries": counters["queries"],
+                "avg_queries": round(counters["queries"] / counters["requests"], 2),
+                "max_queries": counters["max_queries"],
+                "avg_db_ms": round(counters["db_seconds"] * 1000 / counters["requests"], 3),
+                "max_db_ms": round(counters["max_db_seconds"] * 1000, 3),
+                "n_plus_one_requests": counters["n_plus_one"],
+                "n_plus_one_suspects": [
+                    {"statement": " ".join(statement.split()), "max_repeats": count}
+                    for statement, count in sorted(suspects.get(route, {}).items(), key=lambda item: -item[1])
+                ]
+            }
+        return {
+            "stats_since": datetime.fromtimestamp(self.since, timezone.utc).isoformat(),
+            "n_plus_one_threshold": N_PLUS_ONE_THRESHOLD,
+            "routes": report
+        }
+
+db_metrics = DBMetrics()
@@ -0,0 +1,190 @@
+"""
+Vectorized time-value-of-money formulas shared by the financial simulations.
+
+Every function takes scalars or NumPy arrays and broadcasts them against each
+other, so the same call prices one loan, a batch of loans or a whole sweep
+grid. Rates are per period as fractions (use `monthly_rate` for the annual
+percentages the simulations are given), and periods are counts of periods.
+
+A zero rate is handled exactly (e.g. an EMI of principal / periods) instead of
+dividing by zero, and `(1 + rate) ** n - 1` is computed with expm1/log1p so
+rates close to zero keep their precision. Inputs the formulas cannot price,
+such as a zero-period loan, give inf or NaN rather than raising.
+"""
+
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+
+def monthly_rate(annual_rate_percent):
+    """Monthly rate, as a fraction, of an annual rate quoted in percent."""
+    return np.asarray(annual_rate_percent, dtype=float) / (12 * 100)
+
+
+def compound_growth(rate, periods):
+    """(1 + rate) ** periods - 1, accurate for rates near zero."""
+    return np.expm1(np.asarray(periods, dtype=float) * np.log1p(rate))
+
+
+def emi(principal, rate, periods):
+    """Level payment at the end of each period that repays `principal` over `periods`."""
+    principal, rate = np.asarray(principal, dtype=float), np.asarray(rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = compound_growth(rate, periods)
+        return np.where(rate == 0, principal / periods, principal * rate * (growth + 1) / growth)
+
+
+def fv_sip(payment, rate, periods, due=True):
+    """
+    Value after `periods` of investing `payment` every period.
+
+    With `due` the payment is made at the start of each period (the usual SIP
+    convention); otherwise at its end (an ordinary annuity).
+    """
+    payment, rate = np.asarray(payment, dtype=float), np.asarray(rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = payment * (compound_growth(rate, periods) / rate)
+        if due:
+            value = value * (1 + rate)
+        return np.where(rate == 0, payment * periods, value)
+
+
+def sip_for_goal(goal, rate, periods, due=True):
+    """Payment per period that grows to `goal` after `periods`; the inverse of fv_sip."""
+    goal, rate = np.asarray(goal, dtype=float), np.asarray(rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payment = goal * rate / compound_growth(rate, periods)
+        if due:
+            payment = payment / (1 + rate)
+        return np.where(rate == 0, goal / periods, payment)
+
+
+def pv_annuity(payment, rate, periods, due=False):
+    """Present value of `payment` per period for `periods`, paid at the end (or start, with `due`) of each."""
+    payment, rate = np.asarray(payment, dtype=float), np.asarray(rate, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value = payment * (-np.expm1(-np.asarray(periods, dtype=float) * np.log1p(rate)) / rate)
+        if due:
+            value = value * (1 + rate)
+        return np.where(rate == 0, payment * periods, value)
+
+
+def nper(rate, payment, present_value=0.0, future_value=0.0):
+    """
+    Periods until a balance reaches `future_value`.
+
+    The balance starts at `present_value`, earns `rate` and receives `payment`
+    at the end of every period; a loan is a negative present value repaid by
+    positive payments. Returns inf where the balance never gets there.
+    """
+    rate, payment = np.asarray(rate, dtype=float), np.asarray(payment, dtype=float)
+    present_value, future_value = np.asarray(present_value, dtype=float), np.asarray(future_value, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        periods = np.where(
+            rate == 0,
+            (future_value - present_value) / payment,
+            np.log1p((future_value - present_value) * rate / (present_value * rate + payment)) / np.log1p(rate)
+        )
+        return np.where(np.isnan(periods) | (periods < 0), np.inf, periods)
+
+
+def rate(periods, payment, present_value, future_value=0.0, guess=0.01, iterations=100, tolerance=1e-10):
+    """
+    Rate per period at which `present_value` plus `payment` per period grows to `future_value`.
+
+    Uses the balance convention of `nper`, so `rate(n, emi(P, r, n), -P)` is r.
+    Solved by Newton's method on all elements at once; elements that do not
+    converge within `iterations` are NaN.
+    """
+    periods, payment = np.asarray(periods, dtype=float), np.asarray(payment, dtype=float)
+    present_value, future_value = np.asarray(present_value, dtype=float), np.asarray(future_value, dtype=float)
+    shape = np.broadcast(periods, payment, present_value, future_value).shape
+    estimate = np.full(shape, float(guess))
+    converged = np.zeros(shape, dtype=bool)
+    # Newton converges on whichever form of the balance equation is monotonic in the rate: the
+    # future-value form for savings, the present-value form for a debt being repaid
+    savings = present_value >= 0
+    # Taylor coefficients of the annuity factors, used where they would cancel catastrophically
+    fv_terms = (periods * (periods - 1) / 2, periods * (periods - 1) * (periods - 2) / 6)
+    pv_terms = (periods * (periods + 1) / 2, periods * (periods + 1) * (periods + 2) / 6)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for _ in range(iterations):
+            near_zero = np.abs(estimate) < 1e-6
+            log_growth = periods * np.log1p(estimate)
+            step = np.zeros(shape)
+            if savings.any():
+                # pv (1+r)^n + payment ((1+r)^n - 1) / r - fv
+                growth = np.expm1(log_growth)
+                d_growth = periods * (growth + 1) / (1 + estimate)
+                factor = np.where(near_zero, periods + (fv_terms[0] + fv_terms[1] * estimate) * estimate, growth / estimate)
+                d_factor = np.where(near_zero, fv_terms[0] + 2 * fv_terms[1] * estimate, (d_growth * estimate - growth) / estimate ** 2)
+                value = present_value * (growth + 1) + payment * factor - future_value
+                step = np.where(savings, value / (present_value * d_growth + payment * d_factor), step)
+            if not savings.all():
+                # pv + payment (1 - (1+r)^-n) / r - fv (1+r)^-n
+                discounted = -np.expm1(-log_growth)
+                d_discount = -periods * (1 - discounted) / (1 + estimate)
+                factor = np.where(near_zero, periods - (pv_terms[0] - pv_terms[1] * estimate) * estimate, discounted / estimate)
+                d_factor = np.where(near_zero, -pv_terms[0] + 2 * pv_terms[1] * estimate, (-d_discount * estimate - discounted) / estimate ** 2)
+                value = present_value + payment * factor - future_value * (1 - discounted)
+                step = np.where(savings, step, value / (payment * d_factor - future_value * d_discount))
+
+            # Cap the step: from below the root the convex future-value form overshoots, and far
+            # enough out (1 + rate) ** periods overflows
+            limit = np.maximum(np.abs(estimate), 0.01) / 2
+            step = np.where(converged, 0.0, np.clip(step, -limit, limit))
+            estimate = estimate - step
+            converged |= np.abs(step) < tolerance
+            if converged.all():
+                break
+    return np.where(converged & np.isfinite(estimate), estimate, np.nan)
+
+
+class Amortization(NamedTuple):
+    """Repayment schedule; every array but `period` has the loans' shape plus a trailing period axis."""
+    period: np.ndarray
+    payment: np.ndarray
+    interest: np.ndarray
+    principal: np.ndarray
+    balance: np.ndarray
+
+
+def amortization(principal, rate, periods, start=0, stop: Optional[int] = None) -> Amortization:
+    """
+    Level-payment schedule of loans, for periods `start + 1` through `stop`.
+
+    Each row is computed from the closed-form balance, not by carrying the
+    previous row forward, so any window of the schedule can be produced on its
+    own: a long schedule can be generated in chunks with constant memory.
+    Periods after a loan's term are zero, and the last payment clears the
+    balance exactly. `stop` defaults to the longest term.
+    """
+    principal, rate = np.asarray(principal, dtype=float), np.asarray(rate, dtype=float)
+    periods = np.asarray(periods, dtype=float)
+    if stop is None:
+        stop = int(np.max(periods))
+    period = np.arange(start + 1, stop + 1)
+
+    principal_, rate_, periods_ = principal[..., None], rate[..., None], periods[..., None]
+    payment = emi(principal, rate, periods)[..., None]
+    # Balance after 0..k payments: P(1+r)^k - EMI((1+r)^k - 1)/r, or P - EMI k at a zero rate
+    elapsed = np.arange(start, stop + 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = compound_growth(rate_, elapsed)
+        balance = np.where(
+            rate_ == 0, principal_ - payment * elapsed, principal_ + (principal_ - payment / rate_) * growth
+        )
+    balance = np.where(elapsed >= periods_, 0.0, balance)
+    opening, closing = balance[..., :-1], balance[..., 1:]
+
+    active = period <= periods_
+    interest = np.where(active, opening * rate_, 0.0)
+    repaid = np.where(active, opening - closing, 0.0)
+    return Amortization(
+        period=period,
+        payment=interest + repaid,
+        interest=interest,
+        principal=repaid,
+        balance=closing
+    )
@@ -1,16 +1,18 @@
-from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Depends, status, BackgroundTasks, Request, Response, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, select
 import uvicorn
 from datetime import datetime, timedelta
 from typing import Optional, List
 import os
 from dotenv import load_dotenv
 import asyncio
+import functools
 from functools import lru_cache
 import time
 import logging
@@ -23,28 +25,42 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # Import our modules
-from database import get_db, engine, Base
-from models import User, FinancialProfile, CommunityCircle, GovernmentScheme, SavingsGoal, SimulationProfile
+from database import (
+    get_db, get_async_db, get_async_read_db, engine, async_engine, async_read_engine, replica_engine, Base,
+    AsyncReadSessionLocal, AsyncReplicaSessionLocal, READ_YOUR_WRITES_SECONDS
+)
+from models import (
+    User, FinancialProfile, CommunityCircle, GovernmentScheme, SchemeState, SavingsGoal, SimulationProfile,
+    VoiceInteraction, ALL_STATES
+)
 from schemas import (
     UserCreate, UserResponse, UserLogin, Token, AuthResponse,
     FinancialProfileCreate, FinancialProfileResponse,
     CommunityCircleResponse, GovernmentSchemeResponse,
     SavingsGoalCreate, SavingsGoalResponse,
-    VoiceQuery, VoiceResponse, AssessmentQuestion, AssessmentSubmission, AssessmentResult
+    VoiceQuery, VoiceResponse, VoiceInteractionResponse, AssessmentQuestion, AssessmentSubmission, AssessmentResult
 )
 from auth import (
     create_access_token, verify_token, get_current_user,
-    authenticate_user, get_password_hash
+    authenticate_user, hash_password, require_admin_user, get_user_by_email
 )
 from ai_services import (
     process_voice_query, generate_cultural_nudge,
-    check_scheme_eligibility, calculate_financial_score,
+    check_scheme_eligibility,
     process_voice_query_with_ai, generate_ai_financial_advice,
     generate_ai_cultural_nudge, generate_dynamic_lessons,
-    generate_additional_lessons, run_financial_simulation
+    generate_additional_lessons, run_financial_simulation, run_financial_simulation_batch,
+    run_financial_simulation_sweep, loan_schedule_terms, generate_static_lesson_content, score_financial_data
 )
+from schedules import SCHEDULE_MEDIA_TYPES, schedule_stream
 from voice_services import text_to_speech, speech_to_text, get_speech_recognition_language
 from services.assessment_service import assessment_service
+from cache import (
+    cached, with_ttl, with_headers, entity_tag, response_cache, single_flight, cache_warmup, create_recent_writes,
+    CACHE_SNAPSHOT_PATH
+)
+from pagination import MAX_PAGE_SIZE, newest_first, highest_id_first, split_page, page_headers
+from db_metrics import db_metrics, instrument_engine, start_tracking, stop_tracking
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -71,13 +87,37 @@ app.add_middleware(
     max_age=3600,  # Cache preflight requests for 1 hour
 )
 
+# Count and time the SQL every request issues
+for instrumented_engine in (engine, async_engine, async_read_engine, replica_engine):
+    if instrumented_engine is not None:
+        instrument_engine(instrumented_engine)
+
+def route_label(request: Request) -> str:
+    """Method and path template of the matched route, so metrics don't grow per user id."""
+    # The router stores the API route it matched; plain Starlette routes (the docs) leave none
+    route = request.scope.get("route")
+    if route is None:
+        return f"{request.method} <unmatched>"
+    return f"{request.method} {route.path}"
+
 # Performance monitoring middleware
 @app.middleware("http")
 async def add_performance_headers(request, call_next):
     start_time = time.time()
-    response = await call_next(request)
+    tracker, token = start_tracking()
+    try:
+        response = await call_next(request)
+    finally:
+        stop_tracking(token)
     process_time = time.time() - start_time
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-DB-Queries"] = str(tracker.queries)
+    response.headers["X-DB-Time"] = str(tracker.seconds)
+    
+    route = route_label(request)
+    db_metrics.record(route, tracker)
+    for statement, count in tracker.repeated():
+        logger.warning(f"N+1 suspect: {route} ran the same statement {count} times: {' '.join(statement.split())[:200]}")
     
     # Log slow requests
     if process_time > 1.0:  # Log requests taking more than 1 second
@@ -85,19 +125,75 @@ async def add_performance_headers(request, call_next):
     
     return response
 
-# Cache for frequently accessed data
-cache = {}
-cache_ttl = {}
-CACHE_DURATION = 300  # 5 minutes
+# Fallback responses are cached briefly so a transient failure is retried soon
+FALLBACK_CACHE_TTL = 30
+
+def user_cache_key(current_user: User, **_) -> int:
+    return current_user.id
+
+def state_cache_key(state: Optional[str] = None, **_) -> str:
+    return state or "all"
 
-def get_from_cache(key: str):
-    if key in cache and time.time() - cache_ttl.get(key, 0) < CACHE_DURATION:
-        return cache[key]
-    return None
+def page_cache_key(base_key):
+    """Extend a @cached key function with the page's cursor and limit, so each page is its own entry."""
+    def build_key(*args, cursor: Optional[str] = None, limit: Optional[int] = None, **kwargs):
+        return (base_key(*args, **kwargs), cursor, limit)
+    return build_key
 
-def set_cache(key: str, value):
-    cache[key] = value
-    cache_ttl[key] = time.time()
+# Default page sizes of the paginated list endpoints; `limit` goes up to MAX_PAGE_SIZE
+CIRCLES_PAGE_SIZE = 30
+SCHEMES_PAGE_SIZE = 50
+GOALS_PAGE_SIZE = 20
+VOICE_HISTORY_PAGE_SIZE = 20
+
+# Upper bound on the number of scenarios in one /simulations/batch request
+SIMULATION_BATCH_MAX_ITEMS = int(os.getenv("SIMULATION_BATCH_MAX_ITEMS", "10000"))
+# Monte Carlo items cost ~50 ms each (10k paths x 30 years), so a batch may hold only a few
+MONTE_CARLO_BATCH_MAX_ITEMS = int(os.getenv("MONTE_CARLO_BATCH_MAX_ITEMS", "20"))
+# Upper bound on the number of grid cells one /simulations/sweep request evaluates
+SIMULATION_SWEEP_MAX_CELLS = int(os.getenv("SIMULATION_SWEEP_MAX_CELLS", "40000"))
+
+# Entities a user's cached responses can depend on. Every write that commits
+# one of these must call invalidate_user_cache with the matching entity.
+USER = "user"
+GOALS = "goals"
+FINANCIAL_PROFILE = "financial_profile"
+SIMULATION_PROFILE = "simulation_profile"
+
+def user_tags(*entities: str):
+    """Build a @cached tags function for entries depending on the user's entities."""
+    def build_tags(current_user: User, **_) -> List[str]:
+        return [entity_tag(entity, current_user.id) for entity in entities]
+    return build_tags
+
+# Users who wrote within READ_YOUR_WRITES_SECONDS; shared between workers with the sqlite cache backend.
+# Kept out of response_cache, whose LRU could evict a marker before it expires.
+recent_writes = create_recent_writes(READ_YOUR_WRITES_SECONDS)
+
+def invalidate_user_cache(user_id: int, *entities: str) -> None:
+    """Drop the user's cached responses for `entities`; USER also drops the cached principal (auth.py)."""
+    response_cache.invalidate_tags(*(entity_tag(entity, user_id) for entity in entities))
+    if AsyncReplicaSessionLocal is not None:
+        # Keep this user's reads on the primary until the replica has caught up
+        recent_writes.mark(user_id)
+
+async def get_user_read_db(current_user: User = Depends(get_current_user)):
+    """Read session for GET endpoints: the replica when configured, unless the user just wrote."""
+    session_factory = AsyncReadSessionLocal
+    if AsyncReplicaSessionLocal is not None and current_user.id not in recent_writes:
+        session_factory = AsyncReplicaSessionLocal
+    async with session_factory() as db:
+        yield db
+
+async def load_financial_data(db: AsyncSession, user_id: int):
+    """Load the financial profile and all savings goals a financial score is computed from."""
+    profile = (await db.execute(
+        select(FinancialProfile).where(FinancialProfile.user_id == user_id)
+    )).scalars().first()
+    goals = (await db.execute(
+        select(SavingsGoal).where(SavingsGoal.user_id == user_id)
+    )).scalars().all()
+    return profile, goals
 
 security = HTTPBearer()
 
@@ -110,11 +206,20 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the startup cache warm-up has finished."""
+    warmup_status = cache_warmup.status()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if cache_warmup.ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"cache_warmup": warmup_status, "timestamp": datetime.utcnow().isoformat()}
+    )
+
 # Authentication endpoints
 @app.post("/auth/register", response_model=AuthResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = await get_user_by_email(db, user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
@@ -122,7 +227,7 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(
         email=user.email,
         phone=user.phone,
@@ -134,8 +239,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
         financial_knowledge_level=user.financial_knowledge_level or 'beginner'
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     # Generate access token for the new user
     access_token_expires = timedelta(minutes=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30)))
@@ -150,8 +255,8 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     )
 
 @app.post("/auth/login", response_model=AuthResponse)
-async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
-    user = authenticate_user(db, user_credentials.email, user_credentials.password)
+async def login(user_credentials: UserLogin, db: AsyncSession = Depends(get_async_read_db)):
+    user = await authenticate_user(db, user_credentials.email, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -176,35 +281,31 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     return UserResponse.from_orm(current_user)
 
 @app.get("/auth/me", response_model=UserResponse)
+@cached("user_profile", ttl=1800, key=user_cache_key, tags=user_tags(USER))
 async def get_current_user_profile(current_user: User = Depends(get_current_user)):
     # Cache user profile for faster subsequent requests
-    cache_key = f"user_profile_{current_user.id}"
-    cached_profile = get_from_cache(cache_key)
-    
-    if cached_profile:
-        return cached_profile
-    
-    user_response = UserResponse.from_orm(current_user)
-    set_cache(cache_key, user_response)
-    return user_response
+    return UserResponse.from_orm(current_user)
 
 @app.put("/auth/profile", response_model=UserResponse)
 async def update_user_profile(
     profile_updates: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
+    # current_user is a read-only snapshot; modify the row through this session
+    user = await db.get(User, current_user.id)
+    
     # Update user fields that are allowed to be modified
     if "culturalProfile" in profile_updates:
         cultural = profile_updates["culturalProfile"]
         if "state" in cultural:
-            current_user.state = cultural["state"]
+            user.state = cultural["state"]
         if "religion" in cultural:
-            current_user.religion = cultural["religion"]
+            user.religion = cultural["religion"]
         if "language" in cultural:
-            current_user.language = cultural["language"]
+            user.language = cultural["language"]
         if "familyStructure" in cultural:
-            current_user.cultural_background = cultural["familyStructure"]
+            user.cultural_background = cultural["familyStructure"]
     
     if "financialGoals" in profile_updates:
         # Handle financial goals if needed
@@ -215,12 +316,13 @@ async def update_user_profile(
         pass
     
     # Mark onboarding as completed
-    current_user.onboarding_completed = True
+    user.onboarding_completed = True
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user_cache(user.id, USER)
     
-    return UserResponse.from_orm(current_user)
+    return UserResponse.from_orm(user)
 
 @app.get("/users/{user_id}/financial-profile", response_model=FinancialProfileResponse)
 async def get_financial_profile(
@@ -265,6 +367,7 @@ async def create_financial_profile(
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    invalidate_user_cache(user_id, FINANCIAL_PROFILE)
     
     return FinancialProfileResponse.from_orm(db_profile)
 
@@ -293,6 +396,24 @@ async def process_voice(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Voice processing error: {str(e)}")
 
+@app.get("/voice/history", response_model=List[VoiceInteractionResponse])
+async def get_voice_history(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(VOICE_HISTORY_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    # Always the primary: interactions are written by ai_services.process_voice_query, which
+    # does not mark the user as a recent writer, so a replica could hide the newest ones
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """The user's voice assistant interactions, newest first, paginated like the other lists"""
+    result = await db.execute(newest_first(
+        select(VoiceInteraction).where(VoiceInteraction.user_id == current_user.id), VoiceInteraction, cursor, limit
+    ))
+    interactions, next_cursor = split_page(result.scalars().all(), limit, "created_at", "id")
+    response.headers.update(page_headers("/voice/history", next_cursor, limit=limit))
+    return [VoiceInteractionResponse.from_orm(interaction) for interaction in interactions]
+
 @app.post("/voice/text-to-speech")
 async def convert_text_to_speech(
     text: str,
@@ -351,7 +472,8 @@ async def get_voice_api_status():
     }
 
 @app.get("/voice/supported-languages")
-async def get_supported_voice_languages():
+@cached("supported_languages", ttl=86400, cache_control="public, max-age=86400")
+async def get_supported_voice_languages(request: Request):
     from voice_services import get_supported_languages
     return get_supported_languages()
 
@@ -432,61 +554,58 @@ async def get_ai_cultural_nudges(
 
 # Community endpoints
 @app.get("/community/circles", response_model=List[CommunityCircleResponse])
+@cached(
+    "community_circles", ttl=600, empty_ttl=120, key=page_cache_key(state_cache_key),  # 10 minutes, 2 when none found
+    cache_control="private, max-age=120", vary="Authorization"
+)
 async def get_community_circles(
+    request: Request,
     state: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(CIRCLES_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    # Create cache key based on state filter
-    cache_key = f"community_circles_{state or 'all'}"
-    cached_circles = get_from_cache(cache_key)
-    
-    if cached_circles:
-        logger.info(f"Cache hit for community circles: state={state}")
-        return cached_circles
-    
-    # Optimize query with limit and ordering
-    query = db.query(CommunityCircle)
+    # Keyset pagination on id; the next page's cursor is sent in X-Next-Cursor and Link
+    query = select(CommunityCircle)
     if state:
-        query = query.filter(CommunityCircle.state == state)
-    
-    circles = query.order_by(CommunityCircle.id.desc()).limit(30).all()
-    circles_response = [CommunityCircleResponse.from_orm(circle) for circle in circles]
+        query = query.where(CommunityCircle.state == state)
     
-    # Cache community circles for 10 minutes
-    set_cache(cache_key, circles_response)
-    logger.info(f"Generated and cached community circles for state={state}")
-    
-    return circles_response
+    result = await db.execute(highest_id_first(query, CommunityCircle, cursor, limit))
+    circles, next_cursor = split_page(result.scalars().all(), limit, "id")
+    return with_headers(
+        [CommunityCircleResponse.from_orm(circle) for circle in circles],
+        page_headers("/community/circles", next_cursor, state=state, limit=limit)
+    )
 
 # Government schemes endpoints
 @app.get("/schemes", response_model=List[GovernmentSchemeResponse])
+@cached(
+    "government_schemes", ttl=900, empty_ttl=300, key=page_cache_key(state_cache_key),  # 15 minutes, schemes change less frequently
+    cache_control="private, max-age=300", vary="Authorization"
+)
 async def get_government_schemes(
+    request: Request,
     state: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(SCHEMES_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    # Create cache key based on state filter
-    cache_key = f"government_schemes_{state or 'all'}"
-    cached_schemes = get_from_cache(cache_key)
-    
-    if cached_schemes:
-        logger.info(f"Cache hit for government schemes: state={state}")
-        return cached_schemes
-    
-    # Optimize query with limit and ordering
-    query = db.query(GovernmentScheme)
+    # Keyset pagination on id; the next page's cursor is sent in X-Next-Cursor and Link
+    query = select(GovernmentScheme)
     if state:
-        query = query.filter(GovernmentScheme.applicable_states.contains(state))
-    
-    schemes = query.order_by(GovernmentScheme.id.desc()).limit(50).all()
-    schemes_response = [GovernmentSchemeResponse.from_orm(scheme) for scheme in schemes]
+        # Exact, indexed match on scheme_states; central schemes apply in every state
+        query = query.where(GovernmentScheme.id.in_(
+            select(SchemeState.scheme_id).where(SchemeState.state.in_([state, ALL_STATES]))
+        ))
     
-    # Cache government schemes for 15 minutes (they change less frequently)
-    set_cache(cache_key, schemes_response)
-    logger.info(f"Generated and cached government schemes for state={state}")
-    
-    return schemes_response
+    result = await db.execute(highest_id_first(query, GovernmentScheme, cursor, limit))
+    schemes, next_cursor = split_page(result.scalars().all(), limit, "id")
+    return with_headers(
+        [GovernmentSchemeResponse.from_orm(scheme) for scheme in schemes],
+        page_headers("/schemes", next_cursor, state=state, limit=limit)
+    )
 
 @app.post("/schemes/check-eligibility")
 async def check_eligibility(
@@ -503,36 +622,33 @@ async def check_eligibility(
 
 # Savings and goals endpoints
 @app.get("/savings/goals", response_model=List[SavingsGoalResponse])
+@cached(
+    "savings_goals", ttl=1800, empty_ttl=600, key=page_cache_key(user_cache_key),  # 30 minutes, invalidated on write
+    tags=user_tags(GOALS), serialize=True
+)
 async def get_savings_goals(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(GOALS_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    # Check cache first for savings goals
-    cache_key = f"savings_goals_{current_user.id}"
-    cached_goals = get_from_cache(cache_key)
+    # Keyset pagination on (created_at, id) through ix_savings_goals_user_id_created_at
+    result = await db.execute(newest_first(
+        select(SavingsGoal).where(SavingsGoal.user_id == current_user.id), SavingsGoal, cursor, limit
+    ))
+    goals, next_cursor = split_page(result.scalars().all(), limit, "created_at", "id")
     
-    if cached_goals:
-        logger.info(f"Cache hit for savings goals: user {current_user.id}")
-        return cached_goals
-    
-    # Optimize query with limit and ordering
-    goals = db.query(SavingsGoal).filter(
-        SavingsGoal.user_id == current_user.id
-    ).order_by(SavingsGoal.created_at.desc()).limit(20).all()
-    
-    goals_response = [SavingsGoalResponse.from_orm(goal) for goal in goals]
-    
-    # Cache savings goals for 5 minutes
-    set_cache(cache_key, goals_response)
-    logger.info(f"Generated and cached savings goals for user {current_user.id}")
-    
-    return goals_response
+    return with_headers(
+        [SavingsGoalResponse.from_orm(goal) for goal in goals],
+        page_headers("/savings/goals", next_cursor, limit=limit)
+    )
 
 @app.post("/savings/goals", response_model=SavingsGoalResponse)
 async def create_savings_goal(
     goal_data: SavingsGoalCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     db_goal = SavingsGoal(
         user_id=current_user.id,
@@ -544,33 +660,30 @@ async def create_savings_goal(
         cultural_context=goal_data.cultural_context
     )
     db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    await db.commit()
+    await db.refresh(db_goal)
+    invalidate_user_cache(current_user.id, GOALS)
     
     return SavingsGoalResponse.from_orm(db_goal)
 
 # Dashboard endpoints
 @app.get("/dashboard/")
+@cached(
+    "dashboard", ttl=300, stale_ttl=1500, key=user_cache_key,  # fresh 5 minutes, then served stale while refreshing
+    tags=user_tags(USER, GOALS, FINANCIAL_PROFILE)
+)
 async def get_dashboard_data(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
-    # Check cache first for dashboard data
-    cache_key = f"dashboard_{current_user.id}"
-    cached_dashboard = get_from_cache(cache_key)
-    
-    if cached_dashboard:
-        logger.info(f"Cache hit for dashboard: user {current_user.id}")
-        return cached_dashboard
-    
     try:
-        # Optimize database queries by fetching related data in fewer queries
-        profile = db.query(FinancialProfile).filter(FinancialProfile.user_id == current_user.id).first()
-        goals = db.query(SavingsGoal).filter(SavingsGoal.user_id == current_user.id).limit(5).all()  # Limit for performance
+        # Load the profile and goals once and score from them
+        profile, goals = await load_financial_data(db, current_user.id)
         
         # Get financial score (with fallback for incomplete profiles)
         try:
-            financial_score = await calculate_financial_score(current_user, db)
+            financial_score = score_financial_data(current_user, profile, goals)
         except Exception as e:
             logger.warning(f"Financial score calculation failed for user {current_user.id}: {str(e)}")
             financial_score = {"score": 500, "category": "Getting Started"}  # Default score
@@ -615,10 +728,6 @@ async def get_dashboard_data(
             "cultural_nudges": cultural_nudges_list
         }
         
-        # Cache dashboard data for 2 minutes (shorter cache for dynamic data)
-        set_cache(cache_key, dashboard_data)
-        logger.info(f"Generated and cached dashboard data for user {current_user.id}")
-        
         return dashboard_data
         
     except Exception as e:
@@ -632,82 +741,53 @@ async def get_dashboard_data(
             "cultural_nudges": ["Welcome to FinTwin+! Complete your profile to get started."]
         }
         # Cache fallback data for shorter time
-        set_cache(cache_key, fallback_data)
-        return fallback_data
+        return with_ttl(fallback_data, FALLBACK_CACHE_TTL)
 
 @app.get("/dashboard/financial-score")
+@cached(
+    "financial_score", ttl=600, stale_ttl=1200, key=user_cache_key,  # fresh 10 minutes, then served stale while refreshing
+    tags=user_tags(USER, GOALS, FINANCIAL_PROFILE)
+)
 async def get_financial_score(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    # Check cache first for financial score
-    cache_key = f"financial_score_{current_user.id}"
-    cached_score = get_from_cache(cache_key)
-    
-    if cached_score:
-        logger.info(f"Cache hit for financial score: user {current_user.id}")
-        return cached_score
-    
     try:
-        score_data = await calculate_financial_score(current_user, db)
-        # Cache financial score for 5 minutes
-        set_cache(cache_key, score_data)
-        logger.info(f"Generated and cached financial score for user {current_user.id}")
-        return score_data
+        profile, goals = await load_financial_data(db, current_user.id)
+        return score_financial_data(current_user, profile, goals)
     except Exception as e:
         logger.error(f"Financial score calculation error for user {current_user.id}: {str(e)}")
         fallback_score = {"score": 500, "category": "Getting Started", "error": str(e)}
         # Cache fallback for shorter time
-        set_cache(cache_key, fallback_score)
-        return fallback_score
+        return with_ttl(fallback_score, FALLBACK_CACHE_TTL)
 
 @app.get("/dashboard/cultural-nudges")
+@cached(
+    "cultural_nudges", ttl=600, stale_ttl=3000, key=user_cache_key,  # fresh 10 minutes, nudges follow the calendar
+    tags=user_tags(USER)
+)
 async def get_cultural_nudges(
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    # Check cache first for cultural nudges
-    cache_key = f"cultural_nudges_{current_user.id}"
-    cached_nudges = get_from_cache(cache_key)
-    
-    if cached_nudges:
-        logger.info(f"Cache hit for cultural nudges: user {current_user.id}")
-        return cached_nudges
-    
     try:
         nudges = await generate_cultural_nudge(current_user, db)
-        nudges_data = {"nudges": nudges}
-        # Cache cultural nudges for 10 minutes (they change less frequently)
-        set_cache(cache_key, nudges_data)
-        logger.info(f"Generated and cached cultural nudges for user {current_user.id}")
-        return nudges_data
+        return {"nudges": nudges}
     except Exception as e:
         logger.error(f"Cultural nudges generation error for user {current_user.id}: {str(e)}")
         fallback_nudges = {"nudges": [], "error": str(e)}
         # Cache fallback for shorter time
-        set_cache(cache_key, fallback_nudges)
-        return fallback_nudges
+        return with_ttl(fallback_nudges, FALLBACK_CACHE_TTL)
 
 # Assessment endpoints
 @app.get("/assessment/questions", response_model=List[AssessmentQuestion])
-async def get_assessment_questions():
+@cached("assessment_questions", ttl=3600, cache_control="public, max-age=3600")  # 60 minutes, questions rarely change
+async def get_assessment_questions(request: Request):
     """Get assessment questions for financial literacy evaluation"""
     try:
-        # Check cache first for assessment questions
-        cache_key = "assessment_questions_all"
-        cached_questions = get_from_cache(cache_key)
-        
-        if cached_questions:
-            logger.info("Cache hit for assessment questions")
-            return cached_questions
-        
-        questions = assessment_service.get_questions()
-        
-        # Cache assessment questions for 60 minutes (they rarely change)
-        set_cache(cache_key, questions)
-        logger.info("Generated and cached assessment questions")
-        
-        return questions
+        return assessment_service.get_questions()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching questions: {str(e)}")
 
@@ -715,7 +795,7 @@ async def get_assessment_questions():
 async def submit_assessment(
     submission: AssessmentSubmission,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit assessment answers and get results"""
     try:
@@ -728,8 +808,10 @@ async def submit_assessment(
         result = assessment_service.get_assessment_result(answers)
         
         # Update user's financial knowledge level in database
-        current_user.financial_knowledge_level = result.knowledge_level
-        db.commit()
+        user = await db.get(User, current_user.id)
+        user.financial_knowledge_level = result.knowledge_level
+        await db.commit()
+        invalidate_user_cache(current_user.id, USER)
         
         return result
     except Exception as e:
@@ -739,7 +821,7 @@ async def submit_assessment(
 async def update_knowledge_level(
     level_data: dict,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Allow user to manually update their knowledge level"""
     try:
@@ -749,8 +831,10 @@ async def update_knowledge_level(
         if new_level not in valid_levels:
             raise HTTPException(status_code=400, detail="Invalid knowledge level")
         
-        current_user.financial_knowledge_level = new_level
-        db.commit()
+        user = await db.get(User, current_user.id)
+        user.financial_knowledge_level = new_level
+        await db.commit()
+        invalidate_user_cache(current_user.id, USER)
         
         level_content = assessment_service.get_level_content(new_level)
         
@@ -762,7 +846,14 @@ async def update_knowledge_level(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error updating knowledge level: {str(e)}")
 
+def level_content_cache_key(current_user: User, **_) -> tuple:
+    return (current_user.id, getattr(current_user, 'financial_knowledge_level', 'beginner'))
+
 @app.get("/users/level-content")
+@cached(
+    "level_content", ttl=3600, key=level_content_cache_key,  # 60 minutes, AI generation is expensive
+    tags=user_tags(USER)
+)
 async def get_level_content(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -771,33 +862,19 @@ async def get_level_content(
     try:
         level = getattr(current_user, 'financial_knowledge_level', 'beginner')
         
-        # Check cache first for user-specific content with optimized cache key
-        cache_key = f"level_content_{current_user.id}_{level}"
-        cached_content = get_from_cache(cache_key)
-        
-        if cached_content:
-            logger.info(f"Cache hit for level content: user {current_user.id}, level {level}")
-            return cached_content
-        
         # Generate content if not cached with optimized database queries
         level_data = assessment_service.get_level_content(level)
         
         # Generate dynamic lessons using AI (this is expensive, so cache it longer)
         dynamic_lessons = await generate_dynamic_lessons(current_user, level, db)
         
-        result = {
+        return {
             "level": level,
             "tagline": level_data["tagline"],
             "name": level_data["name"],
             "description": level_data["description"],
             "content": dynamic_lessons
         }
-        
-        # Cache the result for 15 minutes (longer for expensive AI operations)
-        set_cache(cache_key, result)
-        logger.info(f"Generated and cached level content for user {current_user.id}, level {level}")
-        
-        return result
     except Exception as e:
         logger.error(f"Error fetching level content for user {current_user.id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching level content: {str(e)}")
@@ -912,6 +989,129 @@ async def run_simulation(
         else:
             raise HTTPException(status_code=500, detail=f"Error running simulation: {str(e)}")
 
+def object_field(data: dict, field: str, label: Optional[str] = None) -> dict:
+    """An optional JSON object in a simulation request body; a 400 if it is present but not an object."""
+    value = data.get(field) or {}
+    if not isinstance(value, dict):
+        raise HTTPException(status_code=400, detail=f"{label or field} must be an object")
+    return value
+
+@app.post("/simulations/batch")
+async def run_simulation_batch(
+    batch_data: dict,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """Run many financial simulations in one request, computed together per simulation type"""
+    items = batch_data.get('items')
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        raise HTTPException(status_code=400, detail="items must be a non-empty list of simulations")
+    if len(items) > SIMULATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {SIMULATION_BATCH_MAX_ITEMS} simulations per batch"
+        )
+    if sum(isinstance(item.get('inputs'), dict) and item['inputs'].get('mode') == 'monte_carlo' for item in items) > MONTE_CARLO_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MONTE_CARLO_BATCH_MAX_ITEMS} Monte Carlo simulations per batch"
+        )
+    user_profile = object_field(batch_data, 'user_profile')
+    for index, item in enumerate(items):
+        object_field(item, 'user_profile', f"items[{index}].user_profile")
+    
+    result = await db.execute(select(SimulationProfile).where(SimulationProfile.user_id == current_user.id))
+    profile = result.scalars().first()
+    results = await run_financial_simulation_batch(
+        items, user_profile, profile, current_user
+    )
+    
+    # Results are plain JSON types already; skip jsonable_encoder, which dominates large batches
+    return JSONResponse(content={
+        "success": True,
+        "count": len(results),
+        "results": [
+            {"simulation_type": item.get('simulation_type'), "result": result}
+            for item, result in zip(items, results)
+        ]
+    })
+
+@app.post("/simulations/sweep")
+async def run_simulation_sweep(
+    sweep_data: dict,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """Evaluate a loan or SIP simulation over every combination of the given input values"""
+    axes = sweep_data.get('axes')
+    if not isinstance(axes, dict) or not axes or not all(isinstance(values, list) and values for values in axes.values()):
+        raise HTTPException(status_code=400, detail="axes must map each swept input to a non-empty list of values")
+    cells = 1
+    for values in axes.values():
+        cells *= len(values)
+    if cells > SIMULATION_SWEEP_MAX_CELLS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {SIMULATION_SWEEP_MAX_CELLS} grid cells per sweep"
+        )
+    user_inputs = object_field(sweep_data, 'inputs')
+    user_profile = object_field(sweep_data, 'user_profile')
+    
+    result = await db.execute(select(SimulationProfile).where(SimulationProfile.user_id == current_user.id))
+    profile = result.scalars().first()
+    simulation_type = sweep_data.get('simulation_type')
+    try:
+        grid = await run_financial_simulation_sweep(
+            simulation_type, user_inputs, axes, user_profile, profile, current_user, metrics=sweep_data.get('metrics')
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Grids are plain JSON types already; skip jsonable_encoder
+    return JSONResponse(content={"success": True, "simulation_type": simulation_type, "result": grid})
+
+@app.post("/simulations/schedule")
+async def export_simulation_schedule(
+    schedule_data: dict,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """Stream the month-by-month repayment and cash-flow schedule of one or many loan simulations"""
+    items = schedule_data.get('items')
+    if items is None and 'simulation_type' in schedule_data:
+        items = [{"simulation_type": schedule_data['simulation_type'], "inputs": schedule_data.get('inputs')}]
+    if not isinstance(items, list) or not items or not all(isinstance(item, dict) for item in items):
+        raise HTTPException(status_code=400, detail="items must be a non-empty list of loan simulations")
+    if len(items) > SIMULATION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {SIMULATION_BATCH_MAX_ITEMS} loans per schedule export"
+        )
+    export_format = schedule_data.get('format', 'ndjson')
+    if export_format not in SCHEDULE_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(SCHEDULE_MEDIA_TYPES)}")
+    user_profile = object_field(schedule_data, 'user_profile')
+    for index, item in enumerate(items):
+        object_field(item, 'inputs', f"items[{index}].inputs")
+        object_field(item, 'user_profile', f"items[{index}].user_profile")
+
+    result = await db.execute(select(SimulationProfile).where(SimulationProfile.user_id == current_user.id))
+    profile = result.scalars().first()
+    try:
+        terms = await asyncio.to_thread(
+            loan_schedule_terms, items, user_profile, profile, current_user
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Rows are computed and sent a block of loans at a time, on the threadpool that iterates sync bodies
+    headers = {}
+    if export_format == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="loan-schedules.csv"'
+    return StreamingResponse(
+        schedule_stream(terms, export_format), media_type=SCHEDULE_MEDIA_TYPES[export_format], headers=headers
+    )
+
 @app.post("/simulations/save-profile")
 async def save_simulation_profile(
     profile_data: dict,
@@ -946,6 +1146,7 @@ async def save_simulation_profile(
             profile.dependents = profile_data['dependents']
         
         db.commit()
+        invalidate_user_cache(current_user.id, SIMULATION_PROFILE)
         
         return {
             "success": True,
@@ -956,21 +1157,18 @@ async def save_simulation_profile(
         raise HTTPException(status_code=500, detail=f"Error saving profile: {str(e)}")
 
 @app.get("/simulations/profile")
+@cached(
+    "simulation_profile", ttl=1800, key=user_cache_key,  # 30 minutes, invalidated on write
+    tags=user_tags(SIMULATION_PROFILE)
+)
 async def get_simulation_profile(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """Get user's simulation profile"""
-    # Check cache first for simulation profile
-    cache_key = f"simulation_profile_{current_user.id}"
-    cached_profile = get_from_cache(cache_key)
-    
-    if cached_profile:
-        logger.info(f"Cache hit for simulation profile: user {current_user.id}")
-        return cached_profile
-    
     try:
-        profile = db.query(SimulationProfile).filter(SimulationProfile.user_id == current_user.id).first()
+        result = await db.execute(select(SimulationProfile).where(SimulationProfile.user_id == current_user.id))
+        profile = result.scalars().first()
         
         if not profile:
             profile_data = {
@@ -992,15 +1190,135 @@ async def get_simulation_profile(
                 }
             }
         
-        # Cache simulation profile for 10 minutes
-        set_cache(cache_key, profile_data)
-        logger.info(f"Generated and cached simulation profile for user {current_user.id}")
-        
         return profile_data
     except Exception as e:
         logger.error(f"Error fetching simulation profile for user {current_user.id}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error fetching profile: {str(e)}")
 
+# Admin endpoints
+@app.get("/admin/cache/stats")
+async def get_cache_stats(admin_user: User = Depends(require_admin_user)):
+    """Per-namespace hit ratio, miss latency, evictions and memory for this worker's cache"""
+    return {
+        **response_cache.report(),
+        "single_flight": single_flight.stats(),
+        "warmup": cache_warmup.status()
+    }
+
+@app.delete("/admin/cache/stats")
+async def reset_cache_stats(admin_user: User = Depends(require_admin_user)):
+    """Start a new measurement window, e.g. after changing TTLs"""
+    response_cache.stats.reset()
+    return {"message": "Cache stats reset"}
+
+@app.get("/admin/db/stats")
+async def get_db_stats(admin_user: User = Depends(require_admin_user)):
+    """Per-route query count, database time and N+1 suspects for this worker"""
+    return db_metrics.report()
+
+@app.delete("/admin/db/stats")
+async def reset_db_stats(admin_user: User = Depends(require_admin_user)):
+    """Start a new measurement window, e.g. after fixing a slow endpoint"""
+    db_metrics.reset()
+    return {"message": "Database stats reset"}
+
+# Cache warm-up and warm-restart snapshot
+CACHE_WARMUP_ENABLED = os.getenv("CACHE_WARMUP", "true").lower() == "true"
+warmup_tasks = set()
+
+async def catalog_states(db: AsyncSession) -> List[str]:
+    """Every state that schemes or community circles are filtered by."""
+    states = {state for state in (await db.execute(select(CommunityCircle.state).distinct())).scalars() if state}
+    states.update((await db.execute(select(SchemeState.state).distinct())).scalars())
+    states.discard(ALL_STATES)
+    return sorted(states)
+
+async def warm_static_lessons():
+    for level in assessment_service.level_definitions:
+        generate_static_lesson_content(level)
+        generate_static_lesson_content(level, is_additional=True)
+
+async def run_cache_warmup():
+    """Fill the catalog caches for every state so the first requests after a deploy are hits."""
+    db = AsyncReadSessionLocal()
+    try:
+        jobs = [
+            ("assessment_questions", functools.partial(get_assessment_questions, request=None)),
+            ("static_lessons", warm_static_lessons)
+        ]
+        for state in [None, *await catalog_states(db)]:
+            for namespace, endpoint, limit in (
+                ("government_schemes", get_government_schemes, SCHEMES_PAGE_SIZE),
+                ("community_circles", get_community_circles, CIRCLES_PAGE_SIZE)
+            ):
+                # First page at the default size, the same entry a request without cursor/limit reads
+                jobs.append((
+                    f"{namespace}:{state_cache_key(state)}",
+                    functools.partial(
+                        endpoint, request=None, state=state, cursor=None, limit=limit, current_user=None, db=db
+                    )
+                ))
+        await cache_warmup.run(jobs)
+    except Exception as e:
+        logger.error(f"Cache warm-up failed: {str(e)}")
+        await cache_warmup.run([])
+    finally:
+        await db.close()
+
+@app.on_event("startup")
+async def open_database_connections():
+    # A fresh pool (every startup after the shutdown's dispose) makes its first connection under
+    # a thread lock. If the warm-up and a request raced for it, the loser would block the event
+    # loop while the winner awaits; connect once before anything runs concurrently.
+    for async_db_engine in {async_engine, async_read_engine, replica_engine} - {None}:
+        try:
+            async with async_db_engine.connect():
+                pass
+        except Exception as e:
+            logger.warning(f"Could not open a database connection at startup: {str(e)}")
+
+@app.on_event("startup")
+async def warm_up_cache():
+    if CACHE_SNAPSHOT_PATH:
+        try:
+            restored = response_cache.load_snapshot(CACHE_SNAPSHOT_PATH)
+            logger.info(f"Restored {restored} cache entries from {CACHE_SNAPSHOT_PATH}")
+        except Exception as e:
+            logger.warning(f"Could not restore cache snapshot {CACHE_SNAPSHOT_PATH}: {str(e)}")
+    if not CACHE_WARMUP_ENABLED:
+        await cache_warmup.run([])
+        return
+    # Warm up in the background so the server starts accepting requests immediately
+    task = asyncio.create_task(run_cache_warmup())
+    warmup_tasks.add(task)
+    task.add_done_callback(warmup_tasks.discard)
+
+@app.on_event("shutdown")
+async def stop_cache_warmup():
+    # An unfinished warm-up would still hold a session while the engines are disposed below
+    for task in warmup_tasks:
+        task.cancel()
+    await asyncio.gather(*warmup_tasks, return_exceptions=True)
+
+@app.on_event("shutdown")
+async def save_cache_snapshot():
+    if not CACHE_SNAPSHOT_PATH:
+        return
+    try:
+        saved = response_cache.save_snapshot(CACHE_SNAPSHOT_PATH)
+        logger.info(f"Saved {saved} cache entries to {CACHE_SNAPSHOT_PATH}")
+    except Exception as e:
+        logger.warning(f"Could not save cache snapshot {CACHE_SNAPSHOT_PATH}: {str(e)}")
+
+@app.on_event("shutdown")
+async def close_database_connections():
+    # Pooled aiosqlite connections each own a worker thread that would keep the process alive
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
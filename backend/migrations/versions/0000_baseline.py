@@ -0,0 +1,348 @@
+"""Baseline schema: every table as it was before the first index migration
+
+A snapshot rather than models.py, so later revisions keep applying on top of
+it. An empty database gets the whole schema from `alembic upgrade head`.
+Tables that already exist, as in a database created by
+Base.metadata.create_all, are left alone.
+
+Revision ID: 0000_baseline
+Revises:
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000_baseline"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+metadata = sa.MetaData()
+
+sa.Table(
+    "government_schemes",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("name", sa.String(), nullable=False),
+    sa.Column("description", sa.Text(), nullable=True),
+    sa.Column("scheme_type", sa.String(), nullable=True),
+    sa.Column("eligibility_criteria", sa.JSON(), nullable=True),
+    sa.Column("benefits", sa.JSON(), nullable=True),
+    sa.Column("application_process", sa.Text(), nullable=True),
+    sa.Column("required_documents", sa.JSON(), nullable=True),
+    sa.Column("applicable_states", sa.JSON(), nullable=True),
+    sa.Column("age_min", sa.Integer(), nullable=True),
+    sa.Column("age_max", sa.Integer(), nullable=True),
+    sa.Column("income_max", sa.Float(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("official_website", sa.String(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_government_schemes_id", "id"),
+)
+
+sa.Table(
+    "investment_filters",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("name", sa.String(), nullable=False),
+    sa.Column("filter_type", sa.String(), nullable=True),
+    sa.Column("description", sa.Text(), nullable=True),
+    sa.Column("criteria", sa.JSON(), nullable=True),
+    sa.Column("applicable_religions", sa.JSON(), nullable=True),
+    sa.Column("excluded_sectors", sa.JSON(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_investment_filters_id", "id"),
+)
+
+sa.Table(
+    "local_agents",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("name", sa.String(), nullable=False),
+    sa.Column("phone", sa.String(), nullable=False),
+    sa.Column("email", sa.String(), nullable=True),
+    sa.Column("address", sa.Text(), nullable=True),
+    sa.Column("state", sa.String(), nullable=True),
+    sa.Column("district", sa.String(), nullable=True),
+    sa.Column("specializations", sa.JSON(), nullable=True),
+    sa.Column("languages_spoken", sa.JSON(), nullable=True),
+    sa.Column("rating", sa.Float(), nullable=True),
+    sa.Column("total_reviews", sa.Integer(), nullable=True),
+    sa.Column("is_verified", sa.Boolean(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("whatsapp_number", sa.String(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_local_agents_id", "id"),
+)
+
+sa.Table(
+    "users",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("email", sa.String(), nullable=False),
+    sa.Column("phone", sa.String(), nullable=True),
+    sa.Column("full_name", sa.String(), nullable=False),
+    sa.Column("hashed_password", sa.String(), nullable=False),
+    sa.Column("preferred_language", sa.String(), nullable=True),
+    sa.Column("language", sa.String(), nullable=True),
+    sa.Column("state", sa.String(), nullable=True),
+    sa.Column("religion", sa.String(), nullable=True),
+    sa.Column("cultural_background", sa.String(), nullable=True),
+    sa.Column("financial_knowledge_level", sa.String(), nullable=True),
+    sa.Column("onboarding_completed", sa.Boolean(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("is_verified", sa.Boolean(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_users_email", "email", unique=True),
+    sa.Index("ix_users_id", "id"),
+    sa.Index("ix_users_phone", "phone", unique=True),
+)
+
+sa.Table(
+    "community_circles",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("name", sa.String(), nullable=False),
+    sa.Column("description", sa.Text(), nullable=True),
+    sa.Column("state", sa.String(), nullable=True),
+    sa.Column("language", sa.String(), nullable=True),
+    sa.Column("category", sa.String(), nullable=True),
+    sa.Column("member_count", sa.Integer(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("created_by", sa.Integer(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_community_circles_id", "id"),
+)
+
+sa.Table(
+    "cultural_nudges",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("nudge_type", sa.String(), nullable=True),
+    sa.Column("title", sa.String(), nullable=False),
+    sa.Column("message", sa.Text(), nullable=True),
+    sa.Column("cultural_context", sa.String(), nullable=True),
+    sa.Column("state_specific", sa.String(), nullable=True),
+    sa.Column("language", sa.String(), nullable=True),
+    sa.Column("action_suggested", sa.String(), nullable=True),
+    sa.Column("is_read", sa.Boolean(), nullable=True),
+    sa.Column("is_acted_upon", sa.Boolean(), nullable=True),
+    sa.Column("expires_at", sa.DateTime(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_cultural_nudges_id", "id"),
+)
+
+sa.Table(
+    "financial_profiles",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("monthly_income", sa.Float(), nullable=True),
+    sa.Column("monthly_expenses", sa.Float(), nullable=True),
+    sa.Column("savings_goal", sa.Float(), nullable=True),
+    sa.Column("risk_tolerance", sa.String(), nullable=True),
+    sa.Column("investment_preferences", sa.JSON(), nullable=True),
+    sa.Column("financial_goals", sa.JSON(), nullable=True),
+    sa.Column("occupation", sa.String(), nullable=True),
+    sa.Column("family_size", sa.Integer(), nullable=True),
+    sa.Column("dependents", sa.Integer(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.UniqueConstraint("user_id"),
+    sa.Index("ix_financial_profiles_id", "id"),
+)
+
+sa.Table(
+    "financial_scores",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("overall_score", sa.Integer(), nullable=True),
+    sa.Column("savings_score", sa.Integer(), nullable=True),
+    sa.Column("spending_score", sa.Integer(), nullable=True),
+    sa.Column("learning_score", sa.Integer(), nullable=True),
+    sa.Column("community_score", sa.Integer(), nullable=True),
+    sa.Column("goal_achievement_score", sa.Integer(), nullable=True),
+    sa.Column("cultural_awareness_score", sa.Integer(), nullable=True),
+    sa.Column("calculation_date", sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_financial_scores_id", "id"),
+)
+
+sa.Table(
+    "savings_goals",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("title", sa.String(), nullable=False),
+    sa.Column("description", sa.Text(), nullable=True),
+    sa.Column("target_amount", sa.Float(), nullable=False),
+    sa.Column("current_amount", sa.Float(), nullable=True),
+    sa.Column("target_date", sa.DateTime(), nullable=True),
+    sa.Column("category", sa.String(), nullable=True),
+    sa.Column("cultural_context", sa.String(), nullable=True),
+    sa.Column("is_completed", sa.Boolean(), nullable=True),
+    sa.Column("priority", sa.String(), nullable=True),
+    sa.Column("auto_contribution", sa.Float(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_savings_goals_id", "id"),
+)
+
+sa.Table(
+    "simulation_profiles",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("monthly_income", sa.Float(), nullable=True),
+    sa.Column("monthly_expenses", sa.Float(), nullable=True),
+    sa.Column("location", sa.String(), nullable=True),
+    sa.Column("family_size", sa.Integer(), nullable=True),
+    sa.Column("dependents", sa.Integer(), nullable=True),
+    sa.Column("goal", sa.String(), nullable=True),
+    sa.Column("existing_liabilities", sa.Float(), nullable=True),
+    sa.Column("income_type", sa.String(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.UniqueConstraint("user_id"),
+    sa.Index("ix_simulation_profiles_id", "id"),
+)
+
+sa.Table(
+    "voice_interactions",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("query_text", sa.Text(), nullable=True),
+    sa.Column("query_language", sa.String(), nullable=True),
+    sa.Column("response_text", sa.Text(), nullable=True),
+    sa.Column("response_language", sa.String(), nullable=True),
+    sa.Column("intent_detected", sa.String(), nullable=True),
+    sa.Column("confidence_score", sa.Float(), nullable=True),
+    sa.Column("session_id", sa.String(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_voice_interactions_id", "id"),
+)
+
+sa.Table(
+    "community_memberships",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("circle_id", sa.Integer(), nullable=True),
+    sa.Column("role", sa.String(), nullable=True),
+    sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(["circle_id"], ["community_circles.id"]),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_community_memberships_id", "id"),
+)
+
+sa.Table(
+    "learning_content",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("title", sa.String(), nullable=False),
+    sa.Column("content", sa.Text(), nullable=True),
+    sa.Column("content_type", sa.String(), nullable=True),
+    sa.Column("language", sa.String(), nullable=True),
+    sa.Column("state_specific", sa.String(), nullable=True),
+    sa.Column("cultural_context", sa.String(), nullable=True),
+    sa.Column("circle_id", sa.Integer(), nullable=True),
+    sa.Column("created_by", sa.Integer(), nullable=True),
+    sa.Column("is_approved", sa.Boolean(), nullable=True),
+    sa.Column("view_count", sa.Integer(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["circle_id"], ["community_circles.id"]),
+    sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_learning_content_id", "id"),
+)
+
+sa.Table(
+    "peer_challenges",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("title", sa.String(), nullable=False),
+    sa.Column("description", sa.Text(), nullable=True),
+    sa.Column("challenge_type", sa.String(), nullable=True),
+    sa.Column("target_amount", sa.Float(), nullable=True),
+    sa.Column("duration_days", sa.Integer(), nullable=True),
+    sa.Column("circle_id", sa.Integer(), nullable=True),
+    sa.Column("created_by", sa.Integer(), nullable=True),
+    sa.Column("start_date", sa.DateTime(), nullable=True),
+    sa.Column("end_date", sa.DateTime(), nullable=True),
+    sa.Column("is_active", sa.Boolean(), nullable=True),
+    sa.Column("participant_count", sa.Integer(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["circle_id"], ["community_circles.id"]),
+    sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_peer_challenges_id", "id"),
+)
+
+sa.Table(
+    "savings_transactions",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("goal_id", sa.Integer(), nullable=True),
+    sa.Column("amount", sa.Float(), nullable=False),
+    sa.Column("transaction_type", sa.String(), nullable=True),
+    sa.Column("description", sa.String(), nullable=True),
+    sa.Column("transaction_date", sa.DateTime(), nullable=True),
+    sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.ForeignKeyConstraint(["goal_id"], ["savings_goals.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_savings_transactions_id", "id"),
+)
+
+sa.Table(
+    "challenge_participations",
+    metadata,
+    sa.Column("id", sa.Integer(), nullable=False),
+    sa.Column("user_id", sa.Integer(), nullable=True),
+    sa.Column("challenge_id", sa.Integer(), nullable=True),
+    sa.Column("current_progress", sa.Float(), nullable=True),
+    sa.Column("is_completed", sa.Boolean(), nullable=True),
+    sa.Column("joined_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.Column("completed_at", sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(["challenge_id"], ["peer_challenges.id"]),
+    sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+    sa.PrimaryKeyConstraint("id"),
+    sa.Index("ix_challenge_participations_id", "id"),
+)
+
+
+def upgrade() -> None:
+    metadata.create_all(op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    metadata.drop_all(op.get_bind(), checkfirst=True)
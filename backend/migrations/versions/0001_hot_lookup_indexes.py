@@ -0,0 +1,40 @@
+"""Add composite indexes for hot per-user lookups
+
+Tables created by Base.metadata.create_all already have these indexes, so
+each one is only created when missing. financial_profiles.user_id and
+simulation_profiles.user_id are covered by their unique constraints.
+
+Revision ID: 0001_hot_lookup_indexes
+Revises: 0000_baseline
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_hot_lookup_indexes"
+down_revision: Union[str, None] = "0000_baseline"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_savings_goals_user_id_created_at", "savings_goals", ["user_id", "created_at"]),
+    ("ix_savings_goals_user_id_is_completed", "savings_goals", ["user_id", "is_completed"]),
+    ("ix_voice_interactions_user_id_session_id", "voice_interactions", ["user_id", "session_id"]),
+    ("ix_financial_scores_user_id_calculation_date", "financial_scores", ["user_id", "calculation_date"]),
+    ("ix_cultural_nudges_user_id_expires_at", "cultural_nudges", ["user_id", "expires_at"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,52 @@
+"""Normalize scheme applicable states into an indexed scheme_states table
+
+scheme_states is derived from government_schemes.applicable_states, so the
+backfill rebuilds it from scratch. The table may already exist, empty, if the
+application created it with Base.metadata.create_all before this migration ran.
+
+Revision ID: 0002_scheme_states
+Revises: 0001_hot_lookup_indexes
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from models import parse_states
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_scheme_states"
+down_revision: Union[str, None] = "0001_hot_lookup_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("scheme_states"):
+        op.create_table(
+            "scheme_states",
+            sa.Column("scheme_id", sa.Integer(), sa.ForeignKey("government_schemes.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("state", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("scheme_id", "state"),
+        )
+    op.create_index("ix_scheme_states_state_scheme_id", "scheme_states", ["state", "scheme_id"], if_not_exists=True)
+
+    scheme_states = sa.table("scheme_states", sa.column("scheme_id", sa.Integer), sa.column("state", sa.String))
+    rows = bind.execute(sa.text("SELECT id, applicable_states FROM government_schemes")).fetchall()
+    op.execute(scheme_states.delete())
+    values = [
+        {"scheme_id": scheme_id, "state": state}
+        for scheme_id, applicable_states in rows
+        for state in dict.fromkeys(parse_states(applicable_states))
+    ]
+    if values:
+        op.bulk_insert(scheme_states, values)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scheme_states_state_scheme_id", table_name="scheme_states", if_exists=True)
+    op.drop_table("scheme_states")
@@ -0,0 +1,36 @@
+"""Add indexes for keyset pagination of circles and voice history
+
+Tables created by Base.metadata.create_all already have these indexes, so
+each one is only created when missing.
+
+Revision ID: 0003_pagination_indexes
+Revises: 0002_scheme_states
+Create Date: 2026-10-16 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_pagination_indexes"
+down_revision: Union[str, None] = "0002_scheme_states"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_community_circles_state_id", "community_circles", ["state", "id"]),
+    ("ix_voice_interactions_user_id_created_at", "voice_interactions", ["user_id", "created_at"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from database import Base
 from datetime import datetime
+from typing import Any, List
+import json
 
 class User(Base):
     __tablename__ = "users"
@@ -35,7 +37,7 @@ class FinancialProfile(Base):
     __tablename__ = "financial_profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True)  # the unique constraint is also the lookup index
     monthly_income = Column(Float)
     monthly_expenses = Column(Float)
     savings_goal = Column(Float)
@@ -53,6 +55,10 @@ class FinancialProfile(Base):
 
 class CommunityCircle(Base):
     __tablename__ = "community_circles"
+    __table_args__ = (
+        # Circle lists per state, newest (highest id) first
+        Index("ix_community_circles_state_id", "state", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -138,6 +144,18 @@ class ChallengeParticipation(Base):
     # Relationships
     challenge = relationship("PeerChallenge", back_populates="participations")
 
+# applicable_states marker for central schemes, which are listed for every state
+ALL_STATES = "All States"
+
+def parse_states(value: Any) -> List[str]:
+    """Normalize an applicable_states value; older rows hold it as a JSON-encoded string."""
+    while isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    return [state for state in value or [] if state]
+
 class GovernmentScheme(Base):
     __tablename__ = "government_schemes"
     
@@ -157,6 +175,27 @@ class GovernmentScheme(Base):
     official_website = Column(String)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    states = relationship("SchemeState", cascade="all, delete-orphan")
+    
+    @validates("applicable_states")
+    def sync_states(self, key, value):
+        """Keep the indexed scheme_states rows in step with applicable_states."""
+        states = list(dict.fromkeys(parse_states(value)))
+        existing = {scheme_state.state: scheme_state for scheme_state in self.states}
+        self.states = [existing.get(state) or SchemeState(state=state) for state in states]
+        return states
+
+class SchemeState(Base):
+    """One row per state a scheme applies in, so state filters are index lookups."""
+    __tablename__ = "scheme_states"
+    __table_args__ = (
+        Index("ix_scheme_states_state_scheme_id", "state", "scheme_id"),
+    )
+    
+    scheme_id = Column(Integer, ForeignKey("government_schemes.id", ondelete="CASCADE"), primary_key=True)
+    state = Column(String, primary_key=True)
 
 class LocalAgent(Base):
     __tablename__ = "local_agents"
@@ -179,6 +218,11 @@ class LocalAgent(Base):
 
 class SavingsGoal(Base):
     __tablename__ = "savings_goals"
+    __table_args__ = (
+        # Goal lists (newest first) and active-goal lookups per user
+        Index("ix_savings_goals_user_id_created_at", "user_id", "created_at"),
+        Index("ix_savings_goals_user_id_is_completed", "user_id", "is_completed"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -215,6 +259,11 @@ class SavingsTransaction(Base):
 
 class VoiceInteraction(Base):
     __tablename__ = "voice_interactions"
+    __table_args__ = (
+        Index("ix_voice_interactions_user_id_session_id", "user_id", "session_id"),
+        # Voice history (newest first) per user
+        Index("ix_voice_interactions_user_id_created_at", "user_id", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -232,6 +281,10 @@ class VoiceInteraction(Base):
 
 class FinancialScore(Base):
     __tablename__ = "financial_scores"
+    __table_args__ = (
+        # Score history per user, latest first
+        Index("ix_financial_scores_user_id_calculation_date", "user_id", "calculation_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -249,6 +302,10 @@ class FinancialScore(Base):
 
 class CulturalNudge(Base):
     __tablename__ = "cultural_nudges"
+    __table_args__ = (
+        # Unexpired nudges per user
+        Index("ix_cultural_nudges_user_id_expires_at", "user_id", "expires_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -281,7 +338,7 @@ class SimulationProfile(Base):
     __tablename__ = "simulation_profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), unique=True)
+    user_id = Column(Integer, ForeignKey("users.id"), unique=True)  # the unique constraint is also the lookup index
     monthly_income = Column(Float)
     monthly_expenses = Column(Float)
     location = Column(String)
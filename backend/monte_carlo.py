@@ -0,0 +1,174 @@
+"""
+Monte Carlo projections of SIP portfolios.
+
+The planners' portfolios are allocations over asset classes, each with an
+expected annual return. Here each class also gets an annual volatility and
+correlations with the other classes. Portfolios are rebalanced to their
+allocation every month, so a month's portfolio return is the allocation-
+weighted mix of the class returns. It is drawn from a lognormal matched to
+that mix's mean and variance. The mean corpus over all paths therefore equals
+the deterministic projection at the portfolio's expected return, and the
+spread around it comes from the classes' volatilities and correlations.
+
+Every path is advanced together: each month is a handful of array operations
+over all paths, and growth factors are drawn a year at a time. This keeps the
+working set small (one year of paths) instead of materializing the whole
+(paths x months) matrix, which is slower once it no longer fits in cache.
+"""
+
+import os
+import secrets
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Paths simulated when a request does not ask for a number, and the most it may ask for
+MONTE_CARLO_DEFAULT_PATHS = 10000
+MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", "50000"))
+
+# Annual volatility (%) of each asset class used by the simulation portfolios
+ASSET_CLASS_VOLATILITY = {
+    'fd': 0.5,
+    'ppf': 0.5,
+    'debt_funds': 4.0,
+    'equity_funds': 18.0,
+    'small_cap_funds': 26.0
+}
+DEFAULT_VOLATILITY = 18.0
+
+# Correlation between asset classes; pairs not listed are uncorrelated
+ASSET_CLASS_CORRELATION = {
+    frozenset({'equity_funds', 'small_cap_funds'}): 0.85,
+    frozenset({'equity_funds', 'debt_funds'}): 0.1,
+    frozenset({'small_cap_funds', 'debt_funds'}): 0.1,
+    frozenset({'debt_funds', 'fd'}): 0.3,
+    frozenset({'debt_funds', 'ppf'}): 0.3,
+    frozenset({'fd', 'ppf'}): 0.5
+}
+
+PERCENTILES = (10, 50, 90)
+
+def portfolio_moments(portfolio: Dict[str, Dict[str, float]]) -> Tuple[float, float]:
+    """Expected annual return and annual volatility (both fractions) of a rebalanced allocation."""
+    classes = list(portfolio)
+    weights = np.array([portfolio[name]['allocation'] / 100 for name in classes])
+    returns = np.array([portfolio[name]['return'] / 100 for name in classes])
+    volatility = np.array([ASSET_CLASS_VOLATILITY.get(name, DEFAULT_VOLATILITY) / 100 for name in classes])
+    correlation = np.array([
+        [1.0 if a == b else ASSET_CLASS_CORRELATION.get(frozenset({a, b}), 0.0) for b in classes]
+        for a in classes
+    ])
+    covariance = np.outer(volatility, volatility) * correlation
+    return float(weights @ returns), float(np.sqrt(weights @ covariance @ weights))
+
+def monthly_log_return(annual_return: float, annual_volatility: float) -> Tuple[float, float]:
+    """Mean and standard deviation of a month's log return with the given simple-return moments."""
+    monthly_mean = annual_return / 12
+    monthly_variance = annual_volatility ** 2 / 12
+    sigma_squared = np.log1p(monthly_variance / (1 + monthly_mean) ** 2)
+    return float(np.log1p(monthly_mean) - sigma_squared / 2), float(np.sqrt(sigma_squared))
+
+def resolve_paths(paths: Optional[int]) -> int:
+    """Requested path count, defaulted and capped; an even count keeps the antithetic pairs whole."""
+    paths = int(paths or MONTE_CARLO_DEFAULT_PATHS)
+    if paths < 2:
+        raise ValueError("Monte Carlo simulations need at least 2 paths")
+    paths = min(paths, MONTE_CARLO_MAX_PATHS)
+    return paths + paths % 2
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """The caller's seed, or a fresh one that is reported back so the run can be repeated."""
+    return secrets.randbits(32) if seed is None else int(seed)
+
+def simulate_sip(
+    monthly_contribution: float,
+    months: int,
+    annual_return: float,
+    annual_volatility: float,
+    initial_value: float = 0.0,
+    contribution_at_start: bool = True,
+    paths: int = MONTE_CARLO_DEFAULT_PATHS,
+    seed: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate a monthly SIP over `months` months.
+
+    Returns the final corpus of every path, shape (paths,), and the corpus at
+    the end of each whole year, shape (paths, months // 12). Contributions go
+    in at the start of each month (as in the SIP future value formula) or at
+    its end (ordinary annuity).
+    """
+    mu, sigma = monthly_log_return(annual_return, annual_volatility)
+    rng = np.random.default_rng(seed)
+    half = paths // 2
+
+    # Paths are held as antithetic pairs: path i of the second half mirrors the shocks of path i of the first
+    corpus = np.full((2, half), float(initial_value))
+    yearly = np.empty((months // 12, 2, half))
+    growth = np.empty((2, 12, half))
+    # Draw a year of growth factors at a time; the block stays in cache while its months are applied
+    for first_month in range(0, months, 12):
+        block = growth[:, :min(12, months - first_month)]
+        rng.standard_normal(out=block[0])
+        np.negative(block[0], out=block[1])
+        block *= sigma
+        block += mu
+        np.exp(block, out=block)
+        for month in range(block.shape[1]):
+            if contribution_at_start:
+                corpus += monthly_contribution
+            corpus *= block[:, month]
+            if not contribution_at_start:
+                corpus += monthly_contribution
+        if block.shape[1] == 12:
+            yearly[first_month // 12] = corpus
+    return corpus.reshape(paths), yearly.reshape(-1, paths).T
+
+def summarize(
+    final: np.ndarray,
+    yearly: np.ndarray,
+    goal_amount: float,
+    annual_volatility: float,
+    paths: int,
+    seed: int
+) -> Dict[str, object]:
+    """Percentiles, goal probability and yearly percentile bands (columnar) of a simulation."""
+    final_percentiles = np.percentile(final, PERCENTILES)
+    yearly_percentiles = np.percentile(yearly, PERCENTILES, axis=0) if yearly.shape[1] else np.empty((3, 0))
+    bands: Dict[str, List] = {"year": list(range(1, yearly.shape[1] + 1))}
+    for percentile, values in zip(PERCENTILES, yearly_percentiles):
+        bands[f"p{percentile}"] = np.round(values).astype(np.int64).tolist()
+    return {
+        "paths": paths,
+        "seed": seed,
+        "annual_volatility": round(annual_volatility * 100, 1),
+        "corpus_percentiles": {
+            f"p{percentile}": round(float(value)) for percentile, value in zip(PERCENTILES, final_percentiles)
+        },
+        "mean_corpus": round(float(final.mean())),
+        "goal_amount": round(goal_amount),
+        "probability_of_reaching_goal": round(float(np.mean(final >= goal_amount)) * 100, 1),
+        "yearly_percentiles": bands
+    }
+
+def project_sip(
+    portfolio: Dict[str, Dict[str, float]],
+    monthly_contribution: float,
+    months: int,
+    goal_amount: float,
+    initial_value: float = 0.0,
+    contribution_at_start: bool = True,
+    paths: Optional[int] = None,
+    seed: Optional[int] = None
+) -> Dict[str, object]:
+    """Simulate a SIP into `portfolio` and summarize the corpus against `goal_amount`."""
+    if months < 1:
+        raise ValueError("Monte Carlo projections need at least one month")
+    paths = resolve_paths(paths)
+    seed = resolve_seed(seed)
+    annual_return, annual_volatility = portfolio_moments(portfolio)
+    final, yearly = simulate_sip(
+        monthly_contribution, months, annual_return, annual_volatility,
+        initial_value=initial_value, contribution_at_start=contribution_at_start, paths=paths, seed=seed
+    )
+    return {"months": months, **summarize(final, yearly, goal_amount, annual_volatility, paths, seed)}
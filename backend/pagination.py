@@ -0,0 +1,101 @@
+"""
+Keyset (cursor) pagination for the list endpoints.
+
+A page is fetched with `WHERE (sort key) < (last key of the previous page)`
+instead of an OFFSET, so the database seeks straight to the page through the
+sort index and page N costs the same as page 1. The previous page's last key
+travels as an opaque cursor; clients only pass back what they were given.
+"""
+
+import base64
+import binascii
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, String, literal, tuple_
+from sqlalchemy.types import TypeDecorator
+
+# Upper bound for the `limit` query parameter of every paginated endpoint
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of a page's last row into an opaque, URL-safe cursor."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, datetime) else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """Unpack a cursor made by `encode_cursor`, checking it holds one value of each of `types`."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of values")
+        decoded = []
+        for value, expected in zip(values, types):
+            if expected is datetime:
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, expected) or isinstance(value, bool):
+                raise ValueError(f"expected {expected.__name__}")
+            decoded.append(value)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor")
+    return tuple(decoded)
+
+class CursorTimestamp(TypeDecorator):
+    """
+    Binds a cursor timestamp for comparison with a DateTime column.
+
+    SQLite compares timestamps as text, and rows filled by the `func.now()`
+    server default are stored without the microseconds SQLAlchemy would add to
+    a bound datetime. The cursor value is rendered the same way, so the row it
+    came from compares equal to it instead of sorting before it.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and dialect.name == "sqlite":
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S")
+        return value
+
+def newest_first(query, model, cursor: Optional[str], limit: int):
+    """Page `query` by `(created_at, id)`, newest first, fetching one extra row to detect a next page."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, datetime, int)
+        query = query.where(
+            tuple_(model.created_at, model.id) < tuple_(literal(created_at, CursorTimestamp()), row_id)
+        )
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+def highest_id_first(query, model, cursor: Optional[str], limit: int):
+    """Page `query` by `id`, highest first, fetching one extra row to detect a next page."""
+    if cursor:
+        (row_id,) = decode_cursor(cursor, int)
+        query = query.where(model.id < row_id)
+    return query.order_by(model.id.desc()).limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int, *key_columns: str) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by the page queries and build the cursor for the next page."""
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    last = page[-1]
+    return page, encode_cursor(*(getattr(last, column) for column in key_columns))
+
+def page_headers(path: str, next_cursor: Optional[str], **params: Any) -> Dict[str, str]:
+    """`X-Next-Cursor` and a relative `Link: rel="next"` for the page after this one, if any."""
+    if next_cursor is None:
+        return {}
+    query = urlencode({name: value for name, value in {**params, "cursor": next_cursor}.items() if value is not None})
+    return {"X-Next-Cursor": next_cursor, "Link": f'<{path}?{query}>; rel="next"'}
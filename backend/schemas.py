@@ -34,8 +34,16 @@ class UserBase(BaseModel):
     cultural_background: Optional[str] = None
     financial_knowledge_level: Optional[str] = "beginner"
 
+def normalize_email(email: str) -> str:
+    """Emails are stored and looked up lowercased, so case variants of one address collide."""
+    return email.strip().lower()
+
 class UserCreate(UserBase):
     password: str
+
+    @validator('email')
+    def lowercase_email(cls, v):
+        return normalize_email(v)
     
     @validator('password')
     def validate_password(cls, v):
@@ -59,6 +67,10 @@ class UserLogin(BaseModel):
     email: EmailStr
     password: str
 
+    @validator('email')
+    def lowercase_email(cls, v):
+        return normalize_email(v)
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -70,6 +82,7 @@ class AuthResponse(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    expires_at: Optional[int] = None  # `exp` claim, seconds since the epoch
 
 # Financial Profile schemas
 class FinancialProfileBase(BaseModel):
@@ -110,6 +123,20 @@ class VoiceResponse(BaseModel):
     intent: Optional[str] = None
     confidence: Optional[float] = None
 
+class VoiceInteractionResponse(BaseModel):
+    id: int
+    query_text: Optional[str] = None
+    query_language: Optional[str] = None
+    response_text: Optional[str] = None
+    response_language: Optional[str] = None
+    intent_detected: Optional[str] = None
+    confidence_score: Optional[float] = None
+    session_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Community schemas
 class CommunityCircleBase(BaseModel):
     name: str
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the authenticated-principal cache in get_current_user, the
+verified-token cache in verify_token and password hashing off the event loop
+"""
+
+import os
+import tempfile
+
+# Importing main binds the database engines; keep them off the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fintwin_auth_'), 'auth.db')}")
+
+import pickle
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from passlib.context import CryptContext
+
+import auth
+import main
+from auth import PRINCIPALS, UserSnapshot, create_access_token, token_cache, verify_token
+from cache import ResponseCache, response_cache
+from database import SessionLocal
+from models import User
+
+
+@pytest.fixture
+def headers(client, request):
+    email = f"{request.node.name[:40]}@fintwin.com"
+    response = client.post("/auth/register", json={"email": email, "full_name": "Principal", "password": "principal-pw"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_repeat_requests_skip_the_user_lookup(client, headers):
+    first = client.get("/users/me", headers=headers)
+    second = client.get("/users/me", headers=headers)
+    assert first.json() == second.json()
+    assert first.headers["X-DB-Queries"] == "1"
+    assert second.headers["X-DB-Queries"] == "0"
+
+
+def test_profile_writes_invalidate_the_principal(client, headers):
+    assert client.get("/users/me", headers=headers).json()["state"] is None
+
+    client.put("/auth/profile", json={"culturalProfile": {"state": "Goa"}}, headers=headers)
+    assert client.get("/users/me", headers=headers).json()["state"] == "Goa"
+
+    client.put("/users/knowledge-level", json={"knowledge_level": "expert"}, headers=headers)
+    assert client.get("/users/me", headers=headers).json()["financial_knowledge_level"] == "expert"
+
+
+def test_principals_are_keyed_by_token_expiry(client, headers):
+    email = client.get("/users/me", headers=headers).json()["email"]
+    other_token = create_access_token({"sub": email}, expires_delta=timedelta(minutes=5))
+    response = client.get("/users/me", headers={"Authorization": f"Bearer {other_token}"})
+    assert response.json()["email"] == email
+    assert response.headers["X-DB-Queries"] == "1"
+
+
+def test_cache_can_be_disabled(client, headers, monkeypatch):
+    monkeypatch.setattr(auth, "PRINCIPAL_CACHE_TTL", 0)
+    client.get("/users/me", headers=headers)
+    assert client.get("/users/me", headers=headers).headers["X-DB-Queries"] == "1"
+
+
+def test_unknown_users_are_not_cached(client):
+    token = create_access_token({"sub": "nobody@fintwin.com"}, expires_delta=timedelta(minutes=5))
+    for _ in range(2):
+        assert client.get("/users/me", headers={"Authorization": f"Bearer {token}"}).status_code == 401
+    assert all(key[0] != "nobody@fintwin.com" for namespace, key in list(response_cache._entries) if namespace == PRINCIPALS)
+
+
+def test_snapshot_is_read_only_and_picklable():
+    snapshot = UserSnapshot(User(id=7, email="snap@fintwin.com", full_name="Snap", hashed_password="secret"))
+    with pytest.raises(AttributeError):
+        snapshot.state = "Kerala"
+    with pytest.raises(AttributeError):
+        snapshot.hashed_password
+    restored = pickle.loads(pickle.dumps(snapshot))
+    assert (restored.id, restored.email, restored.full_name) == (7, "snap@fintwin.com", "Snap")
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    """Count calls to jwt.decode made by verify_token."""
+    calls = []
+    decode = auth.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth.jwt, "decode", counting_decode)
+    return calls
+
+
+def test_verified_tokens_skip_the_decode(decodes):
+    token = create_access_token({"sub": "cached@fintwin.com"}, expires_delta=timedelta(minutes=5))
+    first, second = verify_token(token), verify_token(token)
+    assert first == second and first.email == "cached@fintwin.com"
+    assert len(decodes) == 1
+    # The raw token is never used as a cache key
+    assert all(key != token for _, key in list(token_cache._entries))
+
+
+def test_expired_tokens_are_not_served_from_the_cache(decodes):
+    token = create_access_token({"sub": "expiring@fintwin.com"}, expires_delta=timedelta(seconds=1))
+    assert verify_token(token) is not None
+    time.sleep(2)
+    assert verify_token(token) is None
+    assert len(decodes) == 2
+
+
+def test_invalid_tokens_are_not_cached(decodes):
+    for _ in range(2):
+        assert verify_token("not-a-jwt") is None
+    assert len(decodes) == 2
+
+
+def test_token_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(auth, "token_cache", ResponseCache(max_entries=3, max_bytes=3 * 1024, default_ttl=60))
+    for i in range(10):
+        verify_token(create_access_token({"sub": f"bounded{i}@fintwin.com"}, expires_delta=timedelta(minutes=5)))
+    assert len(auth.token_cache._entries) == 3
+
+
+def test_token_cache_can_be_disabled(decodes, monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_CACHE_SIZE", 0)
+    token = create_access_token({"sub": "uncached@fintwin.com"}, expires_delta=timedelta(minutes=5))
+    verify_token(token)
+    verify_token(token)
+    assert len(decodes) == 2
+
+
+def stored_hash(email):
+    with SessionLocal() as db:
+        return db.query(User.hashed_password).filter(User.email == email).scalar()
+
+
+def test_passwords_are_hashed_on_the_bcrypt_pool(client, monkeypatch):
+    threads = []
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+
+    def recording_hash(password):
+        threads.append(threading.current_thread().name)
+        return context.hash(password)
+
+    monkeypatch.setattr(auth.pwd_context, "hash", recording_hash)
+    response = client.post("/auth/register", json={"email": "pool@fintwin.com", "full_name": "Pool", "password": "pool-password"})
+    assert response.status_code == 200, response.text
+    assert len(threads) == 1 and threads[0].startswith("bcrypt")
+
+
+def test_login_rehashes_when_the_cost_changes(client, monkeypatch):
+    credentials = {"email": "rehash@fintwin.com", "password": "rehash-pw"}
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4))
+    client.post("/auth/register", json={**credentials, "full_name": "Rehash"})
+    assert stored_hash(credentials["email"]).startswith("$2b$04$")
+
+    monkeypatch.setattr(auth, "pwd_context", CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5))
+    assert client.post("/auth/login", json=credentials).status_code == 200
+    rehashed = stored_hash(credentials["email"])
+    assert rehashed.startswith("$2b$05$")
+
+    # Already at the configured cost: the hash is left alone
+    assert client.post("/auth/login", json=credentials).status_code == 200
+    assert stored_hash(credentials["email"]) == rehashed
+    assert client.post("/auth/login", json={**credentials, "password": "wrong-password"}).status_code == 401
+
+
+def test_admin_endpoints_need_a_verified_configured_account(client, monkeypatch):
+    credentials = {"email": "ops@fintwin.com", "password": "ops-password"}
+    response = client.post("/auth/register", json={**credentials, "full_name": "Ops"})
+    assert response.status_code == 200, response.text
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    # Case variants are the same account, both when registering and when logging in
+    variant = {**credentials, "email": "OPS@FinTwin.com"}
+    assert client.post("/auth/register", json={**variant, "full_name": "Impostor"}).status_code == 400
+    assert client.post("/auth/login", json=variant).json()["user"]["email"] == "ops@fintwin.com"
+
+    # No admins unless configured, and only once the account is verified
+    assert client.get("/admin/cache/stats", headers=headers).status_code == 403
+    monkeypatch.setattr(auth, "ADMIN_EMAILS", {"ops@fintwin.com"})
+    assert client.get("/admin/cache/stats", headers=headers).status_code == 403
+
+    with SessionLocal() as db:
+        db.query(User).filter(User.email == "ops@fintwin.com").update({"is_verified": True})
+        db.commit()
+    response_cache.clear()
+    assert client.get("/admin/cache/stats", headers=headers).status_code == 200
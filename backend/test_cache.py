@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Tests for the response cache used by the API endpoints
+"""
+
+import asyncio
+import gc
+
+from fastapi import BackgroundTasks, FastAPI, Request
+from fastapi.testclient import TestClient
+
+import cache
+from cache import (
+    CacheWarmup, ResponseCache, SingleFlight, SQLiteCacheBackend, SQLiteRecentWrites, cached, entity_tag, etag_matches,
+    with_headers, with_ttl
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_namespace_ttls_expire_independently():
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    store.register_namespace("dashboard", 120)
+    store.register_namespace("government_schemes", 900)
+
+    store.set("dashboard", 1, {"financial_score": 700})
+    store.set("government_schemes", "all", ["PMJDY"])
+
+    clock.now += 121
+    assert store.get("dashboard", 1) is None
+    assert store.get("government_schemes", "all") == ["PMJDY"]
+
+    clock.now += 780
+    assert store.get("government_schemes", "all") is None
+    assert len(store) == 0
+    assert store.size_bytes == 0
+
+
+def test_lru_eviction_respects_entry_limit():
+    store = ResponseCache(max_entries=3)
+    for user_id in range(3):
+        store.set("savings_goals", user_id, [])
+
+    # Touch user 0 so user 1 becomes the least recently used entry
+    assert store.get("savings_goals", 0) == []
+    store.set("savings_goals", 3, [])
+
+    assert len(store) == 3
+    assert ("savings_goals", 1) not in store
+    assert ("savings_goals", 0) in store
+
+
+def test_byte_budget_evicts_oldest_entries():
+    store = ResponseCache(max_entries=1000, max_bytes=2000)
+    for user_id in range(20):
+        store.set("dashboard", user_id, "x" * 400)
+
+    assert store.size_bytes <= 2000
+    assert ("dashboard", 19) in store
+    assert ("dashboard", 0) not in store
+
+    # A single value larger than the whole budget is never stored
+    store.set("dashboard", "huge", "x" * 5000)
+    assert ("dashboard", "huge") not in store
+
+
+def test_cached_decorator_reuses_result_and_honours_ttl_override():
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    calls = []
+
+    @cached("financial_score", ttl=300, key=lambda user_id, **_: user_id, cache=store)
+    async def get_score(user_id: int, fail: bool = False):
+        calls.append(user_id)
+        if fail:
+            return with_ttl({"score": 500}, 30)
+        return {"score": 720}
+
+    assert asyncio.run(get_score(user_id=1)) == {"score": 720}
+    assert asyncio.run(get_score(user_id=1)) == {"score": 720}
+    assert calls == [1]
+
+    assert asyncio.run(get_score(user_id=2, fail=True)) == {"score": 500}
+    clock.now += 31
+    asyncio.run(get_score(user_id=2, fail=True))
+    assert calls == [1, 2, 2]
+
+    # Empty results are cached like any other value
+    @cached("savings_goals", key=lambda user_id, **_: user_id, cache=store)
+    async def get_goals(user_id: int):
+        calls.append(("goals", user_id))
+        return []
+
+    asyncio.run(get_goals(user_id=3))
+    asyncio.run(get_goals(user_id=3))
+    assert calls.count(("goals", 3)) == 1
+
+
+def test_invalidate_tags_drops_only_dependent_entries():
+    store = ResponseCache()
+    store.set("savings_goals", 1, [], tags=[entity_tag("goals", 1)])
+    store.set("dashboard", 1, {}, tags=[entity_tag("user", 1), entity_tag("goals", 1)])
+    store.set("user_profile", 1, {}, tags=[entity_tag("user", 1)])
+    store.set("dashboard", 2, {}, tags=[entity_tag("user", 2), entity_tag("goals", 2)])
+
+    assert store.invalidate_tags(entity_tag("goals", 1)) == 2
+
+    assert ("savings_goals", 1) not in store
+    assert ("dashboard", 1) not in store
+    assert ("user_profile", 1) in store
+    assert ("dashboard", 2) in store
+    assert store.invalidate_tags(entity_tag("goals", 1)) == 0
+
+
+def test_evicted_entries_leave_no_tags_behind():
+    store = ResponseCache(max_entries=10)
+    for user_id in range(1000):
+        store.set("dashboard", user_id, {}, tags=[entity_tag("user", user_id)])
+
+    assert len(store._tag_index) == 10
+
+
+def test_values_computed_across_an_invalidation_are_not_stored():
+    store = ResponseCache()
+    goals = ["old"]
+
+    @cached("savings_goals", key=lambda user_id: user_id, tags=lambda user_id: [entity_tag("goals", user_id)], cache=store)
+    async def get_goals(user_id: int):
+        result = list(goals)
+        # A write commits and invalidates while this read is still in flight
+        goals.append("new")
+        store.invalidate_tags(entity_tag("goals", user_id))
+        return result
+
+    assert asyncio.run(get_goals(1)) == ["old"]
+    assert ("savings_goals", 1) not in store
+
+
+def test_tag_generations_are_bounded_and_still_reject_stale_values():
+    store = ResponseCache(max_entries=10)
+    tags = [entity_tag("goals", 1)]
+    versions = store.tag_versions(tags)
+    for user_id in range(1, 100):
+        store.invalidate_tags(entity_tag("goals", user_id))
+    assert len(store._tag_generations) == 10
+
+    store.set("savings_goals", 1, [], tags=tags, versions=versions)
+    assert ("savings_goals", 1) not in store
+    store.set("savings_goals", 1, [], tags=tags, versions=store.tag_versions(tags))
+    assert ("savings_goals", 1) in store
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+
+    worker_a.set("dashboard", 1, {"financial_score": 700}, tags=[entity_tag("goals", 1)])
+    assert worker_b.get("dashboard", 1) == {"financial_score": 700}
+
+    # A write handled by worker B is seen by worker A on its next read
+    worker_b.invalidate_tags(entity_tag("goals", 1))
+    assert worker_a.get("dashboard", 1) is None
+    assert len(worker_a) == 0
+
+
+def test_sqlite_backend_rejects_values_computed_across_an_invalidation(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker_a = SQLiteCacheBackend(path)
+    worker_b = SQLiteCacheBackend(path)
+    tags = [entity_tag("goals", 1)]
+
+    # Worker A starts computing, worker B commits a write, then A stores its stale result
+    versions = worker_a.tag_versions(tags)
+    worker_b.invalidate_tags(*tags)
+    worker_a.set("savings_goals", 1, [], tags=tags, versions=versions)
+
+    assert worker_b.get("savings_goals", 1) is None
+
+
+def test_sqlite_backend_respects_limits(tmp_path):
+    store = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=50)
+    for user_id in range(200):
+        store.set("dashboard", user_id, {"financial_score": user_id}, tags=[entity_tag("user", user_id)])
+
+    assert len(store) == 50
+    assert store.get("dashboard", 199) == {"financial_score": 199}
+
+
+def test_sqlite_recent_writes_are_shared_and_survive_cache_eviction(tmp_path):
+    path = str(tmp_path / "cache.db")
+    clock = FakeClock()
+    worker_a = SQLiteRecentWrites(5, path, clock=clock)
+    worker_b = SQLiteRecentWrites(5, path, clock=clock)
+    store = SQLiteCacheBackend(path, max_entries=1)
+
+    worker_a.mark(7)
+    for i in range(10):
+        store.set("catalog", i, i)
+    assert 7 in worker_b and 8 not in worker_b
+    clock.now += 5
+    assert 7 not in worker_b
+
+
+def test_concurrent_misses_share_one_computation():
+    store = ResponseCache()
+    flight = SingleFlight()
+    calls = []
+
+    @cached("level_content", key=lambda user_id, **_: user_id, cache=store, flight=flight)
+    async def get_level_content(user_id: int):
+        calls.append(user_id)
+        await asyncio.sleep(0.05)
+        return {"level": "beginner", "user": user_id}
+
+    async def storm():
+        return await asyncio.gather(*(get_level_content(user_id=7) for _ in range(20)))
+
+    results = asyncio.run(storm())
+    assert calls == [7]
+    assert all(result == {"level": "beginner", "user": 7} for result in results)
+    assert flight.stats()["level_content"]["suppressed"] == 19
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("Gemini unavailable")
+
+    async def storm():
+        return await asyncio.gather(
+            *(flight.run("dashboard", 1, failing) for _ in range(5)), return_exceptions=True
+        )
+
+    results = asyncio.run(storm())
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()["dashboard"]["errors"] == 1
+
+
+def test_single_flight_waiters_compute_directly_after_timeout():
+    flight = SingleFlight(timeout=0.01)
+
+    async def slow():
+        await asyncio.sleep(0.1)
+        return "leader"
+
+    async def fast():
+        return "waiter"
+
+    async def scenario():
+        leader = asyncio.create_task(flight.run("dashboard", 1, slow))
+        await asyncio.sleep(0)
+        waiter = await flight.run("dashboard", 1, fast)
+        return await leader, waiter
+
+    assert asyncio.run(scenario()) == ("leader", "waiter")
+    assert flight.stats()["dashboard"]["timeouts"] == 1
+
+
+def test_stale_entries_are_served_immediately_and_refreshed_in_background():
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    scores = iter([700, 710])
+
+    @cached("financial_score", ttl=60, stale_ttl=600, key=lambda user_id, **_: user_id, cache=store)
+    async def get_score(user_id: int):
+        await asyncio.sleep(0.05)  # slow score calculation
+        return {"score": next(scores)}
+
+    async def scenario():
+        assert await get_score(user_id=1) == {"score": 700}
+        clock.now += 61
+
+        # Past the soft TTL the stale value comes back without waiting for a recompute
+        stale = await asyncio.wait_for(get_score(user_id=1), 0.01)
+        await asyncio.sleep(0.1)
+        return stale, await asyncio.wait_for(get_score(user_id=1), 0.01)
+
+    assert asyncio.run(scenario()) == ({"score": 700}, {"score": 710})
+
+    # Past the hard TTL the entry is gone
+    clock.now += 661
+    assert store.get("financial_score", 1) is None
+    assert len(store) == 0
+
+
+def test_stale_refresh_is_added_to_request_background_tasks():
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    calls = []
+
+    @cached("dashboard", ttl=60, stale_ttl=600, key=lambda user_id, **_: user_id, cache=store)
+    async def get_dashboard(background_tasks: BackgroundTasks, user_id: int):
+        calls.append(user_id)
+        return {"financial_score": len(calls)}
+
+    async def scenario():
+        await get_dashboard(background_tasks=BackgroundTasks(), user_id=1)
+        clock.now += 61
+        tasks = BackgroundTasks()
+        stale = await get_dashboard(background_tasks=tasks, user_id=1)
+        assert calls == [1]
+        await tasks()
+        return stale, await get_dashboard(background_tasks=BackgroundTasks(), user_id=1)
+
+    assert asyncio.run(scenario()) == ({"financial_score": 1}, {"financial_score": 2})
+
+
+def test_empty_results_use_their_own_ttl():
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    calls = []
+
+    @cached("community_circles", ttl=600, empty_ttl=120, key=lambda state, **_: state, cache=store)
+    async def get_circles(state: str):
+        calls.append(state)
+        return [] if state == "Goa" else ["Mahila Bachat Circle"]
+
+    for _ in range(3):
+        asyncio.run(get_circles(state="Goa"))
+        asyncio.run(get_circles(state="Kerala"))
+    assert calls == ["Goa", "Kerala"]
+
+    clock.now += 121
+    asyncio.run(get_circles(state="Goa"))
+    asyncio.run(get_circles(state="Kerala"))
+    assert calls == ["Goa", "Kerala", "Goa"]
+
+
+def test_conditional_requests_get_304_with_caching_headers():
+    app = FastAPI()
+    store = ResponseCache()
+    calls = []
+
+    @app.get("/schemes")
+    @cached(
+        "government_schemes", key=lambda state=None, **_: state or "all", cache=store,
+        cache_control="private, max-age=300", vary="Authorization"
+    )
+    async def get_schemes(request: Request, state: str = None):
+        calls.append(state)
+        return [{"name": "Pradhan Mantri Jan Dhan Yojana", "state": state}]
+
+    client = TestClient(app)
+    first = client.get("/schemes", params={"state": "Kerala"})
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "private, max-age=300"
+    assert first.headers["vary"] == "Authorization"
+
+    revalidated = client.get("/schemes", params={"state": "Kerala"}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+
+    # A different payload has a different ETag, so the old one does not match
+    other = client.get("/schemes", params={"state": "Goa"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+    assert other.headers["etag"] != etag
+    assert calls == ["Kerala", "Goa"]
+
+
+def test_stored_headers_are_sent_on_hits_and_revalidation():
+    app = FastAPI()
+    store = ResponseCache()
+    calls = []
+
+    @app.get("/circles")
+    @cached("community_circles", key=lambda cursor=None, **_: cursor, cache=store, serialize=True)
+    async def get_circles(request: Request, cursor: str = None):
+        calls.append(cursor)
+        return with_headers([{"id": 3}, {"id": 2}], {"X-Next-Cursor": "c2"})
+
+    client = TestClient(app)
+    first = client.get("/circles")
+    hit = client.get("/circles")
+    assert first.json() == hit.json() == [{"id": 3}, {"id": 2}]
+    assert first.headers["x-next-cursor"] == hit.headers["x-next-cursor"] == "c2"
+    revalidated = client.get("/circles", headers={"If-None-Match": first.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["x-next-cursor"] == "c2"
+    assert calls == [None]
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    assert etag_matches('W/"abc"', 'W/"abc"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches('"xyz", W/"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches('W/"xyz"', 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
+
+
+def test_stats_report_hits_misses_evictions_and_usage_per_namespace():
+    store = ResponseCache(max_entries=3)
+
+    @cached("government_schemes", ttl=900, key=lambda state: state, cache=store, flight=SingleFlight())
+    async def get_schemes(state):
+        return [state]
+
+    for state in ("Kerala", "Kerala", "Kerala", "Goa"):
+        asyncio.run(get_schemes(state=state))
+    store.set("dashboard", 1, {"score": 700}, tags=[entity_tag("user", 1)])
+    store.set("dashboard", 2, {"score": 650})
+    store.invalidate_tags(entity_tag("user", 1))
+    store.set("dashboard", 3, {"score": 600})
+    store.set("dashboard", 4, {"score": 550})
+
+    report = store.report()
+    schemes, dashboard = report["namespaces"]["government_schemes"], report["namespaces"]["dashboard"]
+    assert (schemes["hits"], schemes["misses"], schemes["hit_ratio"]) == (2, 2, 0.5)
+    assert schemes["avg_miss_ms"] is not None
+    assert (schemes["evictions"], schemes["entries"]) == (2, 0)
+    assert (dashboard["invalidations"], dashboard["entries"], dashboard["hit_ratio"]) == (1, 3, None)
+    assert report["entries"] == 3
+    assert sum(ns["approx_bytes"] for ns in report["namespaces"].values()) == report["approx_bytes"]
+
+    store.stats.reset()
+    assert store.report()["namespaces"]["dashboard"]["invalidations"] == 0
+
+
+def test_sqlite_backend_reports_usage_per_namespace(tmp_path):
+    store = SQLiteCacheBackend(path=str(tmp_path / "cache.db"), max_entries=2)
+    store.set("government_schemes", "Kerala", ["PMJDY"])
+    store.set("community_circles", "all", [])
+    store.set("community_circles", "Goa", [])
+
+    namespaces = store.report()["namespaces"]
+    assert (namespaces["government_schemes"]["entries"], namespaces["government_schemes"]["evictions"]) == (0, 1)
+    assert namespaces["community_circles"]["entries"] == 2
+    assert namespaces["community_circles"]["approx_bytes"] > 0
+
+
+def test_snapshot_restores_entries_with_remaining_lifetimes(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.snapshot")
+    clock = FakeClock()
+    store = ResponseCache(clock=clock)
+    store.set("government_schemes", "Kerala", ["PMJDY"], ttl=900)
+    store.set("dashboard", 1, {"financial_score": 700}, ttl=60, tags=[entity_tag("user", 1)], stale_ttl=600)
+    store.set("community_circles", "all", [], ttl=10)
+    clock.now += 30
+    monkeypatch.setattr(cache.time, "time", lambda: 5000.0)
+    assert store.save_snapshot(path) == 2
+
+    # Restarted 100 seconds later: the dashboard entry is now stale but still servable
+    monkeypatch.setattr(cache.time, "time", lambda: 5100.0)
+    restored_clock = FakeClock()
+    restored = ResponseCache(clock=restored_clock)
+    assert restored.load_snapshot(path) == 2
+    assert restored.get("government_schemes", "Kerala") == ["PMJDY"]
+    assert restored.lookup("dashboard", 1) == ({"financial_score": 700}, True)
+    assert restored.invalidate_tags(entity_tag("user", 1)) == 1
+
+    restored_clock.now += 771
+    assert restored.get("government_schemes", "Kerala") is None
+    assert restored.load_snapshot(str(tmp_path / "missing")) == 0
+
+
+def test_warmup_tracks_progress_and_survives_failing_jobs():
+    warmup = CacheWarmup()
+    assert warmup.status()["status"] == "pending"
+    warmed = []
+
+    async def warm():
+        warmed.append("schemes")
+
+    async def broken():
+        raise RuntimeError("database unavailable")
+
+    asyncio.run(warmup.run([("schemes", warm), ("circles", broken), ("questions", warm)]))
+    status = warmup.status()
+    assert warmup.ready
+    assert (status["status"], status["completed"], status["failed"], status["total"]) == ("ready", 3, 1, 3)
+    assert warmed == ["schemes", "schemes"]
+
+
+def test_memory_stays_flat_for_a_million_users():
+    store = ResponseCache(max_entries=5000, max_bytes=4 * 1024 * 1024)
+    payload = '{"financial_score": 700, "monthly_summary": {"savings": 15000}}'
+
+    for user_id in range(50_000):
+        store.set("dashboard", user_id, payload)
+    gc.collect()
+    warm_objects = len(gc.get_objects())
+
+    for user_id in range(50_000, 1_000_000):
+        store.set("dashboard", user_id, payload)
+    gc.collect()
+    final_objects = len(gc.get_objects())
+
+    assert len(store) == 5000
+    assert store.size_bytes <= 4 * 1024 * 1024
+    # Once the cache is full, another 950k distinct users must not grow the heap
+    assert final_objects - warm_objects < 100
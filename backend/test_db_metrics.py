@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-request SQL instrumentation
+"""
+
+import asyncio
+import os
+import tempfile
+
+# The route-label test imports main, which binds the database engines; keep them off the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fintwin_metrics_'), 'metrics.db')}")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from db_metrics import DBMetrics, QueryTracker, db_metrics, instrument_engine, start_tracking, stop_tracking
+
+
+def test_statements_are_counted_only_while_tracking():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    instrument_engine(engine)  # attaching twice must not double count
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        tracker, token = start_tracking()
+        try:
+            for user_id in range(4):
+                conn.execute(text("SELECT :user_id"), {"user_id": user_id})
+            conn.execute(text("SELECT 2"))
+        finally:
+            stop_tracking(token)
+        conn.execute(text("SELECT 3"))
+
+    assert tracker.queries == 5
+    assert tracker.seconds > 0
+    assert tracker.repeated(threshold=3) == [("SELECT ?", 4)]
+    assert tracker.repeated(threshold=5) == []
+
+
+def test_failed_statement_does_not_skew_timing():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    tracker, token = start_tracking()
+    try:
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                pass
+            assert not conn.info.get("query_start_time")
+            conn.execute(text("SELECT 1"))
+    finally:
+        stop_tracking(token)
+    assert tracker.queries == 1
+
+
+def test_async_engine_statements_reach_the_request_tracker():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    instrument_engine(engine)
+
+    async def run():
+        tracker, token = start_tracking()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.execute(text("SELECT 2"))
+        finally:
+            stop_tracking(token)
+        await engine.dispose()
+        return tracker
+
+    assert asyncio.run(run()).queries == 2
+
+
+def test_threadpool_endpoints_share_the_middleware_tracker():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    app = FastAPI()
+    counts = []
+
+    @app.middleware("http")
+    async def track(request, call_next):
+        tracker, token = start_tracking()
+        try:
+            response = await call_next(request)
+        finally:
+            stop_tracking(token)
+        counts.append(tracker.queries)
+        return response
+
+    @app.get("/sync")
+    def sync_endpoint():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {}
+
+    client = TestClient(app)
+    client.get("/sync")
+    client.get("/sync")
+    assert counts == [2, 2]
+
+
+def test_registry_aggregates_routes_and_keeps_suspects():
+    metrics = DBMetrics()
+    light = QueryTracker()
+    light.record("SELECT users", 0.001)
+    heavy = QueryTracker()
+    heavy.record("SELECT users", 0.001)
+    for _ in range(5):
+        heavy.record("SELECT goals WHERE id = ?", 0.002)
+
+    metrics.record("GET /dashboard/", light)
+    metrics.record("GET /dashboard/", heavy)
+    route = metrics.report()["routes"]["GET /dashboard/"]
+
+    assert route["requests"] == 2
+    assert route["queries"] == 7
+    assert route["avg_queries"] == 3.5
+    assert route["max_queries"] == 6
+    assert route["max_db_ms"] == 11.0
+    assert route["n_plus_one_requests"] == 1
+    assert route["n_plus_one_suspects"] == [{"statement": "SELECT goals WHERE id = ?", "max_repeats": 5}]
+
+    metrics.reset()
+    assert metrics.report()["routes"] == {}
+
+
+def test_requests_are_labelled_by_their_route_template(client):
+    db_metrics.reset()
+    for user_id in (1, 2):
+        client.get(f"/users/{user_id}/financial-profile")
+    client.get("/no-such-page")
+
+    assert set(db_metrics.report()["routes"]) == {
+        "GET /users/{user_id}/financial-profile", "GET <unmatched>"
+    }
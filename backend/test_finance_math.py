@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Property tests for the vectorized finance formulas against scalar references
+"""
+
+from decimal import Decimal, localcontext
+
+import numpy as np
+import pytest
+
+from finance_math import amortization, emi, fv_sip, monthly_rate, nper, pv_annuity, rate, sip_for_goal
+
+SEEDS = range(5)
+SAMPLES = 2000
+
+
+def draws(seed):
+    """Random loans and SIPs, including zero and near-zero rates."""
+    rng = np.random.default_rng(seed)
+    amount = rng.uniform(1_000, 10_000_000, SAMPLES)
+    rates = rng.uniform(0, 0.03, SAMPLES)
+    rates[:50] = 0
+    rates[50:100] = rng.uniform(0, 1e-9, 50)
+    periods = rng.integers(1, 481, SAMPLES)
+    return amount, rates, periods
+
+
+def scalar_emi(principal, r, n):
+    """The textbook formula, evaluated in 40-digit decimals so near-zero rates do not cancel."""
+    if r == 0:
+        return principal / n
+    with localcontext() as context:
+        context.prec = 40
+        principal, r, n = Decimal(principal), Decimal(r), int(n)
+        growth = (1 + r) ** n
+        return float(principal * r * growth / (growth - 1))
+
+
+def scalar_fv_sip(payment, r, n, due):
+    balance = 0.0
+    for _ in range(n):
+        balance = (balance + payment) * (1 + r) if due else balance * (1 + r) + payment
+    return balance
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_emi_matches_the_scalar_formula(seed):
+    principal, rates, periods = draws(seed)
+    expected = [scalar_emi(p, r, n) for p, r, n in zip(principal, rates, periods)]
+    assert emi(principal, rates, periods) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("due", [True, False])
+def test_fv_sip_matches_month_by_month_accumulation(seed, due):
+    payment, rates, periods = draws(seed)
+    payment, rates, periods = payment[:200] / 100, rates[:200], periods[:200]
+    expected = [scalar_fv_sip(p, r, int(n), due) for p, r, n in zip(payment, rates, periods)]
+    assert fv_sip(payment, rates, periods, due=due) == pytest.approx(expected, rel=1e-9)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_formulas_invert_each_other(seed):
+    principal, rates, periods = draws(seed)
+    payment = emi(principal, rates, periods)
+
+    assert pv_annuity(payment, rates, periods) == pytest.approx(principal, rel=1e-9)
+    assert nper(rates, payment, -principal) == pytest.approx(periods, rel=1e-9)
+    assert rate(periods, payment, -principal) == pytest.approx(rates, abs=1e-12)
+
+    goal = fv_sip(principal / 100, rates, periods)
+    assert sip_for_goal(goal, rates, periods) == pytest.approx(principal / 100, rel=1e-9)
+    assert nper(rates, principal / 100, 0, fv_sip(principal / 100, rates, periods, due=False)) == pytest.approx(periods, rel=1e-9)
+
+
+def test_zero_rate_and_degenerate_inputs():
+    assert emi(120000, 0, 12) == 10000
+    assert fv_sip(1000, 0, 12) == fv_sip(1000, 0, 12, due=False) == 12000
+    assert pv_annuity(1000, 0, 12) == 12000
+    assert sip_for_goal(12000, 0, 12) == 1000
+    assert nper(0, 1000, 0, 12000) == 12
+    # Never repaid: the payment does not even cover the interest
+    assert nper(0.01, 500, -100000) == np.inf
+    assert np.isinf(emi(100000, 0.01, 0))
+    assert monthly_rate(12) == 0.01
+
+
+def test_functions_broadcast():
+    tenures, rates = np.array([12, 24, 36])[:, None], np.array([0.0, 0.01])
+    assert emi(100000, rates, tenures).shape == (3, 2)
+    assert fv_sip(np.array([1000, 2000]), 0.01, tenures).shape == (3, 2)
+    assert np.shape(emi(100000, 0.01, 12)) == ()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_amortization_matches_a_running_balance(seed):
+    principal, rates, periods = (values[:20] for values in draws(seed))
+    schedule = amortization(principal, rates, periods)
+    longest = int(periods.max())
+    assert schedule.period.tolist() == list(range(1, longest + 1))
+
+    for i, (p, r, n) in enumerate(zip(principal, rates, periods)):
+        payment, balance = scalar_emi(p, r, n), p
+        for month in range(longest):
+            if month < n:
+                interest = balance * r
+                balance -= payment - interest
+                assert schedule.interest[i, month] == pytest.approx(interest, rel=1e-6, abs=1e-6)
+                assert schedule.balance[i, month] == pytest.approx(max(balance, 0), rel=1e-6, abs=1e-4)
+            else:
+                assert schedule.payment[i, month] == schedule.balance[i, month] == 0
+
+    assert schedule.principal.sum(axis=1) == pytest.approx(principal, rel=1e-12)
+    assert (schedule.payment - schedule.interest - schedule.principal) == pytest.approx(0, abs=1e-6)
+    assert schedule.interest.sum(axis=1) == pytest.approx(emi(principal, rates, periods) * periods - principal, rel=1e-9, abs=1e-6)
+
+
+def test_amortization_windows_concatenate_to_the_full_schedule():
+    principal, rates, periods = np.array([250000, 90000]), np.array([0.008, 0]), np.array([240, 36])
+    full = amortization(principal, rates, periods)
+    windows = [amortization(principal, rates, periods, start=start, stop=min(start + 50, 240)) for start in range(0, 240, 50)]
+    for field in ("payment", "interest", "principal", "balance"):
+        joined = np.concatenate([getattr(window, field) for window in windows], axis=1)
+        assert joined == pytest.approx(getattr(full, field), rel=1e-12, abs=1e-9)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Tests for the Monte Carlo SIP projections
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from monte_carlo import portfolio_moments, project_sip, resolve_paths, simulate_sip
+
+MODERATE = {
+    'equity_funds': {'allocation': 50, 'return': 12},
+    'debt_funds': {'allocation': 30, 'return': 7.5},
+    'fd': {'allocation': 20, 'return': 6.5}
+}
+
+
+def sip_future_value(contribution, months, annual_return, at_start):
+    rate = annual_return / 12
+    value = contribution * ((1 + rate) ** months - 1) / rate
+    return value * (1 + rate) if at_start else value
+
+
+@pytest.mark.parametrize("months", [1, 12, 61, 360])
+@pytest.mark.parametrize("at_start", [True, False])
+def test_without_volatility_every_path_is_the_formula(months, at_start):
+    final, yearly = simulate_sip(2500, months, 0.12, 0.0, initial_value=10000, contribution_at_start=at_start, paths=4, seed=1)
+    expected = sip_future_value(2500, months, 0.12, at_start) + 10000 * 1.01 ** months
+    assert final == pytest.approx(np.full(4, expected), rel=1e-12)
+    assert yearly.shape == (4, months // 12)
+    if months >= 12:
+        assert yearly[0, 0] == pytest.approx(sip_future_value(2500, 12, 0.12, at_start) + 10000 * 1.01 ** 12, rel=1e-12)
+
+
+def test_mean_corpus_matches_the_expected_return():
+    annual_return, annual_volatility = portfolio_moments(MODERATE)
+    assert annual_return == pytest.approx(0.0955)
+    assert 0.05 < annual_volatility < 0.12
+
+    final, _ = simulate_sip(2000, 120, annual_return, annual_volatility, paths=50000, seed=11)
+    assert final.mean() == pytest.approx(sip_future_value(2000, 120, annual_return, True), rel=0.01)
+
+
+def test_projections_are_reproducible_by_seed():
+    first = project_sip(MODERATE, 5000, 240, goal_amount=4_000_000, seed=42)
+    assert project_sip(MODERATE, 5000, 240, goal_amount=4_000_000, seed=42) == first
+    assert project_sip(MODERATE, 5000, 240, goal_amount=4_000_000, seed=43) != first
+
+    percentiles = first["corpus_percentiles"]
+    assert percentiles["p10"] < percentiles["p50"] < percentiles["p90"]
+    assert 0 < first["probability_of_reaching_goal"] < 100
+    assert first["yearly_percentiles"]["year"] == list(range(1, 21))
+    assert all(len(first["yearly_percentiles"][band]) == 20 for band in ("p10", "p50", "p90"))
+
+
+def test_path_counts_are_bounded():
+    assert resolve_paths(None) == 10000
+    assert resolve_paths(1001) == 1002
+    assert resolve_paths(10 ** 9) <= 50000
+    with pytest.raises(ValueError):
+        resolve_paths(1)
+
+
+def test_ten_thousand_paths_over_thirty_years_is_fast():
+    project_sip(MODERATE, 5000, 360, goal_amount=10_000_000, seed=1)
+    started = time.perf_counter()
+    project_sip(MODERATE, 5000, 360, goal_amount=10_000_000, seed=2)
+    # The budget is 100 ms; allow headroom for slow CI machines
+    assert time.perf_counter() - started < 0.5
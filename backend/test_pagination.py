@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for keyset pagination of the list endpoints
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+# Importing database binds its engines; keep them off the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fintwin_pages_'), 'pages.db')}")
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from database import Base
+from models import SavingsGoal, User
+from pagination import (
+    decode_cursor, encode_cursor, highest_id_first, newest_first, page_headers, split_page
+)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        session.execute(insert(User), [{"email": "pager@fintwin.com", "full_name": "Pager", "hashed_password": "x"}])
+        yield session
+    engine.dispose()
+
+
+def fetch_all_pages(db, query, model, paginate, limit, *key_columns):
+    """Follow next cursors from the first page to the last, returning the ids of every page."""
+    pages, cursor = [], None
+    while True:
+        rows = db.execute(paginate(query, model, cursor, limit)).scalars().all()
+        page, cursor = split_page(rows, limit, *key_columns)
+        pages.append([row.id for row in page])
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip_is_opaque_and_typed():
+    created_at = datetime(2026, 10, 16, 9, 30, 0, 125000)
+    cursor = encode_cursor(created_at, 42)
+    assert "2026" not in cursor and "=" not in cursor
+    assert decode_cursor(cursor, datetime, int) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("42"), encode_cursor(1, 2), encode_cursor(True), ""])
+def test_invalid_cursors_are_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, int)
+    assert error.value.status_code == 400
+
+
+def test_pages_with_identical_server_default_timestamps(db):
+    # Rows inserted within one second share the text timestamp written by func.now()
+    db.execute(insert(SavingsGoal), [{"user_id": 1, "title": f"Goal {i}", "target_amount": 100.0} for i in range(25)])
+    query = select(SavingsGoal).where(SavingsGoal.user_id == 1)
+
+    pages = fetch_all_pages(db, query, SavingsGoal, newest_first, 10, "created_at", "id")
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == list(range(25, 0, -1))
+
+
+def test_pages_follow_created_at_before_id(db):
+    # Explicit timestamps (stored with microseconds) out of id order, mixed with a server default
+    timestamps = [datetime(2026, 1, day, 12, 0, 0, 500) for day in (5, 1, 9, 3, 7)]
+    db.execute(insert(SavingsGoal), [
+        {"user_id": 1, "title": f"Goal {i}", "target_amount": 100.0, "created_at": created_at}
+        for i, created_at in enumerate(timestamps)
+    ])
+    db.execute(insert(SavingsGoal), [{"user_id": 1, "title": "Newest", "target_amount": 100.0}])
+    query = select(SavingsGoal).where(SavingsGoal.user_id == 1)
+
+    pages = fetch_all_pages(db, query, SavingsGoal, newest_first, 2, "created_at", "id")
+
+    assert pages == [[6, 3], [5, 1], [4, 2]]
+
+
+def test_id_pages_and_next_links(db):
+    db.execute(insert(SavingsGoal), [{"user_id": 1, "title": f"Goal {i}", "target_amount": 1.0} for i in range(7)])
+    query = select(SavingsGoal)
+
+    assert fetch_all_pages(db, query, SavingsGoal, highest_id_first, 3, "id") == [[7, 6, 5], [4, 3, 2], [1]]
+
+    rows = db.execute(highest_id_first(query, SavingsGoal, None, 3)).scalars().all()
+    _, cursor = split_page(rows, 3, "id")
+    headers = page_headers("/schemes", cursor, state="West Bengal", limit=3)
+    assert headers["X-Next-Cursor"] == cursor
+    assert headers["Link"] == f'</schemes?state=West+Bengal&limit=3&cursor={cursor}>; rel="next"'
+    assert page_headers("/schemes", None, limit=3) == {}
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression checks: runs EXPLAIN QUERY PLAN on every SELECT the
+main endpoints issue and fails on a full table scan of a user-scoped table.
+"""
+
+import os
+import re
+import sqlite3
+import tempfile
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="fintwin_plans_"), "plans.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+import pytest
+from sqlalchemy import event
+
+import main
+from cache import response_cache
+from database import SessionLocal, async_engine, async_read_engine, engine
+from models import ALL_STATES, GovernmentScheme
+
+# Tables that grow with the number of users; lookups on them must be indexed
+USER_SCOPED_TABLES = {
+    "users", "financial_profiles", "savings_goals", "savings_transactions", "simulation_profiles",
+    "voice_interactions", "financial_scores", "cultural_nudges", "community_memberships",
+    "challenge_participations",
+}
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+# (method, path, json body); "{user_id}" is filled in after registration
+ENDPOINT_CALLS = [
+    ("POST", "/auth/login", {"email": "plans@fintwin.com", "password": "plans-password"}),
+    ("GET", "/users/me", None),
+    ("GET", "/auth/me", None),
+    ("PUT", "/auth/profile", {"culturalProfile": {"state": "Kerala"}}),
+    ("POST", "/users/{user_id}/financial-profile", {"monthly_income": 50000, "monthly_expenses": 30000}),
+    ("GET", "/users/{user_id}/financial-profile", None),
+    ("POST", "/savings/goals", {"title": "Onam", "target_amount": 20000, "category": "festival"}),
+    ("GET", "/savings/goals", None),
+    ("GET", "/dashboard/", None),
+    ("GET", "/dashboard/financial-score", None),
+    ("GET", "/dashboard/cultural-nudges", None),
+    ("GET", "/schemes?state=Kerala", None),
+    ("GET", "/community/circles?state=Kerala", None),
+    ("GET", "/assessment/questions", None),
+    ("PUT", "/users/knowledge-level", {"knowledge_level": "intermediate"}),
+    ("GET", "/users/level-content", None),
+    ("POST", "/simulations/save-profile", {"location": "Kerala", "familySize": 4}),
+    ("GET", "/simulations/profile", None),
+    ("GET", "/voice/history", None),
+]
+
+
+def query_plan(statement, parameters):
+    """Return the EXPLAIN QUERY PLAN detail lines for `statement`."""
+    conn = sqlite3.connect(engine.url.database)
+    try:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ()).fetchall()
+    finally:
+        conn.close()
+    return [row[-1] for row in plan]
+
+
+def full_scans(statement, parameters):
+    """Return the plan lines of `statement` that scan a whole user-scoped table."""
+    return [
+        detail for detail in query_plan(statement, parameters)
+        if (match := FULL_SCAN.match(detail)) and match.group(1) in USER_SCOPED_TABLES
+    ]
+
+
+@pytest.fixture(scope="module")
+def endpoint_queries(client):
+    """Call every endpoint in ENDPOINT_CALLS with an empty cache and record the SELECTs issued."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engines = {engine, async_engine.sync_engine, async_read_engine.sync_engine}
+    response = client.post("/auth/register", json={
+        "email": "plans@fintwin.com", "full_name": "Plan Check", "password": "plans-password"
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    user_id = response.json()["user"]["id"]
+
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        for method, path, body in ENDPOINT_CALLS:
+            response_cache.clear()
+            response = client.request(method, path.format(user_id=user_id), json=body, headers=headers)
+            assert response.status_code == 200, f"{method} {path}: {response.text}"
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+    return statements
+
+
+def test_endpoints_issue_queries(endpoint_queries):
+    assert any("savings_goals" in statement for statement, _ in endpoint_queries)
+
+
+def test_no_full_scans_on_user_scoped_tables(endpoint_queries):
+    offenders = []
+    for statement, parameters in endpoint_queries:
+        scans = full_scans(statement, parameters)
+        if scans:
+            offenders.append(f"{' '.join(statement.split())}\n    plan: {scans}")
+    assert not offenders, "Full table scans on user-scoped tables:\n" + "\n".join(offenders)
+
+
+def test_harness_detects_unindexed_lookup(endpoint_queries):
+    assert full_scans("SELECT * FROM savings_goals WHERE title = ?", ("Onam",))
+    assert not full_scans("SELECT * FROM savings_goals WHERE user_id = ? ORDER BY created_at DESC", (1,))
+
+
+def test_scheme_state_filter_uses_index(endpoint_queries):
+    statements = [statement for statement, _ in endpoint_queries if "scheme_states" in statement]
+    assert statements
+    for statement, parameters in endpoint_queries:
+        if "scheme_states" in statement:
+            plan = query_plan(statement, parameters)
+            assert any("ix_scheme_states_state_scheme_id" in detail for detail in plan), plan
+            assert not any(FULL_SCAN.match(detail) for detail in plan), plan
+
+
+def test_scheme_state_filter_matches_exactly(client, endpoint_queries):
+    scheme = {
+        "description": "Test scheme", "scheme_type": "savings", "eligibility_criteria": {}, "benefits": [],
+        "application_process": "Online", "required_documents": [],
+    }
+    db = SessionLocal()
+    try:
+        db.add_all([
+            GovernmentScheme(name="Bengal Only", applicable_states=["Bengal"], **scheme),
+            GovernmentScheme(name="West Bengal Only", applicable_states='["West Bengal"]', **scheme),
+            GovernmentScheme(name="Central", applicable_states=[ALL_STATES], **scheme),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    response_cache.clear()
+    token = client.post("/auth/login", json=ENDPOINT_CALLS[0][2]).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    names = {scheme["name"] for scheme in client.get("/schemes?state=Bengal", headers=headers).json()}
+    assert names == {"Bengal Only", "Central"}
+    states = client.get("/schemes", params={"state": "West Bengal"}, headers=headers).json()
+    assert {scheme["name"] for scheme in states} == {"West Bengal Only", "Central"}
+    assert all(isinstance(scheme["applicable_states"], list) for scheme in states)
+
+
+def test_goal_pages_follow_next_links_through_the_index(client, endpoint_queries):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM savings_goals" in statement and "<" in statement:
+            statements.append((statement, parameters))
+
+    token = client.post("/auth/login", json=ENDPOINT_CALLS[0][2]).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(4):
+        client.post("/savings/goals", json={"title": f"Page {i}", "target_amount": 1000, "category": "festival"},
+                    headers=headers)
+
+    event.listen(async_read_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        titles, path = [], "/savings/goals?limit=2"
+        while path:
+            response = client.get(path, headers=headers)
+            assert response.status_code == 200
+            titles += [goal["title"] for goal in response.json()]
+            link = response.headers.get("Link")
+            path = link[1:link.index(">")] if link else None
+    finally:
+        event.remove(async_read_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+    assert titles == ["Page 3", "Page 2", "Page 1", "Page 0", "Onam"]
+    assert client.get("/savings/goals?limit=1000", headers=headers).status_code == 422
+    assert client.get("/savings/goals?cursor=bogus", headers=headers).status_code == 400
+
+    assert statements
+    for statement, parameters in statements:
+        plan = query_plan(statement, parameters)
+        assert any("ix_savings_goals_user_id_created_at" in detail and "created_at<" in detail for detail in plan), plan
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for routing GET reads to a read replica, with read-your-writes after a user's own write
+"""
+
+import os
+import tempfile
+
+# Importing main binds the database engines; keep them off the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fintwin_replica_'), 'primary.db')}")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+import main
+from cache import RecentWrites, response_cache
+from database import READ_YOUR_WRITES_SECONDS, Base, SessionLocal
+from models import SavingsGoal, VoiceInteraction
+
+
+@pytest.fixture(scope="module")
+def user(client):
+    response = client.post(
+        "/auth/register", json={"email": "replica@fintwin.com", "full_name": "Replica", "password": "replica-pw"}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.fixture
+def replica(client, user, monkeypatch):
+    """
+    A second SQLite file standing in for a lagging replica. It holds one goal of the test user
+    that the primary does not, so each response shows which database served it.
+    """
+    user_id = user["user"]["id"]
+
+    path = os.path.join(tempfile.mkdtemp(prefix="fintwin_replica_"), "replica.db")
+    sync_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(sync_engine)() as db:
+        db.add(SavingsGoal(user_id=user_id, title="On the replica", target_amount=1000, category="festival"))
+        db.commit()
+    sync_engine.dispose()
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+    now = [0.0]
+    monkeypatch.setattr(main, "AsyncReplicaSessionLocal", async_sessionmaker(replica_engine, class_=AsyncSession))
+    monkeypatch.setattr(main, "recent_writes", RecentWrites(READ_YOUR_WRITES_SECONDS, clock=lambda: now[0]))
+    yield {"Authorization": f"Bearer {user['access_token']}"}, now
+    client.portal.call(replica_engine.dispose)
+
+
+def goal_titles(client, headers):
+    # Skip the response cache so every call reaches a database
+    response_cache.clear()
+    response = client.get("/savings/goals", headers=headers)
+    assert response.status_code == 200, response.text
+    return [goal["title"] for goal in response.json()]
+
+
+def test_reads_go_to_the_replica_until_the_user_writes(client, replica):
+    headers, now = replica
+    assert goal_titles(client, headers) == ["On the replica"]
+
+    response = client.post("/savings/goals", json={"title": "Just written", "target_amount": 500, "category": "festival"},
+                           headers=headers)
+    assert response.status_code == 200, response.text
+    assert goal_titles(client, headers)[0] == "Just written"
+
+    now[0] += READ_YOUR_WRITES_SECONDS - 0.1
+    assert goal_titles(client, headers)[0] == "Just written"
+    now[0] += 0.2
+    assert goal_titles(client, headers) == ["On the replica"]
+
+
+def test_cache_pressure_does_not_drop_the_write_marker(client, replica):
+    headers, _ = replica
+    client.post("/savings/goals", json={"title": "Pressure", "target_amount": 500, "category": "festival"},
+                headers=headers)
+
+    # Overflow the response cache's byte budget so its LRU evicts everything written before
+    filler = "x" * (1024 * 1024)
+    for i in range(response_cache.max_bytes // len(filler) + 2):
+        response_cache.set("filler", i, filler)
+    assert goal_titles(client, headers)[0] == "Pressure"
+
+
+def test_voice_history_reads_the_primary(client, user, replica):
+    headers, _ = replica
+    # Stored the way ai_services.process_voice_query stores it, without marking a recent write
+    with SessionLocal() as db:
+        db.add(VoiceInteraction(
+            user_id=user["user"]["id"], query_text="How much should I save?", query_language="en",
+            response_text="About 20% of your income.", response_language="en", intent_detected="savings_amount",
+            confidence_score=0.9
+        ))
+        db.commit()
+
+    response = client.get("/voice/history", headers=headers)
+    assert response.status_code == 200, response.text
+    assert [interaction["query_text"] for interaction in response.json()] == ["How much should I save?"]
+
+
+def test_recent_writes_expire():
+    now = [100.0]
+    writes = RecentWrites(5, clock=lambda: now[0])
+    writes.mark(1)
+    assert 1 in writes and 2 not in writes
+    now[0] += 5
+    assert 1 not in writes
+    # Expired markers are purged by later writes
+    writes.mark(2)
+    assert list(writes._expires_at) == [2]
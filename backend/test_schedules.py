@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked loan schedule generator
+"""
+
+import csv
+import io
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from finance_math import emi
+from schedules import SCHEDULE_COLUMNS, LoanTerms, schedule_blocks, schedule_stream
+
+
+def loans(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return LoanTerms(
+        principal=rng.uniform(10_000, 5_000_000, count),
+        annual_rate=np.where(np.arange(count) % 7 == 0, 0, rng.uniform(6, 18, count)),
+        tenure=rng.integers(1, 241, count),
+        surplus=rng.uniform(-5_000, 80_000, count)
+    )
+
+
+def joined(blocks):
+    blocks = list(blocks)
+    return {name: np.concatenate([block[name] for block in blocks]) for name in SCHEDULE_COLUMNS}
+
+
+def test_rows_follow_a_running_balance():
+    terms = loans(30)
+    rows = joined(schedule_blocks(terms, chunk_rows=500))
+    assert len(rows["item"]) == terms.tenure.sum()
+
+    offset = 0
+    for item, (principal, annual_rate, tenure, surplus) in enumerate(zip(*terms)):
+        r = annual_rate / 1200
+        payment, balance, cumulative = emi(principal, r, tenure), principal, 0.0
+        for month in range(1, tenure + 1):
+            row = {name: rows[name][offset] for name in SCHEDULE_COLUMNS}
+            interest = balance * r
+            balance -= payment - interest
+            cumulative += surplus - payment
+            assert (row["item"], row["month"]) == (item, month)
+            assert row["payment"] == pytest.approx(payment, rel=1e-9)
+            assert row["interest"] == pytest.approx(interest, rel=1e-6, abs=1e-6)
+            assert row["balance"] == pytest.approx(max(balance, 0), rel=1e-6, abs=1e-4)
+            assert row["cash_flow"] == pytest.approx(surplus - payment, rel=1e-9)
+            assert row["cumulative_cash_flow"] == pytest.approx(cumulative, rel=1e-9)
+            offset += 1
+        assert rows["balance"][offset - 1] == 0
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 240, 1000, 100_000])
+def test_chunk_size_does_not_change_the_rows(chunk_rows):
+    terms = loans(50, seed=1)
+    expected = joined(schedule_blocks(terms, chunk_rows=10**9))
+    rows = joined(schedule_blocks(terms, chunk_rows=chunk_rows))
+    for name in SCHEDULE_COLUMNS:
+        np.testing.assert_array_equal(rows[name], expected[name])
+
+
+def test_ndjson_and_csv_hold_the_same_rows():
+    terms = loans(5, seed=2)
+    lines = "".join(schedule_stream(terms, "ndjson", chunk_rows=100)).splitlines()
+    table = list(csv.DictReader(io.StringIO("".join(schedule_stream(terms, "csv", chunk_rows=100)))))
+
+    assert len(lines) == len(table) == terms.tenure.sum()
+    for line, row in zip(lines, table):
+        record = json.loads(line)
+        assert list(record) == list(row) == list(SCHEDULE_COLUMNS)
+        assert record == {name: (int if name in ("item", "month") else float)(value) for name, value in row.items()}
+
+
+def test_memory_stays_flat_as_loans_grow():
+    def peak_bytes(count):
+        terms = loans(count, seed=3)._replace(tenure=np.full(count, 120))
+        tracemalloc.start()
+        try:
+            for chunk in schedule_stream(terms, "ndjson", chunk_rows=6_000):
+                del chunk
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    # 20x the rows, while only the input arrays grow
+    assert peak_bytes(1_000) < 1.5 * peak_bytes(50)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Tests for the financial simulation endpoints and their vectorized kernels
+"""
+
+import csv
+import io
+import itertools
+import json
+import os
+import tempfile
+
+# Importing main binds the database engines; keep them off the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fintwin_sims_'), 'sims.db')}")
+
+import pytest
+
+import ai_services
+import main
+
+PROFILE = {"monthly_income": 60000, "monthly_expenses": 40000, "existing_liabilities": 2000}
+
+
+@pytest.fixture(scope="module")
+def headers(client):
+    response = client.post(
+        "/auth/register", json={"email": "simulator@fintwin.com", "full_name": "Simulator", "password": "simulator-pw"}
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def run_one(client, headers, item, user_profile=PROFILE):
+    response = client.post("/simulations/run", json={**item, "user_profile": user_profile}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["result"]
+
+
+def test_batch_matches_single_runs(client, headers):
+    items = [
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 250000, "loan_tenure": 36, "interest_rate": 10.5}},
+        {"simulation_type": "investment_planning", "inputs": {"monthly_investment": 5000, "duration_years": 10, "risk_tolerance": "aggressive"}},
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 80000}},
+        {"simulation_type": "retirement_readiness", "inputs": {"current_age": 35, "current_retirement_savings": 400000}},
+        {"simulation_type": "loan_impact_estimation", "inputs": {"loan_amount": 500000, "loan_tenure": 60, "loan_type": "home"}},
+        {"simulation_type": "emi_vs_saving_dilemma", "inputs": {"item_cost": 90000, "item_type": "vehicle"}},
+        {"simulation_type": "monthly_budget_forecast", "inputs": {}}
+    ]
+    response = client.post("/simulations/batch", json={"items": items, "user_profile": PROFILE}, headers=headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    assert body["count"] == len(items)
+    assert [entry["simulation_type"] for entry in body["results"]] == [item["simulation_type"] for item in items]
+    for item, entry in zip(items, body["results"]):
+        assert entry["result"] == run_one(client, headers, item)
+
+
+def test_loan_emi_matches_the_reducing_balance_formula(client, headers):
+    result = run_one(client, headers, {
+        "simulation_type": "loan_affordability",
+        "inputs": {"loan_amount": 100000, "loan_tenure": 12, "interest_rate": 12}
+    })
+    assert result["loan_details"]["monthly_emi"] == 8885
+    assert result["total_cost"] == {"total_payment": 106619, "total_interest": 6619}
+
+
+def test_bad_items_fail_alone(client, headers):
+    items = [
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000}},
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": "a lot"}},
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000, "loan_tenure": 0}},
+        {"simulation_type": "time_travel", "inputs": {}},
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000, "interest_rate": 0}},
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000}, "user_profile": {"monthly_income": "abc"}},
+        {"simulation_type": ["loan_affordability"], "inputs": {}},
+        {"simulation_type": "monthly_budget_forecast", "inputs": {}, "user_profile": {"monthly_expenses": "abc"}}
+    ]
+    response = client.post("/simulations/batch", json={"items": items}, headers=headers)
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+
+    assert results[0]["result"]["loan_details"]["monthly_emi"] == 8885
+    assert "error" in results[1]["result"]
+    assert "error" in results[2]["result"]
+    assert results[3]["result"] == {"error": "Unknown simulation type"}
+    # A 0% loan is repaid in equal parts
+    assert results[4]["result"]["loan_details"]["monthly_emi"] == 8333
+    # A profile or type the context cannot be built from fails its own item, not the request
+    assert "error" in results[5]["result"]
+    assert results[6]["result"] == {"error": "Unknown simulation type"}
+    assert "error" in results[7]["result"]
+
+
+def test_bad_items_are_isolated_without_rerunning_the_group_item_by_item(client, headers, monkeypatch):
+    items = [
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 50000 + 1000 * i, "loan_tenure": 12 + i % 5}}
+        for i in range(64)
+    ]
+    clean = client.post("/simulations/batch", json={"items": items}, headers=headers).json()["results"]
+    items[37] = {**items[37], "inputs": {**items[37]["inputs"], "loan_tenure": 0}}
+
+    handler = ai_services.SIMULATION_HANDLERS["loan_affordability"]
+    kernel, rows_per_call, rows_computed = handler.batch, [], []
+
+    def counting_kernel(inputs, contexts):
+        rows_per_call.append(len(inputs))
+        results = kernel(inputs, contexts)
+        rows_computed.append(len(results))
+        return results
+
+    monkeypatch.setattr(handler, "batch", counting_kernel)
+    results = client.post("/simulations/batch", json={"items": items}, headers=headers).json()["results"]
+
+    assert "error" in results[37]["result"]
+    assert results[:37] + results[38:] == clean[:37] + clean[38:]
+    # Every good row comes from a vectorized call; halving down to the bad row takes 2 calls per level
+    assert sum(rows_computed) == len(items) - 1
+    assert len(rows_per_call) <= 2 * 6 + 1
+    assert sum(rows_per_call) <= 3 * len(items)
+
+
+def test_items_can_override_profile_fields(client, headers):
+    item = {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 300000, "loan_tenure": 24}}
+    rich = {"monthly_income": 200000, "monthly_expenses": 50000}
+    results = client.post("/simulations/batch", json={
+        "items": [item, {**item, "user_profile": rich}], "user_profile": PROFILE
+    }, headers=headers).json()["results"]
+
+    assert results[0]["result"] == run_one(client, headers, item)
+    assert results[1]["result"] == run_one(client, headers, item, user_profile={**PROFILE, **rich})
+    assert results[1]["result"]["affordability"]["debt_to_income_ratio"] < results[0]["result"]["affordability"]["debt_to_income_ratio"]
+
+
+def test_batch_size_is_validated(client, headers, monkeypatch):
+    assert client.post("/simulations/batch", json={"items": []}, headers=headers).status_code == 400
+    assert client.post("/simulations/batch", json={"items": ["loan"]}, headers=headers).status_code == 400
+    item = {"simulation_type": "loan_affordability", "inputs": {}}
+    assert client.post("/simulations/batch", json={"items": [item], "user_profile": "x"}, headers=headers).status_code == 400
+    assert client.post("/simulations/batch", json={"items": [{**item, "user_profile": "x"}]}, headers=headers).status_code == 400
+
+    monkeypatch.setattr(main, "SIMULATION_BATCH_MAX_ITEMS", 2)
+    items = [{"simulation_type": "loan_affordability", "inputs": {}}] * 3
+    assert client.post("/simulations/batch", json={"items": items}, headers=headers).status_code == 413
+
+
+def test_monte_carlo_mode_is_seedable(client, headers):
+    item = {"simulation_type": "investment_planning", "inputs": {
+        "monthly_investment": 5000, "duration_years": 10, "mode": "monte_carlo", "seed": 7, "paths": 2000
+    }}
+    first, second = run_one(client, headers, item), run_one(client, headers, item)
+    assert first == second
+    assert first["monte_carlo"]["paths"] == 2000
+    # The deterministic projection is unchanged and doubles as the default goal
+    assert first["monte_carlo"]["goal_amount"] == first["projection"]["future_value"]
+    assert "monte_carlo" not in run_one(client, headers, {**item, "inputs": {"monthly_investment": 5000, "duration_years": 10}})
+
+    retirement = run_one(client, headers, {"simulation_type": "retirement_readiness", "inputs": {
+        "current_age": 40, "current_retirement_savings": 500000, "mode": "monte_carlo", "seed": 7, "paths": 2000
+    }})
+    assert retirement["monte_carlo"]["goal_amount"] == retirement["corpus_calculation"]["retirement_corpus_needed"]
+    assert retirement["monte_carlo"]["months"] == 240
+
+
+def test_monte_carlo_items_per_batch_are_limited(client, headers, monkeypatch):
+    monkeypatch.setattr(main, "MONTE_CARLO_BATCH_MAX_ITEMS", 1)
+    item = {"simulation_type": "investment_planning", "inputs": {"mode": "monte_carlo", "paths": 100}}
+    assert client.post("/simulations/batch", json={"items": [item]}, headers=headers).status_code == 200
+    assert client.post("/simulations/batch", json={"items": [item, item]}, headers=headers).status_code == 413
+
+
+def sweep(client, headers, body):
+    response = client.post("/simulations/sweep", json={"user_profile": PROFILE, **body}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["result"]
+
+
+def batch_grid(client, headers, simulation_type, inputs, axes):
+    """Single results for every cell of a sweep, as nested lists in axis order."""
+    names = list(axes)
+    combos = list(itertools.product(*axes.values()))
+    items = [{"simulation_type": simulation_type, "inputs": {**inputs, **dict(zip(names, combo))}} for combo in combos]
+    results = client.post("/simulations/batch", json={"items": items, "user_profile": PROFILE}, headers=headers).json()["results"]
+    return [entry["result"] for entry in results]
+
+
+def test_loan_sweep_matches_single_runs(client, headers):
+    axes = {"loan_tenure": [12, 24, 36, 60], "interest_rate": [8, 10.5, 14]}
+    grid = sweep(client, headers, {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 250000}, "axes": axes})
+
+    assert grid["shape"] == [4, 3]
+    assert grid["axes"] == axes
+    assert grid["fixed"] == {"loan_amount": 250000}
+    singles = batch_grid(client, headers, "loan_affordability", {"loan_amount": 250000}, axes)
+    cells = [(i, j) for i in range(4) for j in range(3)]
+    for (i, j), single in zip(cells, singles):
+        assert grid["metrics"]["monthly_emi"][i][j] == single["loan_details"]["monthly_emi"]
+        assert grid["metrics"]["debt_to_income_ratio"][i][j] == single["affordability"]["debt_to_income_ratio"]
+        assert grid["metrics"]["can_afford"][i][j] == single["affordability"]["can_afford"]
+        assert grid["metrics"]["total_interest"][i][j] == single["total_cost"]["total_interest"]
+
+
+def test_sip_sweep_over_amount_duration_and_risk(client, headers):
+    axes = {"monthly_investment": [1000, 5000], "duration_years": [5, 10, 20], "risk_tolerance": ["conservative", "aggressive"]}
+    grid = sweep(client, headers, {
+        "simulation_type": "investment_planning", "axes": axes, "metrics": ["future_value", "total_returns"]
+    })
+
+    assert grid["shape"] == [2, 3, 2]
+    assert list(grid["metrics"]) == ["future_value", "total_returns"]
+    singles = iter(batch_grid(client, headers, "investment_planning", {}, axes))
+    for row in grid["metrics"]["future_value"]:
+        for pair in row:
+            for value in pair:
+                assert value == next(singles)["projection"]["future_value"]
+
+
+def test_sweep_cells_that_cannot_be_computed_are_null(client, headers):
+    grid = sweep(client, headers, {
+        "simulation_type": "emi_vs_saving_dilemma", "axes": {"emi_tenure": [0, 12], "interest_rate": [0, 12]},
+        "metrics": ["monthly_emi"]
+    })
+    assert grid["metrics"]["monthly_emi"][0] == [None, None]
+    assert grid["metrics"]["monthly_emi"][1] == [4167, 4442]
+
+
+def test_sweeps_are_validated(client, headers, monkeypatch):
+    def status_of(body):
+        return client.post("/simulations/sweep", json=body, headers=headers).status_code
+
+    loan = {"simulation_type": "loan_affordability"}
+    assert status_of({**loan, "axes": {}}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": []}}) == 400
+    assert status_of({**loan, "axes": {"loan_type": ["home"]}}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": ["long"]}}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": [12]}, "metrics": ["happiness"]}) == 400
+    assert status_of({"simulation_type": "monthly_budget_forecast", "axes": {"loan_tenure": [12]}}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": [12]}, "inputs": "x"}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": [12]}, "user_profile": ["x"]}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": [12]}, "user_profile": {"monthly_income": "abc"}}) == 400
+    assert status_of({**loan, "axes": {"loan_tenure": [12]}, "user_profile": {"existing_liabilities": [1]}}) == 400
+
+    monkeypatch.setattr(main, "SIMULATION_SWEEP_MAX_CELLS", 10)
+    assert status_of({**loan, "axes": {"loan_tenure": [12, 24, 36], "interest_rate": [8, 10, 12, 14]}}) == 413
+
+
+def test_best_option_growth_follows_the_comparison_period(client, headers):
+    item = {"simulation_type": "best_option_selector", "inputs": {
+        "option1": {"name": "Car", "cost": 600000, "monthly_cost": 8000},
+        "option2": {"name": "Cabs", "cost": 0, "monthly_cost": 6000}
+    }}
+    for years in (3, 5):
+        result = run_one(client, headers, {**item, "inputs": {**item["inputs"], "comparison_years": years}})
+        monthly_savings = (600000 + 2000 * 12 * years) / (12 * years)
+        expected = monthly_savings * (1.01 ** (12 * years) - 1) / 0.01 * 1.01
+        assert result["financial_analysis"]["investment_opportunity"] == round(expected)
+
+
+def schedule(client, headers, body):
+    response = client.post("/simulations/schedule", json={"user_profile": PROFILE, **body}, headers=headers)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_schedule_streams_ndjson_rows_that_add_up_to_the_simulation(client, headers):
+    item = {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000, "loan_tenure": 12, "interest_rate": 12}}
+    response = schedule(client, headers, item)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [row["month"] for row in rows] == list(range(1, 13))
+    assert {row["item"] for row in rows} == {0}
+    assert rows[-1]["balance"] == 0
+    totals = run_one(client, headers, item)["total_cost"]
+    assert sum(row["interest"] for row in rows) == pytest.approx(totals["total_interest"], abs=1)
+    # Income left after expenses and existing EMIs, less this loan's EMI
+    assert rows[0]["cash_flow"] == pytest.approx(60000 - 40000 - 2000 - rows[0]["payment"], abs=0.01)
+    assert rows[-1]["cumulative_cash_flow"] == pytest.approx(12 * rows[0]["cash_flow"], abs=0.1)
+
+
+def test_schedule_exports_batches_as_csv(client, headers):
+    items = [
+        {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 250000, "loan_tenure": 36}},
+        {"simulation_type": "loan_impact_estimation", "inputs": {"loan_amount": 500000, "loan_tenure": 60, "loan_type": "home"}},
+        {"simulation_type": "emi_vs_saving_dilemma", "inputs": {"item_cost": 90000, "interest_rate": 0}}
+    ]
+    response = schedule(client, headers, {"items": items, "format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    table = list(csv.DictReader(io.StringIO(response.text)))
+
+    assert [sum(row["item"] == str(index) for row in table) for index in range(3)] == [36, 60, 12]
+    single = run_one(client, headers, items[1])
+    assert float(table[36]["payment"]) == pytest.approx(single["loan_details"]["monthly_emi"], abs=0.5)
+    assert {float(row["interest"]) for row in table if row["item"] == "2"} == {0.0}
+
+
+def test_schedules_are_validated(client, headers, monkeypatch):
+    def status_of(body):
+        return client.post("/simulations/schedule", json=body, headers=headers).status_code
+
+    loan = {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000}}
+    assert status_of({"items": []}) == 400
+    assert status_of({**loan, "format": "xlsx"}) == 400
+    assert status_of({"simulation_type": "investment_planning"}) == 400
+    assert status_of({**loan, "inputs": {"loan_tenure": 0}}) == 400
+    assert status_of({**loan, "inputs": {"loan_tenure": 12.5}}) == 400
+    assert status_of({**loan, "inputs": {"interest_rate": "low"}}) == 400
+    assert status_of({**loan, "inputs": "x"}) == 400
+    assert status_of({**loan, "user_profile": "x"}) == 400
+    assert status_of({"items": [{**loan, "user_profile": "x"}]}) == 400
+    assert status_of({**loan, "user_profile": {"monthly_income": "abc"}}) == 400
+    assert status_of({"items": [loan, {**loan, "user_profile": {"monthly_expenses": "abc"}}]}) == 400
+
+    monkeypatch.setattr(main, "SIMULATION_BATCH_MAX_ITEMS", 2)
+    assert status_of({"items": [loan] * 3}) == 413
+
+
+def test_schedule_rates_must_be_finite(client, headers):
+    item = {"simulation_type": "loan_affordability", "inputs": {"loan_amount": 100000, "interest_rate": float("nan")}}
+    response = client.post("/simulations/schedule", json=item, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Item 0: interest_rate must be a finite number, got nan"